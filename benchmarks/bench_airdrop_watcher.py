@@ -0,0 +1,117 @@
+"""AirdropWatcher sur des milliers d'adresses avec un client HTTP factice :
+débit réel vers chaque chaîne (pic sur 1 s), mémoire des snapshots, et
+changements détectés au second passage (un airdrop simulé).
+
+    python benchmarks/bench_airdrop_watcher.py [nb_adresses] [intervalle_s]
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import tracemalloc
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from trackers.cosmos_tracker import CosmosAirdropTracker, bech32_encode
+from trackers.airdrop_watcher import AirdropWatcher
+
+DENOMS = ["uatom", "uosmo", "ibc/27394FB092D2ECCD56123C74F36E4C1F926001CEADA9CA97EA622B25F41E5EB2"]
+AIRDROPPED = 0.05  # part des adresses qui reçoivent un nouveau token au second passage
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.status = 200
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeHttpClient:
+    """Réponses bank/staking générées, requêtes horodatées par hôte"""
+
+    def __init__(self):
+        self.requests = defaultdict(list)
+        self.airdrop = set()
+
+    def get(self, url):
+        host = url.split('/')[2]
+        self.requests[host].append(time.monotonic())
+        address = url.rsplit('/', 1)[1]
+        seed = hash(address) & 0xffff
+        if '/bank/' in url:
+            balances = [{"denom": DENOMS[i], "amount": str(seed * (i + 1))} for i in range(seed % 3 + 1)]
+            if address in self.airdrop:
+                balances.append({"denom": "uairdrop", "amount": "1000000"})
+            return FakeResponse({"balances": balances})
+        delegations = [{"delegation": {"validator_address": f"cosmosvaloper1{seed % 50:038d}"},
+                        "balance": {"denom": "uatom", "amount": str(seed * 7)}}]
+        return FakeResponse({"delegation_responses": delegations})
+
+
+def peak_rate(times):
+    """Nombre maximum de requêtes sur une fenêtre glissante d'une seconde"""
+    times, peak, start = sorted(times), 0, 0
+    for end, t in enumerate(times):
+        while t - times[start] > 1.0:
+            start += 1
+        peak = max(peak, end - start + 1)
+    return peak
+
+
+async def main(count: int, interval: float):
+    random.seed(3)
+    http = FakeHttpClient()
+    tracker = CosmosAirdropTracker(http)
+    for i in range(count):
+        address = bech32_encode("cosmos", [random.randrange(32) for _ in range(32)])
+        tracker.register_address(str(i % (count // 3 + 1)), address)
+
+    notified = Counter()
+
+    async def notify(user_id, lines):
+        notified[user_id] += 1
+
+    # Débit par chaîne juste suffisant pour un passage dans l'intervalle
+    rate = 2 * count / interval * 1.2
+    watcher = AirdropWatcher(tracker, notify, interval=interval, chain_rate=rate, flush_every=interval)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    await watcher.run_cycle()
+    first = time.perf_counter() - start
+    snapshot_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    jobs = watcher._jobs()
+    osmo = {address for chain, address in jobs if chain == "osmosis"}
+    http.airdrop = set(random.sample(sorted(osmo), int(len(osmo) * AIRDROPPED)))
+    http.requests.clear()
+    start = time.perf_counter()
+    await watcher.run_cycle()
+    second = time.perf_counter() - start
+
+    print(f"{count} addresses, {len(jobs)} (chain, address) jobs, interval {interval:.0f}s, "
+          f"chain rate {rate:.0f} req/s")
+    print(f"cycle 1 (baseline) {first:.1f}s, cycle 2 {second:.1f}s")
+    for host, times in http.requests.items():
+        print(f"  {host:20s} {len(times)} requests, peak {peak_rate(times)} req/s, "
+              f"mean {len(times) / second:.0f} req/s")
+    print(f"snapshots + bookkeeping: {snapshot_bytes / 1e6:.2f}MB ({snapshot_bytes / len(jobs):.0f} bytes per job)")
+    print(f"{len(http.airdrop)} airdropped addresses -> {sum(notified.values())} DMs to {len(notified)} users "
+          f"(batched per user)")
+    print(watcher.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000,
+                     float(sys.argv[2]) if len(sys.argv) > 2 else 20.0))
@@ -0,0 +1,85 @@
+"""AlertEngine avec 100k alertes réparties sur 1000 serveurs et 50 paires :
+coût d'un tick de prix (tas) comparé au parcours de toutes les alertes,
+avec vérification que les deux déclenchent exactement les mêmes alertes.
+
+    python benchmarks/bench_alerts.py [nb_alertes]
+"""
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.alerts import AlertEngine
+from core.memory_store import MemoryStore
+
+SYMBOLS = [f"C{i:02d}USDT" for i in range(50)]
+GUILDS = 1000
+CHANNELS_PER_GUILD = 5
+TICKS = 200
+
+
+def scan(alerts, prices):
+    """Approche naïve : chaque alerte comparée à chaque tick"""
+    fired, kept = [], []
+    for alert in alerts:
+        price = prices[alert.symbol]
+        if (alert.above and price >= alert.threshold) or (not alert.above and price <= alert.threshold):
+            fired.append(alert)
+        else:
+            kept.append(alert)
+    alerts[:] = kept
+    return fired
+
+
+def main(count: int = 100_000):
+    random.seed(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, 'memory.json'), compact_every=10 * count)
+        engine = AlertEngine(store, max_per_user=count)
+        prices = {symbol: 100.0 for symbol in SYMBOLS}
+
+        start = time.perf_counter()
+        for i in range(count):
+            guild = random.randrange(GUILDS)
+            symbol = random.choice(SYMBOLS)
+            above = random.random() < 0.5
+            # Seuils à ±2..30% du prix : une petite partie se déclenche à chaque tick
+            threshold = prices[symbol] * (1 + random.uniform(0.02, 0.3) * (1 if above else -1))
+            engine.add(symbol, above, threshold, guild * CHANNELS_PER_GUILD + random.randrange(CHANNELS_PER_GUILD),
+                       user_id=random.randrange(count // 2), guild_id=guild)
+        elapsed = time.perf_counter() - start
+        print(f"add x{count}: {elapsed:.2f}s, {elapsed / count * 1e6:.1f}us per alert")
+
+        remaining = list(engine._alerts.values())
+        heap_time = scan_time = 0.0
+        fired_total = channels_total = 0
+        for _ in range(TICKS):
+            for symbol in SYMBOLS:
+                prices[symbol] *= 1 + random.gauss(0, 0.01)
+
+            start = time.perf_counter()
+            by_channel = engine.on_prices(prices)
+            heap_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected = scan(remaining, prices)
+            scan_time += time.perf_counter() - start
+
+            fired = sorted(alert.id for batch in by_channel.values() for alert, _ in batch)
+            assert fired == sorted(alert.id for alert in expected), "heap and scan disagree"
+            fired_total += len(fired)
+            channels_total += len(by_channel)
+
+        print(f"{TICKS} ticks x {len(SYMBOLS)} symbols, {fired_total} alerts fired "
+              f"in {channels_total} channel batches (same set as the full scan)")
+        print(f"heaps     {heap_time / TICKS * 1e3:8.3f}ms per tick")
+        print(f"full scan {scan_time / TICKS * 1e3:8.3f}ms per tick")
+        print(engine.stats())
+        store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
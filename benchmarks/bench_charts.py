@@ -0,0 +1,80 @@
+"""Débit du ChartService : rendus PNG dans le pool de processus, pendant
+qu'une tâche mesure le retard de la boucle asyncio (le battement de
+cœur de la gateway Discord), comparé au rendu directement dans la boucle.
+
+    python benchmarks/bench_charts.py [nb_graphiques]
+"""
+import os
+import sys
+import time
+import asyncio
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.charts import ChartService, ChartQueueFull, render_chart
+
+WORKERS = 2
+
+
+def make_candles(seed: int, n: int = 168) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    times = 1_700_000_000_000 + np.arange(n) * 3_600_000
+    return np.column_stack([times, closes, closes * 1.01, closes * 0.99, closes, np.ones(n)])
+
+
+async def max_loop_lag(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.perf_counter() - start - 0.01)
+    return worst
+
+
+async def run(count: int):
+    candles = [make_candles(i) for i in range(count)]
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(max_loop_lag(stop))
+    start = time.perf_counter()
+    for i in range(count):
+        render_chart(f"S{i}", candles[i])
+        await asyncio.sleep(0)
+    inline = time.perf_counter() - start
+    stop.set()
+    inline_lag = await lag
+    print(f"in the event loop  {count / inline:6.1f} charts/s, worst loop lag {inline_lag * 1e3:6.1f}ms")
+
+    service = ChartService(workers=WORKERS, max_pending=count)
+    await service.start()
+    stop = asyncio.Event()
+    lag = asyncio.create_task(max_loop_lag(stop))
+    start = time.perf_counter()
+    pngs = await asyncio.gather(*(service.render(("S", i), f"S{i}", candles[i]) for i in range(count)))
+    pooled = time.perf_counter() - start
+    stop.set()
+    pooled_lag = await lag
+    print(f"process pool ({WORKERS})   {count / pooled:6.1f} charts/s, worst loop lag {pooled_lag * 1e3:6.1f}ms, "
+          f"{sum(map(len, pngs)) / count / 1024:.0f} KiB per PNG")
+
+    start = time.perf_counter()
+    for i in range(count):
+        await service.render(("S", i), f"S{i}", candles[i])
+    print(f"cached             {count / (time.perf_counter() - start):6.0f} charts/s")
+
+    bounded = ChartService(workers=WORKERS, max_pending=4)
+    await bounded.start()
+    results = await asyncio.gather(*(bounded.render(("B", i), f"B{i}", candles[i]) for i in range(count)),
+                                   return_exceptions=True)
+    rejected = sum(isinstance(result, ChartQueueFull) for result in results)
+    print(f"bounded queue (4)  {count - rejected} rendered, {rejected} rejected immediately")
+    print(service.stats())
+    service.close()
+    bounded.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 40))
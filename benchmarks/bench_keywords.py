@@ -0,0 +1,123 @@
+"""Coût de la détection des mots-clés CRYPTO_KEYWORDS sur un corpus de
+messages de chat : ancienne boucle de sous-chaînes contre la regex
+compilée de KeywordReactor.
+
+    python benchmarks/bench_keywords.py
+"""
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.keywords import KeywordReactor
+
+CRYPTO_KEYWORDS = {
+    "fam": ["🚀", "👊"],
+    "degen": ["🎰", "💎"],
+    "f": ["⚰️", "🫡"],
+    "hell": ["🔥", "👿"],
+    "wtf": ["😱", "❓"],
+    "gm": ["☀️", "🌅"],
+    "wagmi": ["💪", "✨"],
+    "ngmi": ["💀", "🤡"],
+    "lfg": ["🚀", "🔥"],
+    "bullish": ["🐂", "📈"],
+    "bearish": ["🐻", "📉"]
+}
+
+CORPUS = [
+    "gm fam lfg",
+    "gm",
+    "wagmi frens",
+    "btc just broke 100k lfg!!!",
+    "anyone staking vvv? what's the apr right now",
+    "f",
+    "rip my long, f in the chat",
+    "this is so bearish for alts ngl",
+    "Hello everyone, first time here",
+    "hell yeah we are so bullish",
+    "greeny what is the price of eth",
+    "full degen mode activated",
+    "can someone help me with my osmosis wallet",
+    "wtf just happened to the market",
+    "ngmi if you sold at the bottom",
+    "shells and fish are not financial advice",
+    "the fee for the transfer was crazy",
+    "gm gm gm",
+    "Bonjour la famille, quelqu'un a des infos sur l'airdrop ?",
+    "family dinner tonight, back later",
+    "check the chart, that's a bullish flag formation",
+    "I'm feeling fine, thanks for asking",
+    "greeny analyze cosmos1qypqxpq9qcrsszg2pvxq6rs0zqg3yyc5lzv7xu",
+    "degens unite",
+    "!price btc eth sol",
+]
+
+
+def legacy(text):
+    emojis = []
+    content_lower = text.lower()
+    for keyword, reactions in CRYPTO_KEYWORDS.items():
+        if keyword in content_lower:
+            emojis.extend(reactions)
+    return emojis
+
+
+def bench(name, func, rounds=2000):
+    start = time.perf_counter()
+    reactions = 0
+    for _ in range(rounds):
+        for line in CORPUS:
+            reactions += len(func(line))
+    elapsed = time.perf_counter() - start
+    per_line = elapsed / (rounds * len(CORPUS)) * 1e6
+    print(f"{name:10s} {per_line:6.2f}us/message, {reactions // rounds} reactions per corpus pass")
+
+
+class FakeChannel:
+    id = 1
+
+
+class FakeMessage:
+    """add_reaction simulé avec une latence REST fixe"""
+
+    def __init__(self, content, latency):
+        self.content = content
+        self.channel = FakeChannel()
+        self.latency = latency
+
+    async def add_reaction(self, emoji):
+        await asyncio.sleep(self.latency)
+
+
+async def reaction_latency(reactor, latency=0.05):
+    message = FakeMessage("gm fam lfg", latency)
+    start = time.perf_counter()
+    for emoji in legacy(message.content):
+        await message.add_reaction(emoji)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reactor.dispatch(message)
+    await asyncio.gather(*reactor._tasks)
+    concurrent = time.perf_counter() - start
+    print(f"'gm fam lfg' with {latency * 1e3:.0f}ms per REST call: "
+          f"legacy {sequential * 1e3:.0f}ms sequential, compiled {concurrent * 1e3:.0f}ms concurrent")
+
+
+def main():
+    reactor = KeywordReactor(CRYPTO_KEYWORDS)
+    bench("legacy", legacy)
+    bench("compiled", reactor.match)
+    asyncio.run(reaction_latency(reactor))
+    print()
+    for line in CORPUS:
+        old, new = legacy(line), reactor.match(line)
+        if old != new:
+            print(f"{line[:50]:50s} legacy={len(old)} compiled={len(new)}")
+
+
+if __name__ == '__main__':
+    main()
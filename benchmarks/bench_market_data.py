@@ -0,0 +1,89 @@
+"""MarketData : mise à jour incrémentale et vectorisée des indicateurs
+pour des centaines de symboles, comparée au recalcul complet symbole par
+symbole, avec vérification que les deux donnent les mêmes valeurs.
+
+    python benchmarks/bench_market_data.py [nb_symboles]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.market_data import MarketData, BB_PERIOD, RSI_PERIOD, EMA_FAST, EMA_SLOW, EMA_SIGNAL
+
+HISTORY = 500
+UPDATES = 50
+INTERVAL_MS = 3_600_000
+
+
+def ema(values, period):
+    alpha = 2.0 / (period + 1)
+    out = np.empty_like(values)
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = out[i - 1] + alpha * (values[i] - out[i - 1])
+    return out
+
+
+def full_recompute(closes):
+    """Recalcul complet depuis l'historique (ce qu'on ferait sans état)"""
+    window = closes[-BB_PERIOD:]
+    macd = ema(closes, EMA_FAST) - ema(closes, EMA_SLOW)
+    deltas = np.diff(closes)
+    gain = loss = 0.0
+    for n, delta in enumerate(deltas, start=1):
+        steps = min(n, RSI_PERIOD)
+        gain += (max(delta, 0.0) - gain) / steps
+        loss += (max(-delta, 0.0) - loss) / steps
+    return {
+        "sma": window.mean(),
+        "bb_upper": window.mean() + 2 * window.std(),
+        "macd": macd[-1],
+        "macd_signal": ema(macd, EMA_SIGNAL)[-1],
+        "rsi": 100.0 - 100.0 / (1.0 + gain / loss) if loss else 100.0
+    }
+
+
+def main(count: int = 500):
+    rng = np.random.default_rng(3)
+    total = HISTORY + UPDATES
+    walks = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (count, total)), axis=1))
+    symbols = [f"S{i:03d}USDT" for i in range(count)]
+
+    def kline(s, t):
+        close = walks[s, t]
+        return [t * INTERVAL_MS, close, close * 1.01, close * 0.99, close, 1000.0]
+
+    market = MarketData(capacity=HISTORY, max_symbols=count)
+    start = time.perf_counter()
+    market.load({symbol: [kline(s, t) for t in range(HISTORY)] for s, symbol in enumerate(symbols)})
+    print(f"load {count} x {HISTORY} candles: {time.perf_counter() - start:.2f}s")
+
+    update_time = signal_time = 0.0
+    for t in range(HISTORY, total):
+        batch = {symbol: kline(s, t) for s, symbol in enumerate(symbols)}
+        start = time.perf_counter()
+        market.update(batch)
+        update_time += time.perf_counter() - start
+        start = time.perf_counter()
+        signals = market.signals()
+        signal_time += time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = {symbol: full_recompute(walks[s]) for s, symbol in enumerate(symbols)}
+    recompute_time = time.perf_counter() - start
+
+    worst = max(abs(signals[symbol][key] - value) / max(abs(value), 1e-9)
+                for symbol in symbols for key, value in expected[symbol].items())
+    print(f"incremental update  {update_time / UPDATES * 1e3:8.2f}ms per candle for {count} symbols")
+    print(f"signals (all)       {signal_time / UPDATES * 1e3:8.2f}ms")
+    print(f"full recompute      {recompute_time * 1e3:8.2f}ms for {count} symbols")
+    print(f"max relative difference vs full recompute: {worst:.2e}")
+    print(market.stats())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
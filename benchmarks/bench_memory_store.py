@@ -0,0 +1,90 @@
+"""Charge de MemoryStore avec 100k utilisateurs, comparée à la réécriture
+complète de memory.json (ancien PersistentMemory._save_memory), et retard
+de la boucle asyncio pendant une compaction faite par le thread d'écriture.
+
+    python benchmarks/bench_memory_store.py [nb_utilisateurs]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.memory_store import MemoryStore
+
+
+def legacy_save(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+async def loop_stall(work) -> float:
+    """Pire retard d'une tâche qui se réveille toutes les 1 ms pendant que
+    work() tourne dans un autre thread (comme le thread d'écriture)"""
+    thread = threading.Thread(target=work)
+    worst, last = 0.0, time.perf_counter()
+    thread.start()
+    while thread.is_alive():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        worst = max(worst, now - last - 0.001)
+        last = now
+    thread.join()
+    return worst
+
+
+def main(users: int = 100_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'memory.json')
+
+        store = MemoryStore(path, compact_every=users)
+        start = time.perf_counter()
+        for i in range(users):
+            store.remember(str(i), 'info', f"user {i} loves green")
+        elapsed = time.perf_counter() - start
+        print(f"remember x{users}: {elapsed:.2f}s total, {elapsed / users * 1e6:.1f}us per call on the event loop")
+
+        start = time.perf_counter()
+        store.flush()
+        print(f"journal flush: {time.perf_counter() - start:.2f}s ({store.stats()})")
+
+        start = time.perf_counter()
+        for i in range(1000):
+            store.remember(str(i), 'nickname', f"neo{i}")
+        per_call = (time.perf_counter() - start) / 1000
+        print(f"remember on a {users}-user store: {per_call * 1e6:.1f}us per call")
+
+        for i in range(1000):
+            store.remember(str(i), 'nickname', f"trinity{i}")
+        start = time.perf_counter()
+        stall = asyncio.run(loop_stall(lambda: store.flush(compact=True)))
+        print(f"compaction on the writer thread: {time.perf_counter() - start:.2f}s, "
+              f"worst event loop stall {stall * 1e3:.1f}ms")
+        whole = asyncio.run(loop_stall(lambda: json.dumps(store.data, ensure_ascii=False, separators=(',', ':'))))
+        print(f"single json.dumps of the store on a thread: worst event loop stall {whole * 1e3:.1f}ms (holds the GIL)")
+
+        start = time.perf_counter()
+        store.close()
+        print(f"final compaction: {time.perf_counter() - start:.2f}s, "
+              f"snapshot {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        reloaded = MemoryStore(path)
+        print(f"reload: {time.perf_counter() - start:.2f}s, {reloaded.stats()['users']} users")
+        reloaded.close()
+
+        legacy_path = os.path.join(tmp, 'legacy.json')
+        rounds = 5
+        start = time.perf_counter()
+        for _ in range(rounds):
+            legacy_save(legacy_path, reloaded.data)
+        per_call = (time.perf_counter() - start) / rounds
+        print(f"legacy full rewrite: {per_call * 1e3:.0f}ms per remember, blocking the event loop")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,66 @@
+"""Prix Binance : lecture dans le PriceBook (flux WebSocket) contre un
+aller-retour REST ticker/price, sur le faux serveur local
+benchmarks/fake_binance.py. Vérifie aussi la reconnexion quand le
+serveur coupe le flux.
+
+    python benchmarks/bench_price_book.py
+"""
+import os
+import sys
+import time
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aiohttp import web
+
+from core.http_client import HttpClient
+from core.price_book import PriceBook
+from fake_binance import make_app
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "ATOMUSDT"]
+PORT = 9444
+
+
+async def main():
+    runner = web.AppRunner(make_app(interval=0.05, drop_after=100))
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', PORT).start()
+    client = HttpClient()
+    await client.start()
+
+    book = PriceBook(SYMBOLS, url=f"ws://127.0.0.1:{PORT}/stream", backoff_min=0.1, backoff_max=0.5)
+    book.start(client)
+    while book.stats()["fresh"] < len(SYMBOLS):
+        await asyncio.sleep(0.01)
+
+    n = 100_000
+    start = time.perf_counter()
+    for i in range(n):
+        book.get(SYMBOLS[i % len(SYMBOLS)])
+    book_us = (time.perf_counter() - start) / n * 1e6
+
+    n_rest = 200
+    start = time.perf_counter()
+    for i in range(n_rest):
+        async with client.get(f"http://127.0.0.1:{PORT}/api/v3/ticker/price",
+                              params={"symbol": SYMBOLS[i % len(SYMBOLS)]}) as response:
+            float((await response.json())["price"])
+    rest_us = (time.perf_counter() - start) / n_rest * 1e6
+
+    print(f"price book  {book_us:10.2f}us/lookup")
+    print(f"REST        {rest_us:10.2f}us/lookup (loopback, no TLS)")
+
+    # Le serveur coupe après 100 messages : attendre au moins deux reconnexions
+    deadline = time.monotonic() + 10
+    while book.connects < 3 and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    print(f"reconnects  {book.connects - 1} {book.stats()}")
+
+    await book.stop()
+    await client.close()
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Coût du routage par message : ancienne chaîne if/elif de on_message
+(v7.3) contre MessageRouter, sur un corpus de messages de chat.
+
+    python benchmarks/bench_router.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from core.router import MessageRouter
+
+CORPUS = [
+    "gm fam lfg",
+    "greeny what is vvv",
+    "greeny analyze cosmos1qypqxpq9qcrsszg2pvxq6rs0zqg3yyc5lzv7xu",
+    "greeny monitor eth > 2000",
+    "greeny traduis ce texte en anglais stp",
+    "greeny remember @frogstar loves green",
+    "greeny forget @frogstar",
+    "greeny can you help me with this solidity contract",
+    "greeny résume la dernière annonce de venice",
+    "anyone staking vvv? what's the apr right now",
+    "!price btc",
+    "greeny how do i stake on osmosis",
+    "this is so bearish for alts ngl",
+    "greeny surveille le btc",
+    "Bonjour la famille, quelqu'un a des infos sur l'airdrop ?",
+]
+
+
+class FakeAuthor:
+    def __init__(self, admin):
+        self.admin = admin
+
+
+class FakeMessage:
+    def __init__(self, admin):
+        self.author = FakeAuthor(admin)
+
+
+def legacy(message, content_lower):
+    """Reproduction de la chaîne if/elif de on_message (v7.3)"""
+    if content_lower.startswith('greeny'):
+        query = content_lower[6:].strip()
+        if 'remember' in query and message.author.admin:
+            return 'remember_route'
+        if 'forget' in query and message.author.admin:
+            return 'forget_route'
+        if 'analyze' in query or 'analyse' in query:
+            return 'analyze_route'
+        if 'monitor' in query or 'surveille' in query:
+            return 'monitor_route'
+        if 'translate' in query or 'traduis' in query:
+            return 'translate_route'
+        if 'summary' in query or 'résume' in query:
+            return 'summary_route'
+        if any(word in query for word in ['code', 'solidity', 'smart contract', 'help']):
+            return 'tech_route'
+        return 'conversation_route'
+    return None
+
+
+def build_router():
+    async def noop(message, text):
+        pass
+
+    def admin(message):
+        return message.author.admin
+
+    greeny = MessageRouter()
+    greeny.keyword('remember', priority=0, guard=admin, name='remember_route')(noop)
+    greeny.keyword('forget', priority=1, guard=admin, name='forget_route')(noop)
+    greeny.keyword('analyze', 'analyse', priority=2, name='analyze_route')(noop)
+    greeny.keyword('monitor', 'surveille', priority=3, name='monitor_route')(noop)
+    greeny.keyword('translate', 'traduis', priority=4, name='translate_route')(noop)
+    greeny.keyword('summary', 'résume', priority=5, name='summary_route')(noop)
+    greeny.keyword('code', 'solidity', 'smart contract', 'help', priority=6, name='tech_route')(noop)
+    greeny.default(name='conversation_route')(noop)
+
+    top = MessageRouter()
+    top.prefix('greeny', name='greeny_route')(noop)
+
+    def route(message, content_lower):
+        resolved = top.resolve(message, content_lower)
+        if resolved is None:
+            return None
+        found = greeny.resolve(message, resolved[1])
+        return found[0].name if found else None
+    return route
+
+
+def bench(name, func, message, rounds=5000):
+    lines = [line.lower() for line in CORPUS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for line in lines:
+            func(message, line)
+    per_message = (time.perf_counter() - start) / (rounds * len(lines)) * 1e6
+    print(f"{name:8s} {per_message:5.2f}us/message")
+
+
+def main():
+    router = build_router()
+    for admin in (False, True):
+        message = FakeMessage(admin)
+        mismatches = [line for line in CORPUS
+                      if legacy(message, line.lower()) != router(message, line.lower())]
+        print(f"admin={admin}: {len(mismatches)} routing differences {mismatches}")
+    message = FakeMessage(False)
+    bench("legacy", legacy, message)
+    bench("router", router, message)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Faux serveur Binance local : flux combiné <symbol>@miniTicker en
+WebSocket et ticker/price en REST, avec des prix en marche aléatoire.
+Sert aux essais du price book sans toucher à Binance.
+
+    python benchmarks/fake_binance.py [port]
+    BINANCE_WS_URL=ws://127.0.0.1:9443/stream python shaderbot_greeny_v7.4.py
+
+drop_after coupe chaque connexion WebSocket après N messages pour
+exercer la reconnexion.
+"""
+import sys
+import time
+import random
+import asyncio
+from typing import Optional
+
+from aiohttp import web
+
+
+def make_app(interval: float = 0.1, drop_after: Optional[int] = None) -> web.Application:
+    prices = {}
+
+    def tick(symbol: str) -> float:
+        price = prices.get(symbol, random.uniform(1, 50000))
+        prices[symbol] = price = price * (1 + random.gauss(0, 0.001))
+        return price
+
+    async def stream(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        symbols = [name.split('@')[0].upper() for name in request.query.get('streams', '').split('/') if name]
+        sent = 0
+        try:
+            while not ws.closed and (drop_after is None or sent < drop_after):
+                for symbol in symbols:
+                    await ws.send_json({
+                        "stream": f"{symbol.lower()}@miniTicker",
+                        "data": {"e": "24hrMiniTicker", "E": int(time.time() * 1000), "s": symbol,
+                                 "c": f"{tick(symbol):.8f}"}
+                    })
+                    sent += 1
+                await asyncio.sleep(interval)
+        except ConnectionResetError:
+            pass  # client parti
+        await ws.close()
+        return ws
+
+    async def ticker_price(request):
+        symbol = request.query.get('symbol', '').upper()
+        return web.json_response({"symbol": symbol, "price": f"{tick(symbol):.8f}"})
+
+    app = web.Application()
+    app.router.add_get('/stream', stream)
+    app.router.add_get('/api/v3/ticker/price', ticker_price)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(make_app(), host='127.0.0.1', port=int(sys.argv[1]) if len(sys.argv) > 1 else 9443)
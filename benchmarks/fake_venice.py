@@ -0,0 +1,55 @@
+"""Faux serveur Venice local : /chat/completions en JSON ou en flux SSE
+(stream=true, un morceau de texte par événement), pour essayer le
+streaming sans clé ni crédits Venice.
+
+    python benchmarks/fake_venice.py [port]
+    VENICE_API_URL=http://127.0.0.1:8765 python shaderbot_greeny_v7.4.py
+
+fail_after coupe le flux après N morceaux pour exercer les erreurs en
+cours de réponse ; on_disconnect est appelé quand le client ferme le flux
+avant la fin.
+"""
+import sys
+import json
+import asyncio
+from typing import Callable, Optional
+
+from aiohttp import web
+
+ANSWER = ("Wake up, Neo... VVV stakers earn a share of Venice compute every day.\n"
+          "The Matrix has you: stake, wait, collect VCU. ") * 30
+
+
+def make_app(answer: str = ANSWER, chunk_size: int = 12, delay: float = 0.01,
+             fail_after: Optional[int] = None,
+             on_disconnect: Optional[Callable[[], None]] = None) -> web.Application:
+    async def completions(request):
+        payload = await request.json()
+        if not payload.get("stream"):
+            return web.json_response({"choices": [{"message": {"role": "assistant", "content": answer}}]})
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        pieces = [answer[i:i + chunk_size] for i in range(0, len(answer), chunk_size)]
+        try:
+            for n, piece in enumerate(pieces):
+                if fail_after is not None and n >= fail_after:
+                    request.transport.close()  # coupure brutale, sans [DONE]
+                    return response
+                chunk = {"choices": [{"index": 0, "delta": {"content": piece}}]}
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                await asyncio.sleep(delay)
+            await response.write(b"data: [DONE]\n\n")
+        except ConnectionResetError:
+            # client parti (échéance dépassée, requête annulée)
+            if on_disconnect is not None:
+                on_disconnect()
+        return response
+
+    app = web.Application()
+    app.router.add_post('/chat/completions', completions)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(make_app(), host='127.0.0.1', port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
@@ -0,0 +1 @@
+# Rend core/, trackers/ et benchmarks/ importables avec un simple `pytest`
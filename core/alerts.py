@@ -0,0 +1,174 @@
+import re
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from core.memory_store import MemoryStore
+
+_ALERT = re.compile(r"^\s*([a-z0-9]+)\s*(>=|<=|>|<)\s*\$?\s*([0-9][0-9,]*(?:\.[0-9]+)?)\s*$", re.IGNORECASE)
+
+
+class AlertLimitReached(Exception):
+    """L'utilisateur a déjà le nombre maximum d'alertes actives"""
+
+
+class Alert(NamedTuple):
+    id: str
+    symbol: str       # paire Binance, ex. ETHUSDT
+    above: bool       # True : prix >= seuil, False : prix <= seuil
+    threshold: float
+    channel_id: int
+    user_id: int
+    guild_id: Optional[int]
+
+
+def parse_alert(text: str) -> Optional[Tuple[str, bool, float]]:
+    """"ETH > 2000" -> ("ETHUSDT", True, 2000.0), None si ce n'est pas une alerte"""
+    match = _ALERT.match(text)
+    if match is None:
+        return None
+    symbol, operator, threshold = match.groups()
+    symbol = symbol.upper()
+    if not symbol.endswith("USDT"):
+        symbol += "USDT"
+    return symbol, operator.startswith(">"), float(threshold.replace(",", ""))
+
+
+class AlertEngine:
+    """Alertes de prix à déclenchement unique, persistées dans la section
+    "alerts" du MemoryStore.
+
+    Deux tas par symbole : seuils hauts (min-heap) et seuils bas (max-heap).
+    Un tick de prix ne regarde que le sommet des tas et ne dépile que les
+    alertes franchies : O(log n + k) au lieu de parcourir toutes les alertes.
+    Une alerte supprimée reste dans son tas et est ignorée au dépilage ;
+    les tas sont reconstruits quand ces entrées mortes deviennent majoritaires.
+    """
+
+    def __init__(self, store: MemoryStore, max_per_user: int = 25):
+        self.store = store
+        self.max_per_user = max_per_user
+        self._alerts: Dict[str, Alert] = {}
+        self._above: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        self._below: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        self._per_user: Dict[int, int] = defaultdict(int)
+        self._dead = 0
+        self._next_id = 1
+        self.triggered = 0
+        self._load()
+
+    def _load(self):
+        for alert_id, item in self.store.data.get('alerts', {}).items():
+            spec = item.get('spec')
+            if not spec:
+                continue
+            try:
+                self._index(Alert(alert_id, *spec))
+                self._next_id = max(self._next_id, int(alert_id) + 1)
+            except (TypeError, ValueError) as e:
+                logging.warning(f"Alerte {alert_id} ignorée : {str(e)}")
+        if self._alerts:
+            logging.info(f"{len(self._alerts)} price alerts loaded")
+
+    def _index(self, alert: Alert):
+        self._alerts[alert.id] = alert
+        self._per_user[alert.user_id] += 1
+        if alert.above:
+            heapq.heappush(self._above[alert.symbol], (alert.threshold, alert.id))
+        else:
+            heapq.heappush(self._below[alert.symbol], (-alert.threshold, alert.id))
+
+    def _unindex(self, alert: Alert):
+        del self._alerts[alert.id]
+        self._per_user[alert.user_id] -= 1
+        if not self._per_user[alert.user_id]:
+            del self._per_user[alert.user_id]
+        self.store.delete('alerts', alert.id)
+
+    # API
+
+    def add(self, symbol: str, above: bool, threshold: float, channel_id: int, user_id: int,
+            guild_id: Optional[int] = None) -> Alert:
+        if self._per_user.get(user_id, 0) >= self.max_per_user:
+            raise AlertLimitReached()
+        alert = Alert(str(self._next_id), symbol.upper(), above, threshold, channel_id, user_id, guild_id)
+        self._next_id += 1
+        self._index(alert)
+        self.store.set('alerts', alert.id, 'spec', list(alert[1:]))
+        return alert
+
+    def remove(self, alert_id: str, user_id: Optional[int] = None) -> bool:
+        """Supprime une alerte (seulement la sienne si user_id est donné)"""
+        alert = self._alerts.get(alert_id)
+        if alert is None or (user_id is not None and alert.user_id != user_id):
+            return False
+        self._unindex(alert)
+        self._dead += 1
+        if self._dead > len(self._alerts):
+            self._rebuild()
+        return True
+
+    def user_alerts(self, user_id: int) -> List[Alert]:
+        return [alert for alert in self._alerts.values() if alert.user_id == user_id]
+
+    def symbols(self) -> List[str]:
+        """Symboles ayant au moins une alerte active"""
+        return [symbol for symbol in set(self._above) | set(self._below)
+                if self._above.get(symbol) or self._below.get(symbol)]
+
+    def on_price(self, symbol: str, price: float) -> List[Alert]:
+        """Déclenche (et supprime) les alertes franchies par ce prix"""
+        fired = []
+        heap = self._above.get(symbol)
+        while heap and heap[0][0] <= price:
+            _, alert_id = heapq.heappop(heap)
+            alert = self._alerts.get(alert_id)
+            if alert is not None:
+                fired.append(alert)
+            else:
+                self._dead -= 1
+        heap = self._below.get(symbol)
+        while heap and -heap[0][0] >= price:
+            _, alert_id = heapq.heappop(heap)
+            alert = self._alerts.get(alert_id)
+            if alert is not None:
+                fired.append(alert)
+            else:
+                self._dead -= 1
+        for alert in fired:
+            self._unindex(alert)
+        self.triggered += len(fired)
+        return fired
+
+    def on_prices(self, prices: Dict[str, float]) -> Dict[int, List[Tuple[Alert, float]]]:
+        """Applique un lot de prix, alertes déclenchées regroupées par salon"""
+        by_channel: Dict[int, List[Tuple[Alert, float]]] = defaultdict(list)
+        for symbol in self.symbols():
+            price = prices.get(symbol)
+            if price is None:
+                continue
+            for alert in self.on_price(symbol, price):
+                by_channel[alert.channel_id].append((alert, price))
+        return by_channel
+
+    def _rebuild(self):
+        self._above.clear()
+        self._below.clear()
+        for alert in self._alerts.values():
+            if alert.above:
+                self._above[alert.symbol].append((alert.threshold, alert.id))
+            else:
+                self._below[alert.symbol].append((-alert.threshold, alert.id))
+        for heap in list(self._above.values()) + list(self._below.values()):
+            heapq.heapify(heap)
+        self._dead = 0
+
+    def stats(self) -> dict:
+        return {
+            "alerts": len(self._alerts),
+            "symbols": len(self.symbols()),
+            "users": len(self._per_user),
+            "dead_entries": self._dead,
+            "triggered": self.triggered
+        }
@@ -0,0 +1,111 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Durée de vie par API (secondes) - les prix bougent vite, le reste beaucoup moins
+DEFAULT_TTLS = {
+    "BINANCE": 5,
+    "COINGECKO": 30,
+    "NEWS": 900,
+    "WIKI": 6 * 3600,
+    "MEALS": 6 * 3600,
+    "JOKES": 0,      # 0 = jamais mis en cache (contenu aléatoire)
+    "DOGS": 0,
+    "DEFAULT": 60
+}
+
+
+class ResponseCache:
+    """Cache TTL + LRU borné en nombre d'entrées et en octets.
+
+    Les entrées expirées sont purgées à la lecture ; quand un budget est
+    dépassé, les entrées les moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self, max_entries: int = 2048, max_bytes: int = 32 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(api_name: str, endpoint: str, params: Optional[dict] = None) -> str:
+        """Clé stable : l'ordre des paramètres n'a pas d'importance"""
+        encoded = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str) if params else ""
+        return f"{api_name}:{endpoint}:{encoded}"
+
+    def ttl_for(self, api_name: str) -> float:
+        return self.ttls.get(api_name, self.ttls["DEFAULT"])
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at, size = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, api_name: str = "DEFAULT"):
+        ttl = self.ttl_for(api_name)
+        if ttl <= 0:
+            return
+        size = len(json.dumps(value, separators=(',', ':'), default=str).encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self.size_bytes += size
+        self._enforce_budget()
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+    def _enforce_budget(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.size_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._enforce_budget()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,157 @@
+import io
+import re
+import asyncio
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Hashable, Optional
+
+import numpy as np
+
+_DURATION = re.compile(r"^(\d+)([mhdw])$")
+_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+class ChartQueueFull(Exception):
+    """Trop de graphiques en attente de rendu"""
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """"24h" -> 86400 secondes, None si le format est invalide"""
+    match = _DURATION.match(text.strip().lower())
+    if match is None:
+        return None
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def _warm_up():
+    """Importe matplotlib une fois par processus de rendu"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.figure
+
+
+def _mp_context():
+    """forkserver : les processus de rendu partent d'un serveur lancé à
+    vide, jamais d'un fork du bot (ses threads d'écriture, de log et de
+    surveillance y laisseraient des verrous pris). spawn sous Windows."""
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # Le serveur ne charge que ce module, pas le script du bot
+    context.set_forkserver_preload(["core.charts"])
+    return context
+
+
+def render_chart(title: str, candles: np.ndarray, width: int = 800, height: int = 400) -> bytes:
+    """PNG d'un graphique de clôtures + SMA 20, exécuté dans un processus de
+    rendu. candles : tableau (n, 6) open_time (ms), open, high, low, close, volume."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    import matplotlib.dates as mdates
+
+    times = candles[:, 0].astype("datetime64[ms]")
+    closes = candles[:, 4]
+    fig = Figure(figsize=(width / 100, height / 100), dpi=100, facecolor="#000000")
+    ax = fig.subplots()
+    ax.set_facecolor("#000000")
+    ax.plot(times, closes, color="#2ecc71", linewidth=1.5, label="Close")
+    ax.fill_between(times, candles[:, 3], candles[:, 2], color="#2ecc71", alpha=0.15, linewidth=0)
+    if len(closes) >= 20:
+        sma = np.convolve(closes, np.ones(20) / 20, mode="valid")
+        ax.plot(times[19:], sma, color="#f1c40f", linewidth=1, label="SMA 20")
+    ax.set_title(title, color="#2ecc71", family="monospace")
+    ax.tick_params(colors="#2ecc71", labelsize=8)
+    for spine in ax.spines.values():
+        spine.set_color("#145a32")
+    ax.grid(color="#145a32", linewidth=0.5)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(ax.xaxis.get_major_locator()))
+    ax.legend(facecolor="#000000", edgecolor="#145a32", labelcolor="#2ecc71", fontsize=8)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+class ChartService:
+    """Rendu des graphiques hors de la boucle asyncio, dans un pool de
+    processus (matplotlib tient le GIL pendant des dizaines de ms).
+
+    Au plus max_pending rendus en attente ou en cours : au-delà, render()
+    lève ChartQueueFull au lieu d'empiler. Les PNG sont gardés en mémoire
+    dans un LRU indexé par (symbole, durée, dernière bougie) : tant
+    qu'aucune nouvelle bougie n'arrive, le même graphique est renvoyé.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, cache_size: int = 64):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._inflight = {}
+        self.pending = 0
+        self.rendered = 0
+        self.hits = 0
+        self.rejected = 0
+
+    async def start(self):
+        """Démarre les processus de rendu et y charge matplotlib"""
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context(), initializer=_warm_up)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm_up) for _ in range(self.workers)))
+        logging.info(f"Chart renderer ready ({self.workers} processes)")
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def render(self, key: Hashable, title: str, candles: np.ndarray) -> bytes:
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        # Même graphique déjà en cours de rendu : on attend le même résultat
+        future = self._inflight.get(key)
+        if future is not None:
+            self.hits += 1
+            return await asyncio.shield(future)
+
+        if self._pool is None:
+            raise RuntimeError("ChartService not started, call start() in setup_hook first")
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ChartQueueFull()
+
+        self.pending += 1
+        future = asyncio.get_running_loop().run_in_executor(self._pool, render_chart, title, candles)
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Hashable, future: asyncio.Future):
+        # Même si le demandeur a abandonné, le rendu terminé est mis en cache
+        self.pending -= 1
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.rendered += 1
+        self._cache[key] = future.result()
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "cached": len(self._cache),
+            "rendered": self.rendered,
+            "cache_hits": self.hits,
+            "rejected": self.rejected
+        }
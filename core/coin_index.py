@@ -0,0 +1,217 @@
+import os
+import json
+import asyncio
+import time
+import bisect
+import difflib
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Symboles partagés par plusieurs coins : celui qu'on veut vraiment
+PREFERRED_IDS = {
+    "btc": "bitcoin",
+    "eth": "ethereum",
+    "sol": "solana",
+    "bnb": "binancecoin",
+    "xrp": "ripple",
+    "ada": "cardano",
+    "doge": "dogecoin",
+    "dot": "polkadot",
+    "atom": "cosmos",
+    "osmo": "osmosis",
+    "usdt": "tether",
+    "usdc": "usd-coin",
+    "avax": "avalanche-2",
+    "matic": "matic-network",
+    "link": "chainlink",
+    "ltc": "litecoin",
+    "vvv": "venice-token",
+}
+
+
+class CoinMatch(NamedTuple):
+    id: str                 # id CoinGecko (simple/price)
+    symbol: str             # ticker en minuscules
+    name: str
+    binance: Optional[str]  # paire Binance en USDT, None si non listée
+
+
+class CoinIndex:
+    """Index local ticker/nom/id -> coin, construit depuis CoinGecko
+    /coins/list et Binance exchangeInfo, sauvegardé sur disque sous forme
+    compacte (colonnes id/symbole/nom) et rechargé au démarrage.
+
+    Les requêtes inconnues sont mémorisées (cache négatif) avec leurs
+    suggestions : une faute de frappe répétée ne coûte aucun appel réseau.
+    """
+
+    def __init__(self, file_path: str, max_age: float = 86400, negative_ttl: float = 600):
+        self.file_path = file_path
+        self.max_age = max_age
+        self.negative_ttl = negative_ttl
+        self.built_at = 0.0
+        self._ids: List[str] = []
+        self._symbols: List[str] = []
+        self._names: List[str] = []
+        self._binance: set = set()
+        self._by_key: Dict[str, int] = {}
+        self._sorted_keys: List[str] = []
+        self._negative: Dict[str, Tuple[float, List[str]]] = {}
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._ids)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.built_at > self.max_age
+
+    # Construction
+
+    @staticmethod
+    def _index(coins: List[Tuple[str, str, str]], binance: List[str]) -> tuple:
+        """Tables de l'index, sans toucher à l'instance (appelable depuis un thread)"""
+        coins = sorted(coins)
+        ids = [coin[0] for coin in coins]
+        symbols = [coin[1] for coin in coins]
+        names = [coin[2] for coin in coins]
+
+        # Priorité : coin préféré > id exact > nom > ticker ; pour un ticker
+        # partagé sans préféré, l'id le plus court (souvent l'original)
+        by_key: Dict[str, int] = {}
+        for i in sorted(range(len(coins)), key=lambda i: len(ids[i]), reverse=True):
+            by_key[symbols[i]] = i
+        for i, name in enumerate(names):
+            by_key[name.lower()] = i
+        for i, coin_id in enumerate(ids):
+            by_key[coin_id] = i
+        for symbol, coin_id in PREFERRED_IDS.items():
+            i = bisect.bisect_left(ids, coin_id)
+            if i < len(ids) and ids[i] == coin_id:
+                by_key[symbol] = i
+        return ids, symbols, names, set(binance), by_key, sorted(by_key)
+
+    def _apply(self, index: tuple, built_at: float):
+        self._ids, self._symbols, self._names, self._binance, self._by_key, self._sorted_keys = index
+        self._negative.clear()
+        self.built_at = built_at
+
+    def _build(self, coins: List[Tuple[str, str, str]], binance: List[str], built_at: float):
+        self._apply(self._index(coins, binance), built_at)
+
+    def load(self) -> bool:
+        """Charge l'index sauvegardé, False s'il n'existe pas ou est illisible"""
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            coins = list(zip(data["ids"], data["symbols"], data["names"]))
+            self._build(coins, data["binance"], data["built_at"])
+            logging.info(f"Coin index loaded: {len(coins)} coins, {len(self._binance)} Binance pairs")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logging.error(f"Erreur de chargement de l'index des coins : {str(e)}")
+            return False
+
+    def save(self):
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "built_at": self.built_at,
+            "ids": self._ids,
+            "symbols": self._symbols,
+            "names": self._names,
+            "binance": sorted(self._binance)
+        }
+        tmp_path = self.file_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.file_path)
+
+    async def refresh(self, http_client, coingecko_url: str, binance_url: str) -> bool:
+        """Reconstruit l'index depuis les deux API puis le sauvegarde"""
+        try:
+            async with http_client.get(f"{coingecko_url}/coins/list") as response:
+                if response.status != 200:
+                    logging.error(f"Coin index: CoinGecko HTTP {response.status}")
+                    return False
+                coins = [(coin["id"], coin["symbol"].lower(), coin["name"]) for coin in await response.json()]
+
+            binance: List[str] = []
+            async with http_client.get(f"{binance_url}/exchangeInfo") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    binance = [
+                        s["baseAsset"].lower() for s in data.get("symbols", [])
+                        if s.get("quoteAsset") == "USDT" and s.get("status") == "TRADING"
+                    ]
+                else:
+                    logging.error(f"Coin index: Binance HTTP {response.status}")
+        except Exception as e:
+            logging.error(f"Coin index refresh error: {str(e)}")
+            return False
+
+        # ~15k coins : tri, tables et écriture hors de la boucle ; l'index
+        # n'est remplacé que sur la boucle, d'un bloc
+        index = await asyncio.to_thread(self._index, coins, binance)
+        self._apply(index, time.time())
+        await asyncio.to_thread(self.save)
+        logging.info(f"Coin index refreshed: {len(coins)} coins, {len(binance)} Binance pairs")
+        return True
+
+    # Recherche
+
+    def resolve(self, query: str) -> Optional[CoinMatch]:
+        """Coin correspondant à un ticker, un nom ou un id, None si inconnu"""
+        key = query.strip().lower()
+        i = self._by_key.get(key)
+        if i is None:
+            return None
+        self.hits += 1
+        symbol = self._symbols[i]
+        binance = f"{symbol.upper()}USDT" if symbol in self._binance or not self._binance else None
+        return CoinMatch(self._ids[i], symbol, self._names[i], binance)
+
+    def suggest(self, query: str, limit: int = 3) -> List[str]:
+        """Suggestions pour une requête inconnue (préfixe puis proximité),
+        mémorisées avec la requête dans le cache négatif"""
+        key = query.strip().lower()
+        entry = self._negative.get(key)
+        if entry is not None and entry[0] > time.time():
+            self.negative_hits += 1
+            return entry[1]
+
+        self.misses += 1
+        suggestions: List[str] = []
+        start = bisect.bisect_left(self._sorted_keys, key)
+        for candidate in self._sorted_keys[start:start + limit]:
+            if candidate.startswith(key):
+                suggestions.append(candidate)
+        if len(suggestions) < limit and key:
+            # Même première lettre : évite de comparer à tout l'index
+            first = bisect.bisect_left(self._sorted_keys, key[0])
+            last = bisect.bisect_left(self._sorted_keys, chr(ord(key[0]) + 1))
+            for candidate in difflib.get_close_matches(key, self._sorted_keys[first:last], n=limit, cutoff=0.6):
+                if candidate not in suggestions:
+                    suggestions.append(candidate)
+        suggestions = suggestions[:limit]
+
+        self._negative[key] = (time.time() + self.negative_ttl, suggestions)
+        if len(self._negative) > 4096:
+            now = time.time()
+            self._negative = {k: v for k, v in self._negative.items() if v[0] > now}
+        return suggestions
+
+    def stats(self) -> dict:
+        return {
+            "coins": len(self._ids),
+            "binance_pairs": len(self._binance),
+            "age_s": time.time() - self.built_at if self.built_at else None,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,116 @@
+import os
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Awaitable, Callable, List, Optional
+
+# Budget par commande (secondes), surchargeable : COMMAND_DEADLINES="price=3,ask=30"
+COMMAND_DEADLINES = {"price": 3.0, "ask": 30.0, "analyze": 30.0, "signal": 10.0, "chart": 15.0, "airdrop": 20.0}
+COMMAND_DEADLINES.update({
+    name.strip(): float(seconds)
+    for name, _, seconds in (item.partition('=') for item in os.getenv('COMMAND_DEADLINES', '').split(',') if '=' in item)
+})
+DEFAULT_COMMAND_DEADLINE = float(os.getenv('COMMAND_DEADLINE', '10'))
+
+# Échéance absolue (time.monotonic) de la commande en cours, héritée par les
+# tâches créées pendant la commande (asyncio copie le contexte)
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+
+# Marqueur à passer en dropped= pour distinguer les appels abandonnés à l'échéance
+DROPPED = object()
+_UNSET = object()
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Le budget de temps de la commande est épuisé"""
+
+
+def command_deadline(name: str) -> float:
+    return COMMAND_DEADLINES.get(name, DEFAULT_COMMAND_DEADLINE)
+
+
+def set_deadline(seconds: float) -> Token:
+    """Fixe une échéance dans seconds ; une échéance englobante plus proche
+    reste prioritaire (un appel imbriqué ne rallonge jamais le budget)"""
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < deadline:
+        deadline = current
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token: Token):
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline(seconds: float):
+    token = set_deadline(seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Secondes restantes, None hors de toute échéance"""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+
+def cap(seconds: float) -> float:
+    """seconds, réduit au budget restant s'il y en a un"""
+    left = remaining()
+    return seconds if left is None else max(0.0, min(seconds, left))
+
+
+def defer_budget(func: Callable[[], Awaitable[Any]]) -> Callable[[], Awaitable[Any]]:
+    """func avec le budget restant mis en pause jusqu'à son appel : le temps
+    passé dans une file d'attente (scheduler LLM) n'est pas décompté"""
+    left = remaining()
+    if left is None:
+        return func
+
+    async def run():
+        token = _deadline.set(time.monotonic() + max(0.0, left))
+        try:
+            return await func()
+        finally:
+            _deadline.reset(token)
+    return run
+
+
+async def gather_partial(*aws: Awaitable, default: Any = None, dropped: Any = _UNSET) -> List[Any]:
+    """Comme asyncio.gather, mais s'arrête à l'échéance : les appels encore
+    en cours sont annulés et valent dropped (default si dropped n'est pas
+    donné), ceux en erreur valent default. Sans échéance, attend tout le monde."""
+    if dropped is _UNSET:
+        dropped = default
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    left = remaining()
+    try:
+        done, pending = await asyncio.wait(tasks, timeout=None if left is None else max(0.0, left))
+    except asyncio.CancelledError:
+        for task in tasks:
+            task.cancel()
+        raise
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        logging.warning(f"Deadline reached: {len(pending)}/{len(tasks)} calls dropped, partial results returned")
+    results = []
+    for task in tasks:
+        if task not in done or task.cancelled():
+            results.append(dropped)
+        elif task.exception() is not None:
+            logging.error(f"Fan-out call failed: {str(task.exception())}")
+            results.append(default)
+        else:
+            results.append(task.result())
+    return results
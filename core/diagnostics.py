@@ -0,0 +1,157 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import tracemalloc
+import weakref
+from collections import Counter
+from typing import List, Optional, Tuple
+
+
+class ProfilerBusy(Exception):
+    """Un profilage est déjà en cours"""
+
+
+def _frame_name(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Profileur par échantillonnage du thread de la boucle asyncio.
+
+    Un thread relève la pile du thread cible toutes les interval secondes
+    (sys._current_frames) et compte les piles identiques. Le résultat est
+    au format "collapsed stacks" (racine;...;feuille compte), lisible par
+    flamegraph.pl ou speedscope. Coût négligeable pour le bot : aucune
+    instrumentation, seulement quelques centaines de lectures par seconde.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.running = False
+        self._stop = threading.Event()
+
+    async def run(self, seconds: float, thread_id: Optional[int] = None) -> Tuple[str, int]:
+        """Échantillonne pendant seconds (ou jusqu'à stop()), renvoie
+        (piles repliées, nombre d'échantillons)"""
+        if self.running:
+            raise ProfilerBusy()
+        self.running = True
+        self._stop.clear()
+        target = thread_id if thread_id is not None else threading.get_ident()
+        stacks: Counter = Counter()
+        thread = threading.Thread(target=self._sample, args=(target, seconds, stacks),
+                                  name="sampling-profiler", daemon=True)
+        thread.start()
+        try:
+            while thread.is_alive():
+                await asyncio.sleep(0.2)
+        finally:
+            self._stop.set()
+            self.running = False
+        lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+        return "\n".join(lines) + "\n", sum(stacks.values())
+
+    def stop(self):
+        self._stop.set()
+
+    def _sample(self, target: int, seconds: float, stacks: Counter):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline and not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(target)
+            names = []
+            while frame is not None:
+                names.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if names:
+                stacks[";".join(reversed(names))] += 1
+
+
+class MemoryTracker:
+    """Instantanés tracemalloc à la demande : top des lignes qui allouent,
+    et différence avec l'instantané précédent. tracemalloc ralentit les
+    allocations, il ne tourne qu'entre start() et stop()."""
+
+    _FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def running(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self._baseline = None
+
+    def stop(self):
+        tracemalloc.stop()
+        self._baseline = None
+
+    async def _snapshot(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        # take_snapshot + statistics coûtent des centaines de ms : hors de la boucle
+        return await asyncio.to_thread(lambda: tracemalloc.take_snapshot().filter_traces(self._FILTERS))
+
+    async def top(self, limit: int = 10) -> List[str]:
+        """Lignes qui détiennent le plus de mémoire ; devient la référence de diff()"""
+        snapshot = await self._snapshot()
+        self._baseline = snapshot
+        stats = await asyncio.to_thread(snapshot.statistics, "lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        return [f"traced {current / 1e6:.1f}MB (peak {peak / 1e6:.1f}MB)"] + [
+            f"{stat.size / 1024:9.1f}KB {stat.count:7d} blocks  {stat.traceback[0]}" for stat in stats[:limit]
+        ]
+
+    async def diff(self, limit: int = 10) -> List[str]:
+        """Plus fortes variations depuis l'instantané précédent"""
+        snapshot = await self._snapshot()
+        if self._baseline is None:
+            self._baseline = snapshot
+            return ["baseline taken, run diff again later"]
+        stats = await asyncio.to_thread(snapshot.compare_to, self._baseline, "lineno")
+        self._baseline = snapshot
+        return [f"{stat.size_diff / 1024:+9.1f}KB {stat.count_diff:+7d} blocks  {stat.traceback[0]}"
+                for stat in stats[:limit]]
+
+
+class TaskTracker:
+    """Date de création des tâches asyncio, via une task factory (les Task
+    n'ont pas d'horodatage). Les tâches créées avant install() sont datées
+    du moment où elles sont vues pour la première fois."""
+
+    def __init__(self):
+        self._created: "weakref.WeakKeyDictionary[asyncio.Task, float]" = weakref.WeakKeyDictionary()
+
+    def install(self, loop: asyncio.AbstractEventLoop):
+        previous = loop.get_task_factory()
+
+        def factory(loop, coro, **kwargs):
+            task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+            self._created[task] = time.monotonic()
+            return task
+
+        loop.set_task_factory(factory)
+
+    def tasks(self, limit: int = 20) -> List[Tuple[float, str, str, str]]:
+        """(âge, nom, coroutine, point d'attente), les plus anciennes d'abord"""
+        now = time.monotonic()
+        rows = []
+        for task in asyncio.all_tasks():
+            created = self._created.setdefault(task, now)
+            coro = task.get_coro()
+            name = getattr(coro, "__qualname__", type(coro).__name__)
+            stack = task.get_stack(limit=1)
+            where = f"{os.path.basename(stack[0].f_code.co_filename)}:{stack[0].f_lineno}" if stack else "-"
+            rows.append((now - created, task.get_name(), name, where))
+        rows.sort(reverse=True)
+        return rows[:limit]
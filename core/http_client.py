@@ -0,0 +1,86 @@
+import os
+import logging
+import aiohttp
+from typing import Optional, Dict, Any, List
+
+from core.deadline import DeadlineExceeded, remaining
+
+# Limites du pool de connexions (surchargeables via config/.env)
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '10'))
+HTTP_DNS_TTL = int(os.getenv('HTTP_DNS_TTL', '300'))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+# Délais par requête hors commande (tâches de fond, 300 s comme aiohttp) ;
+# sous une commande, le budget restant de la commande (core.deadline) les réduit
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '300'))
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+
+
+def request_timeout(total: float = HTTP_TIMEOUT, connect: float = HTTP_CONNECT_TIMEOUT) -> aiohttp.ClientTimeout:
+    """ClientTimeout borné par l'échéance courante ; DeadlineExceeded si
+    le budget est déjà épuisé (la requête n'est même pas envoyée)"""
+    left = remaining()
+    if left is not None:
+        if left <= 0:
+            raise DeadlineExceeded()
+        total, connect = min(total, left), min(connect, left)
+    return aiohttp.ClientTimeout(total=total, connect=connect)
+
+
+class HttpClient:
+    """Session aiohttp unique pour toute la durée de vie du bot.
+
+    Un seul TCPConnector garde un pool de connexions keep-alive par hôte
+    et met en cache les résolutions DNS, au lieu d'ouvrir une nouvelle
+    session (TCP + TLS + DNS) à chaque message.
+    """
+
+    def __init__(self, limit: int = HTTP_POOL_LIMIT, limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+                 dns_ttl: int = HTTP_DNS_TTL, keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+                 headers: Optional[Dict[str, str]] = None,
+                 trace_configs: Optional[List[aiohttp.TraceConfig]] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.headers = headers
+        self.trace_configs = trace_configs
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Crée la session partagée (à appeler depuis setup_hook)"""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        self._session = aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                              trace_configs=self.trace_configs)
+        logging.info(f"HTTP pool ready (limit={self.limit}, per_host={self.limit_per_host}, dns_ttl={self.dns_ttl}s)")
+
+    async def close(self):
+        """Ferme la session et toutes les connexions du pool"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HttpClient not started, call start() in setup_hook first")
+        return self._session
+
+    def get(self, url: str, **kwargs: Any):
+        kwargs.setdefault('timeout', request_timeout())
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        kwargs.setdefault('timeout', request_timeout())
+        return self.session.post(url, **kwargs)
+
+    def ws_connect(self, url: str, **kwargs: Any):
+        return self.session.ws_connect(url, **kwargs)
@@ -0,0 +1,69 @@
+import re
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, List
+
+from core.rate_limiter import TokenBucket
+
+
+class KeywordReactor:
+    """Réactions aux mots-clés : une seule regex compilée (alternative avec
+    frontières de mots, plus longs mots-clés d'abord), emojis dédoublonnés,
+    et envoi concurrent des réactions dans la limite d'un budget par salon.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]], rate: float = 1.0, burst: int = 6,
+                 max_channels: int = 1024):
+        self.keywords = {keyword.lower(): emojis for keyword, emojis in keywords.items()}
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, alternatives)) + r")\b")
+        self.rate = rate
+        self.burst = burst
+        self.max_channels = max_channels
+        self._budgets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+        self._tasks = set()
+        self.sent = 0
+        self.dropped = 0
+
+    def match(self, text: str) -> List[str]:
+        """Emojis à ajouter, dans l'ordre d'apparition, sans doublons"""
+        emojis = []
+        for keyword in self.pattern.findall(text.lower()):
+            for emoji in self.keywords[keyword]:
+                if emoji not in emojis:
+                    emojis.append(emoji)
+        return emojis
+
+    def _budget(self, channel_id: int) -> TokenBucket:
+        bucket = self._budgets.get(channel_id)
+        if bucket is None:
+            bucket = TokenBucket(rate=self.rate, burst=self.burst)
+            self._budgets[channel_id] = bucket
+            if len(self._budgets) > self.max_channels:
+                self._budgets.popitem(last=False)
+        else:
+            self._budgets.move_to_end(channel_id)
+        return bucket
+
+    def dispatch(self, message):
+        """Lance les réactions en tâche de fond, sans retarder on_message"""
+        emojis = self.match(message.content)
+        if not emojis:
+            return
+        budget = self._budget(message.channel.id)
+        allowed = [emoji for emoji in emojis if budget.try_acquire()]
+        self.dropped += len(emojis) - len(allowed)
+        if not allowed:
+            return
+        task = asyncio.ensure_future(self._react(message, allowed))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _react(self, message, emojis: List[str]):
+        results = await asyncio.gather(*(message.add_reaction(emoji) for emoji in emojis), return_exceptions=True)
+        for emoji, result in zip(emojis, results):
+            if isinstance(result, Exception):
+                logging.warning(f"Réaction {emoji} impossible : {str(result)}")
+            else:
+                self.sent += 1
@@ -0,0 +1,120 @@
+import re
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+from langdetect import DetectorFactory, detect, lang_detect_exception
+from langdetect.detector_factory import init_factory
+
+SUPPORTED_LANGUAGES = ['fr', 'en', 'es', 'ru']
+
+# Mots outils discriminants (pas de mots communs à deux langues)
+STOPWORDS = {
+    'en': {'the', 'is', 'are', 'what', 'how', 'to', 'and', 'of', 'you', 'it', 'this', 'i', 'do',
+           'can', 'my', 'with', 'why', 'when', 'price', 'please', 'does', 'will'},
+    'fr': {'le', 'les', 'est', 'et', 'des', 'un', 'une', 'je', 'tu', 'quoi', 'comment', 'pour',
+           'pas', 'c', 'ce', 'mon', 'avec', 'pourquoi', 'quand', 'prix', 'du', 'au', 'vous'},
+    'es': {'el', 'los', 'es', 'y', 'como', 'qué', 'por', 'para', 'una', 'mi', 'con', 'cuándo',
+           'precio', 'yo', 'las', 'del', 'cómo', 'porque', 'hola'}
+}
+_CYRILLIC = re.compile(r"[Ѐ-ӿ]")
+_WORDS = re.compile(r"\w+")
+
+
+class LanguageService:
+    """Détection de langue hors du chemin critique :
+    1. langue choisie par l'utilisateur (!lang), gardée dans la section
+       preferences du MemoryStore si un store est donné
+    2. LRU des textes récemment détectés
+    3. heuristique rapide (alphabet + mots outils) suffisante pour les textes courts
+    4. langdetect en dernier recours, dans un thread, avec graine fixe (déterministe)
+    """
+
+    def __init__(self, cache_size: int = 4096, short_text: int = 24, store=None):
+        self.cache_size = cache_size
+        self.short_text = short_text
+        self.store = store
+        self.user_languages: Dict[str, str] = {}   # choix explicite (!lang)
+        if store is not None:
+            for user_id, item in store.data.get('preferences', {}).items():
+                if item.get('language') in SUPPORTED_LANGUAGES:
+                    self.user_languages[user_id] = item['language']
+        self.last_detected: Dict[str, str] = {}    # dernière langue détectée par utilisateur
+        self._recent: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.hits = 0
+        self.heuristic = 0
+        self.full = 0
+
+    def warm_up(self):
+        """Charge tous les profils langdetect maintenant plutôt qu'au premier message"""
+        DetectorFactory.seed = 0
+        init_factory()
+        logging.info("Language profiles loaded")
+
+    def set_preference(self, user_id: str, lang: str):
+        self.user_languages[user_id] = lang
+        if self.store is not None:
+            self.store.set('preferences', user_id, 'language', lang)
+
+    @staticmethod
+    def guess(text: str) -> Optional[str]:
+        """Heuristique : None si pas assez d'indices"""
+        if _CYRILLIC.search(text):
+            return 'ru'
+        scores = {lang: 0 for lang in STOPWORDS}
+        for word in _WORDS.findall(text.lower()):
+            for lang, words in STOPWORDS.items():
+                if word in words:
+                    scores[lang] += 1
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best, best_score), (_, second_score) = ranked[0], ranked[1]
+        if best_score >= 2 and best_score >= 2 * second_score:
+            return best
+        return None
+
+    async def detect(self, text: str, user_id: Optional[str] = None) -> Optional[str]:
+        if user_id is not None and user_id in self.user_languages:
+            return self.user_languages[user_id]
+
+        key = text.strip().lower()
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            self.hits += 1
+            return self._recent[key]
+
+        lang = self.guess(key)
+        if lang is not None:
+            self.heuristic += 1
+        elif len(key) < self.short_text:
+            # Trop court pour langdetect : on garde la dernière langue connue
+            self.heuristic += 1
+            return self.last_detected.get(user_id) if user_id is not None else None
+        else:
+            self.full += 1
+            lang = await asyncio.to_thread(self._detect_full, key)
+
+        self._remember(key, lang)
+        if lang is not None and user_id is not None:
+            self.last_detected[user_id] = lang
+        return lang
+
+    @staticmethod
+    def _detect_full(text: str) -> Optional[str]:
+        try:
+            return detect(text)
+        except lang_detect_exception.LangDetectException:
+            return None
+
+    def _remember(self, key: str, lang: Optional[str]):
+        self._recent[key] = lang
+        if len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "preferences": len(self.user_languages),
+            "recent": len(self._recent),
+            "cache_hits": self.hits,
+            "heuristic": self.heuristic,
+            "langdetect": self.full
+        }
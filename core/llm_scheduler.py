@@ -0,0 +1,161 @@
+import heapq
+import asyncio
+import logging
+import itertools
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from core.deadline import defer_budget
+
+
+class SchedulerFull(Exception):
+    """L'utilisateur a déjà trop de requêtes en attente"""
+
+
+class RequestCancelled(Exception):
+    """La requête a été annulée (message supprimé par l'utilisateur)"""
+
+
+class _Ticket:
+    __slots__ = ("ticket_id", "flow", "user_id", "sort_key", "granted", "task", "cancelled")
+
+    def __init__(self, ticket_id, flow, user_id, sort_key):
+        self.ticket_id = ticket_id
+        self.flow = flow
+        self.user_id = user_id
+        self.sort_key = sort_key
+        self.granted = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+
+class LLMScheduler:
+    """File d'attente devant Venice : plafond global de requêtes simultanées,
+    partage équitable pondéré (WFQ) entre serveurs, et une voie prioritaire
+    pour les administrateurs. Le budget de temps de la commande (core.deadline)
+    ne court qu'à partir de l'attribution du créneau.
+
+    Chaque requête reçoit une étiquette de fin virtuelle
+    max(temps_virtuel, dernière_fin[serveur]) + 1/poids ; la plus petite
+    étiquette passe en premier, donc un serveur bruyant ne fait
+    qu'allonger sa propre file.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_pending_per_user: int = 3,
+                 weights: Optional[Dict[Hashable, float]] = None):
+        self.max_concurrency = max_concurrency
+        self.max_pending_per_user = max_pending_per_user
+        self.weights = weights or {}
+        self.running = 0
+        self._queue = []                       # heap de ((voie, étiquette, seq), ticket)
+        self._tickets: Dict[Hashable, _Ticket] = {}
+        self._virtual_time = 0.0
+        self._last_finish: Dict[Hashable, float] = defaultdict(float)
+        self._pending_per_user: Dict[Hashable, int] = defaultdict(int)
+        self._seq = itertools.count()
+        self.completed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    async def run(self, func: Callable[[], Awaitable[Any]], flow: Hashable, user_id: Hashable,
+                  priority: bool = False, ticket_id: Optional[Hashable] = None,
+                  on_queued: Optional[Callable[[int], Awaitable[None]]] = None) -> Any:
+        if self._pending_per_user[user_id] >= self.max_pending_per_user:
+            self.rejected += 1
+            raise SchedulerFull(f"{self._pending_per_user[user_id]} requests already pending")
+
+        tag = max(self._virtual_time, self._last_finish[flow]) + 1.0 / self.weights.get(flow, 1.0)
+        self._last_finish[flow] = tag
+        func = defer_budget(func)
+        ticket_id = ticket_id if ticket_id is not None else object()
+        ticket = _Ticket(ticket_id, flow, user_id, (0 if priority else 1, tag, next(self._seq)))
+        self._tickets[ticket_id] = ticket
+        self._pending_per_user[user_id] += 1
+
+        try:
+            heapq.heappush(self._queue, (ticket.sort_key, ticket))
+            self._dispatch()
+            if not ticket.granted.done() and on_queued is not None:
+                # Le créneau peut être attribué pendant l'envoi de la notification :
+                # un échec d'envoi ne doit ni annuler la requête ni garder le créneau
+                try:
+                    await on_queued(self.position(ticket_id))
+                except Exception as e:
+                    logging.error(f"Queue notification failed: {str(e)}")
+            try:
+                await ticket.granted
+            except asyncio.CancelledError:
+                if ticket.cancelled:
+                    raise RequestCancelled() from None
+                raise
+            if ticket.cancelled:
+                raise RequestCancelled()
+
+            ticket.task = asyncio.ensure_future(func())
+            try:
+                return await ticket.task
+            except asyncio.CancelledError:
+                if ticket.cancelled:
+                    raise RequestCancelled() from None
+                ticket.task.cancel()
+                raise
+            finally:
+                self.completed += 1
+        finally:
+            self._tickets.pop(ticket_id, None)
+            self._pending_per_user[user_id] -= 1
+            if not self._pending_per_user[user_id]:
+                del self._pending_per_user[user_id]
+            # Créneau attribué (même juste avant une annulation ou une erreur) :
+            # rendu ici et une seule fois, que func ait tourné ou non
+            if ticket.granted.done() and not ticket.granted.cancelled():
+                self._release()
+            else:
+                ticket.granted.cancel()
+
+    def _dispatch(self):
+        while self.running < self.max_concurrency and self._queue:
+            (_, tag, _), ticket = heapq.heappop(self._queue)
+            if ticket.granted.done():
+                continue  # annulé pendant l'attente
+            self._virtual_time = max(self._virtual_time, tag)
+            self.running += 1
+            ticket.granted.set_result(None)
+
+    def _release(self):
+        self.running -= 1
+        self._dispatch()
+
+    def cancel(self, ticket_id: Hashable) -> bool:
+        """Annule une requête en attente ou en cours, True si elle existait"""
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None or ticket.cancelled:
+            return False
+        ticket.cancelled = True
+        self.cancelled += 1
+        if not ticket.granted.done():
+            ticket.granted.cancel()
+        elif ticket.task is not None:
+            ticket.task.cancel()
+        return True
+
+    def position(self, ticket_id: Hashable) -> int:
+        """Position dans la file (1 = prochain servi), 0 si déjà en cours"""
+        ticket = self._tickets.get(ticket_id)
+        if ticket is None or ticket.granted.done():
+            return 0
+        return 1 + sum(1 for key, other in self._queue
+                       if key < ticket.sort_key and not other.granted.done())
+
+    def queue_depth(self) -> int:
+        return sum(1 for _, ticket in self._queue if not ticket.granted.done())
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queue_depth(),
+            "max_concurrency": self.max_concurrency,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,148 @@
+import os
+import gzip
+import json
+import queue
+import atexit
+import shutil
+import logging
+import datetime
+import logging.handlers
+from typing import Optional
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# Rotation : chaque jour à minuit, ou dès que le fichier dépasse LOG_MAX_BYTES
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(20 * 1024 * 1024)))
+LOG_BACKUPS = int(os.getenv('LOG_BACKUPS', '30'))
+# Messages plus longs (réponses d'API loggées en entier...) tronqués à cette taille
+LOG_MAX_MESSAGE = int(os.getenv('LOG_MAX_MESSAGE', '2000'))
+
+CONSOLE_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+
+# Attributs standards d'un LogRecord : tout le reste vient de extra={...}
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class TruncateFilter(logging.Filter):
+    """Tronque les messages trop longs avant qu'ils ne partent dans la file"""
+
+    def __init__(self, max_length: int = LOG_MAX_MESSAGE):
+        super().__init__()
+        self.max_length = max_length
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if len(message) > self.max_length:
+            record.msg = f"{message[:self.max_length]}… [{len(message) - self.max_length} chars truncated]"
+            record.args = None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement, champs extra={...} inclus"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Comme QueueHandler, mais garde le message, la trace et les champs
+    extra séparés pour que chaque formateur du thread d'écriture les
+    mette en forme à sa façon"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RotatingLogFile(logging.handlers.BaseRotatingHandler):
+    """Fichier journal qui tourne à minuit et au-delà de max_bytes.
+    Les anciens fichiers sont compressés (bot.jsonl.2025-02-12.1.gz) et
+    seuls les backups plus récents sont gardés. Utilisé uniquement depuis
+    le thread d'écriture : la compression ne bloque jamais le bot."""
+
+    def __init__(self, filename: str, max_bytes: int = LOG_MAX_BYTES, backups: int = LOG_BACKUPS):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, 'a', encoding='utf-8')
+        self.max_bytes = max_bytes
+        self.backups = backups
+        # Fichier laissé par une exécution précédente : il tourne au premier message d'un autre jour
+        self._day = datetime.date.fromtimestamp(os.path.getmtime(self.baseFilename))
+        self._last_index = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            return False
+        if datetime.date.today() != self._day:
+            return True
+        return self.max_bytes > 0 and self.stream.tell() >= self.max_bytes
+
+    def doRollover(self):
+        self.stream.close()
+        self.stream = None
+        if os.path.getsize(self.baseFilename):
+            # Numéro suivant le plus grand du jour, même si les premiers ont été purgés
+            n = self._last_index + 1
+            while os.path.exists(f"{self.baseFilename}.{self._day}.{n}.gz"):
+                n += 1
+            self._last_index = n
+            target = f"{self.baseFilename}.{self._day}.{n}.gz"
+            with open(self.baseFilename, 'rb') as source, gzip.open(target, 'wb') as dest:
+                shutil.copyfileobj(source, dest)
+            os.remove(self.baseFilename)
+            self._prune()
+        if self._day != datetime.date.today():
+            self._day, self._last_index = datetime.date.today(), 0
+        self.stream = self._open()
+
+    def _prune(self):
+        folder = os.path.dirname(self.baseFilename)
+        prefix = os.path.basename(self.baseFilename) + '.'
+        archives = sorted((os.path.join(folder, name) for name in os.listdir(folder)
+                           if name.startswith(prefix) and name.endswith('.gz')), key=os.path.getmtime)
+        for path in archives[:max(0, len(archives) - self.backups)]:
+            os.remove(path)
+
+
+def setup_logging(path: str, level: str = LOG_LEVEL, max_bytes: int = LOG_MAX_BYTES,
+                  backups: int = LOG_BACKUPS, max_message: int = LOG_MAX_MESSAGE) -> logging.handlers.QueueListener:
+    """Remplace logging.basicConfig : les appels de log ne font que poser
+    l'enregistrement dans une file, un thread l'écrit sur la console
+    (texte) et dans le fichier (JSON lines, rotation + gzip)."""
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    log_file = RotatingLogFile(path, max_bytes, backups)
+    log_file.setFormatter(JsonFormatter())
+
+    records: "queue.SimpleQueue[Optional[logging.LogRecord]]" = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    handler.addFilter(TruncateFilter(max_message))
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(records, console, log_file)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
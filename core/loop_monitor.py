@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Un callback qui bloque la boucle plus longtemps que ça est signalé (secondes)
+LOOP_SLOW_THRESHOLD = float(os.getenv('LOOP_SLOW_THRESHOLD', '0.1'))
+# Fenêtre des percentiles : nombre de mesures (une toutes les 0.1 s par défaut)
+LOOP_LAG_WINDOW = int(os.getenv('LOOP_LAG_WINDOW', '3000'))
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+# Bibliothèque standard et site-packages : on remonte jusqu'au code du bot
+_LIBRARY_DIR = os.path.dirname(os.__file__)
+
+
+def _short(filename: str) -> str:
+    parts = filename.replace('\\', '/').split('/')
+    return '/'.join(parts[-2:])
+
+
+def _offender(stack: traceback.StackSummary) -> Tuple[str, str, List[str]]:
+    """(clé, emplacement, pile) : la coroutine ou le callback lancé par la
+    boucle (première frame sous Handle._run), la dernière ligne du bot
+    avant d'entrer dans une bibliothèque, et les frames entre les deux"""
+    entry = 0
+    for i, frame in enumerate(stack):
+        if frame.filename.startswith(_ASYNCIO_DIR) and frame.name == '_run':
+            entry = i + 1
+    entry = min(entry, len(stack) - 1)
+    culprit = len(stack) - 1
+    for i in range(len(stack) - 1, entry - 1, -1):
+        if not stack[i].filename.startswith(_LIBRARY_DIR):
+            culprit = i
+            break
+    top, frame = stack[entry], stack[culprit]
+    return (f"{top.name} ({_short(top.filename)})",
+            f"{_short(frame.filename)}:{frame.lineno} in {frame.name}",
+            traceback.format_list(stack[entry:culprit + 2][-8:]))
+
+
+class LoopMonitor:
+    """Chien de garde de la boucle asyncio.
+
+    Une tâche heartbeat se réveille toutes les interval secondes et mesure
+    son retard (le lag de la boucle), gardé sur une fenêtre glissante pour
+    les percentiles. Un thread séparé surveille ce heartbeat : s'il n'a pas
+    battu depuis threshold secondes, la boucle est bloquée, et le thread
+    capture la pile du thread de la boucle à cet instant (sys._current_frames),
+    donc le code synchrone fautif. Au réveil, le heartbeat attribue la durée
+    du blocage à cette pile et tient le classement des pires coupables.
+    """
+
+    def __init__(self, threshold: float = LOOP_SLOW_THRESHOLD, interval: float = 0.1,
+                 window: int = LOOP_LAG_WINDOW, max_offenders: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_offenders = max_offenders
+        self.lag = 0.0
+        self.slow = 0
+        self._samples = deque(maxlen=window)
+        self._offenders: Dict[str, dict] = {}
+        self._beat = time.monotonic()
+        self._stall: Optional[Tuple[float, traceback.StackSummary]] = None
+        self._loop_thread: Optional[int] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._beat - self.interval)
+            self.lag = lag
+            self._samples.append(lag)
+            if lag >= self.threshold:
+                stall = self._stall
+                self._record(lag, stall[1] if stall is not None and stall[0] == self._beat else None)
+
+    def _watch(self):
+        # Vérifie 4 fois par seuil : un blocage est capturé au plus tard à 1.25 x threshold
+        while not self._stopped.wait(self.threshold / 4):
+            beat = self._beat
+            if time.monotonic() - beat - self.interval < self.threshold:
+                continue
+            if self._stall is not None and self._stall[0] == beat:
+                continue  # déjà capturé pour ce blocage
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._stall = (beat, traceback.extract_stack(frame))
+
+    def _record(self, lag: float, stack: Optional[traceback.StackSummary]):
+        self.slow += 1
+        if stack:
+            key, where, formatted = _offender(stack)
+        else:
+            key, where, formatted = "unknown (not captured)", "", []
+        offender = self._offenders.get(key)
+        if offender is None:
+            if len(self._offenders) >= self.max_offenders:
+                # On oublie le moins grave pour garder une taille bornée
+                del self._offenders[min(self._offenders, key=lambda k: self._offenders[k]["worst"])]
+            offender = self._offenders[key] = {"count": 0, "total": 0.0, "worst": 0.0, "where": "", "stack": []}
+        offender["count"] += 1
+        offender["total"] += lag
+        offender["last"] = time.time()
+        if lag >= offender["worst"]:
+            offender["worst"] = lag
+            offender["where"] = where
+            offender["stack"] = formatted
+        logging.warning(f"Event loop blocked {lag * 1000:.0f}ms by {key} at {where}\n" + "".join(formatted))
+
+    # Lecture
+
+    def percentiles(self) -> Dict[str, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": samples[-1]}
+
+    def worst(self, limit: int = 5) -> List[Tuple[str, dict]]:
+        """Pires coupables, du blocage le plus long au plus court"""
+        return sorted(self._offenders.items(), key=lambda item: item[1]["worst"], reverse=True)[:limit]
+
+    def collect(self, metrics):
+        """Collecteur pour Metrics.on_collect"""
+        percentiles = self.percentiles()
+        lag = metrics.gauge("event_loop_lag_seconds", "Event loop lag percentiles over the recent window")
+        for quantile, name in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+            lag.set(percentiles[name], quantile=quantile)
+        metrics.gauge("event_loop_lag_max_seconds", "Worst event loop lag over the recent window").set(percentiles["max"])
+        metrics.gauge("event_loop_lag_last_seconds", "Last measured event loop lag").set(self.lag)
+        metrics.counter("event_loop_slow_callbacks_total", "Loop stalls longer than the threshold").set(self.slow)
+
+    def stats(self) -> dict:
+        return dict(self.percentiles(), lag=self.lag, slow=self.slow, offenders=len(self._offenders),
+                    threshold=self.threshold)
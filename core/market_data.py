@@ -0,0 +1,228 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+# Périodes classiques des indicateurs
+BB_PERIOD = 20
+BB_WIDTH = 2.0
+RSI_PERIOD = 14
+EMA_FAST = 12
+EMA_SLOW = 26
+EMA_SIGNAL = 9
+MIN_CANDLES = EMA_SLOW + EMA_SIGNAL  # avant, le MACD n'a pas de sens
+
+
+class MarketData:
+    """Bougies OHLCV Binance en mémoire, un buffer circulaire NumPy par
+    symbole (une ligne par symbole dans des tableaux communs).
+
+    Les indicateurs sont tenus à jour de façon incrémentale à chaque
+    nouvelle bougie : sommes glissantes pour SMA/Bollinger, EMA et MACD
+    récursifs, RSI lissé de Wilder. Une mise à jour traite un lot de
+    symboles en quelques opérations vectorisées, sans jamais relire
+    l'historique.
+    """
+
+    def __init__(self, capacity: int = 500, max_symbols: int = 256):
+        if capacity <= BB_PERIOD:
+            raise ValueError(f"capacity must be greater than {BB_PERIOD}")
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self._index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        shape = (max_symbols, capacity)
+        self._open_time = np.zeros(shape, dtype=np.int64)
+        self._candles = np.zeros((5,) + shape, dtype=np.float64)  # open, high, low, close, volume
+        self._head = np.zeros(max_symbols, dtype=np.int64)        # prochain emplacement libre
+        self._count = np.zeros(max_symbols, dtype=np.int64)       # bougies reçues depuis le chargement
+        # État des indicateurs, un élément par symbole
+        self._last = np.zeros(max_symbols)
+        self._sum = np.zeros(max_symbols)
+        self._sumsq = np.zeros(max_symbols)
+        self._ema_fast = np.zeros(max_symbols)
+        self._ema_slow = np.zeros(max_symbols)
+        self._macd_signal = np.zeros(max_symbols)
+        self._prev_hist = np.zeros(max_symbols)
+        self._avg_gain = np.zeros(max_symbols)
+        self._avg_loss = np.zeros(max_symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def last_open_time(self, symbol: str) -> Optional[int]:
+        i = self._index.get(symbol)
+        if i is None or not self._count[i]:
+            return None
+        return int(self._open_time[i, (self._head[i] - 1) % self.capacity])
+
+    # Écriture
+
+    def load(self, histories: Dict[str, Sequence[Sequence]]):
+        """(Re)charge l'historique de symboles depuis des klines Binance
+        fermées. Les historiques sont alignés sur leur dernière bougie et
+        rejoués ensemble, une opération vectorisée par pas de temps."""
+        histories = {symbol: klines[-self.capacity:] for symbol, klines in histories.items() if klines}
+        if not histories:
+            return
+        idx = []
+        for symbol in histories:
+            i = self._index.get(symbol)
+            if i is None:
+                if len(self.symbols) >= self.max_symbols:
+                    raise ValueError(f"market data is full ({self.max_symbols} symbols)")
+                i = self._index[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+            idx.append(i)
+        idx = np.array(idx)
+        for state in (self._head, self._count, self._last, self._sum, self._sumsq, self._ema_fast,
+                      self._ema_slow, self._macd_signal, self._prev_hist, self._avg_gain, self._avg_loss):
+            state[idx] = 0
+
+        length = max(len(klines) for klines in histories.values())
+        rows = np.zeros((len(idx), length, 6))
+        valid = np.zeros((len(idx), length), dtype=bool)
+        for j, klines in enumerate(histories.values()):
+            rows[j, length - len(klines):] = [[float(value) for value in kline[:6]] for kline in klines]
+            valid[j, length - len(klines):] = True
+        for step in range(length):
+            mask = valid[:, step]
+            self._apply(idx[mask], rows[mask, step])
+
+    def remove(self, symbol: str) -> bool:
+        """Libère la ligne d'un symbole : la dernière ligne prend sa place,
+        les tableaux restent contigus. False si le symbole est inconnu."""
+        i = self._index.pop(symbol, None)
+        if i is None:
+            return False
+        last = len(self.symbols) - 1
+        if i != last:
+            moved = self.symbols[last]
+            self._open_time[i] = self._open_time[last]
+            self._candles[:, i] = self._candles[:, last]
+            for state in (self._head, self._count, self._last, self._sum, self._sumsq, self._ema_fast,
+                          self._ema_slow, self._macd_signal, self._prev_hist, self._avg_gain, self._avg_loss):
+                state[i] = state[last]
+            self.symbols[i] = moved
+            self._index[moved] = i
+        self.symbols.pop()
+        return True
+
+    def update(self, klines: Dict[str, Sequence]) -> int:
+        """Ajoute une nouvelle bougie fermée par symbole, en un seul passage
+        vectorisé. Les bougies déjà connues sont ignorées. Retourne le
+        nombre de symboles mis à jour."""
+        rows, idx = [], []
+        for symbol, kline in klines.items():
+            i = self._index.get(symbol)
+            if i is None or (self._count[i] and int(kline[0]) <= self.last_open_time(symbol)):
+                continue
+            idx.append(i)
+            rows.append([float(value) for value in kline[:6]])
+        if idx:
+            self._apply(np.array(idx), np.array(rows))
+        return len(idx)
+
+    def _apply(self, idx: np.ndarray, rows: np.ndarray):
+        open_time, close = rows[:, 0].astype(np.int64), rows[:, 4]
+        head, count = self._head[idx], self._count[idx]
+        first = count == 0
+        self._prev_hist[idx] = self._ema_fast[idx] - self._ema_slow[idx] - self._macd_signal[idx]
+
+        # SMA / Bollinger : sommes glissantes, on retire la bougie qui sort
+        leaving = count >= BB_PERIOD
+        old = np.where(leaving, self._candles[3, idx, (head - BB_PERIOD) % self.capacity], 0.0)
+        self._sum[idx] += close - old
+        self._sumsq[idx] += close * close - old * old
+
+        # EMA / MACD, initialisés sur la première bougie
+        for ema, period in ((self._ema_fast, EMA_FAST), (self._ema_slow, EMA_SLOW)):
+            ema[idx] = np.where(first, close, ema[idx] + 2.0 / (period + 1) * (close - ema[idx]))
+        macd = self._ema_fast[idx] - self._ema_slow[idx]
+        signal = self._macd_signal[idx]
+        self._macd_signal[idx] = np.where(first, macd, signal + 2.0 / (EMA_SIGNAL + 1) * (macd - signal))
+
+        # RSI : moyenne simple sur les premières variations, puis lissage de Wilder
+        delta = np.where(first, 0.0, close - self._last[idx])
+        steps = np.maximum(np.minimum(count, RSI_PERIOD), 1)
+        has_delta = ~first
+        self._avg_gain[idx] += np.where(has_delta, (np.maximum(delta, 0.0) - self._avg_gain[idx]) / steps, 0.0)
+        self._avg_loss[idx] += np.where(has_delta, (np.maximum(-delta, 0.0) - self._avg_loss[idx]) / steps, 0.0)
+
+        self._open_time[idx, head] = open_time
+        self._candles[:, idx, head] = rows[:, 1:6].T
+        self._last[idx] = close
+        self._head[idx] = (head + 1) % self.capacity
+        self._count[idx] = count + 1
+
+    # Lecture
+
+    def closes(self, symbol: str) -> np.ndarray:
+        """Clôtures du symbole, de la plus ancienne à la plus récente"""
+        i = self._index[symbol]
+        n = int(min(self._count[i], self.capacity))
+        return self._candles[3, i, (self._head[i] - n + np.arange(n)) % self.capacity]
+
+    def candles(self, symbol: str) -> np.ndarray:
+        """Tableau (n, 6) : open_time, open, high, low, close, volume"""
+        i = self._index[symbol]
+        n = int(min(self._count[i], self.capacity))
+        order = (self._head[i] - n + np.arange(n)) % self.capacity
+        return np.column_stack([self._open_time[i, order], self._candles[:, i, order].T])
+
+    def signals(self, symbols: Optional[List[str]] = None) -> Dict[str, dict]:
+        """Indicateurs et signaux de tous les symboles (ou d'une liste) en une passe"""
+        symbols = [s for s in (symbols or self.symbols) if s in self._index]
+        if not symbols:
+            return {}
+        idx = np.array([self._index[s] for s in symbols])
+
+        close = self._last[idx]
+        sma = self._sum[idx] / BB_PERIOD
+        std = np.sqrt(np.maximum(self._sumsq[idx] / BB_PERIOD - sma * sma, 0.0))
+        ema_fast, ema_slow = self._ema_fast[idx], self._ema_slow[idx]
+        macd = ema_fast - ema_slow
+        hist = macd - self._macd_signal[idx]
+        gain, loss = self._avg_gain[idx], self._avg_loss[idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(loss > 0, 100.0 - 100.0 / (1.0 + gain / loss), np.where(gain > 0, 100.0, 50.0))
+        upper, lower = sma + BB_WIDTH * std, sma - BB_WIDTH * std
+        ready = self._count[idx] >= MIN_CANDLES
+
+        result = {}
+        for j, symbol in enumerate(symbols):
+            signals = []
+            if ready[j]:
+                if rsi[j] >= 70:
+                    signals.append("RSI overbought")
+                elif rsi[j] <= 30:
+                    signals.append("RSI oversold")
+                if hist[j] > 0 >= self._prev_hist[idx[j]]:
+                    signals.append("MACD bullish cross")
+                elif hist[j] < 0 <= self._prev_hist[idx[j]]:
+                    signals.append("MACD bearish cross")
+                if close[j] > upper[j]:
+                    signals.append("Above upper Bollinger band")
+                elif close[j] < lower[j]:
+                    signals.append("Below lower Bollinger band")
+            result[symbol] = {
+                "ready": bool(ready[j]),
+                "candles": int(self._count[idx[j]]),
+                "close": float(close[j]),
+                "sma": float(sma[j]),
+                "ema_fast": float(ema_fast[j]),
+                "ema_slow": float(ema_slow[j]),
+                "rsi": float(rsi[j]),
+                "macd": float(macd[j]),
+                "macd_signal": float(self._macd_signal[idx[j]]),
+                "macd_hist": float(hist[j]),
+                "bb_upper": float(upper[j]),
+                "bb_lower": float(lower[j]),
+                "signals": signals
+            }
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "symbols": len(self.symbols),
+            "capacity": self.capacity,
+            "memory_mb": (self._candles.nbytes + self._open_time.nbytes) / 1e6
+        }
@@ -0,0 +1,186 @@
+import os
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+SECTIONS = ('users', 'preferences', 'alerts', 'monitoring')
+
+
+class MemoryStore:
+    """Mémoire persistante en écriture différée.
+
+    Les modifications sont appliquées en RAM immédiatement puis ajoutées à
+    un journal (une ligne JSON par opération) par un thread d'écriture, par
+    lots toutes les flush_interval secondes. Quand le journal dépasse
+    compact_every opérations, le snapshot memory.json est réécrit de façon
+    atomique (fichier temporaire + os.replace) et le journal est vidé.
+    Les entrées sont copiées sous le verrou (copie superficielle, rapide),
+    puis le snapshot est sérialisé entrée par entrée hors du verrou : le GIL
+    est rendu à la boucle asyncio entre deux entrées au lieu d'être gardé
+    pendant un json.dumps de tout le store.
+    Au chargement : snapshot puis rejeu du journal.
+    """
+
+    def __init__(self, file_path: str, flush_interval: float = 0.5, compact_every: int = 5000):
+        self.file_path = file_path
+        self.journal_path = file_path + '.journal'
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending = []
+        self._journal_size = 0
+        self._wakeup = threading.Event()
+        self._closed = False
+        self.flushes = 0
+        self.compactions = 0
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.data = self._load()
+        self._writer = threading.Thread(target=self._run, name='memory-writer', daemon=True)
+        self._writer.start()
+
+    # Chargement
+
+    def _load(self) -> dict:
+        data = {section: {} for section in SECTIONS}
+        try:
+            if os.path.exists(self.file_path):
+                with open(self.file_path, 'r', encoding='utf-8-sig') as f:
+                    loaded = json.load(f)
+                if loaded and not any(section in loaded for section in SECTIONS):
+                    loaded = {'users': loaded}  # ancien format v7.4 : {user_id: {...}}
+                for section, items in loaded.items():
+                    data[section] = items
+        except Exception as e:
+            logging.error(f"Erreur de chargement mémoire : {str(e)}")
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break  # dernière ligne tronquée par un arrêt brutal
+                    self._apply(data, op)
+                    self._journal_size += 1
+        return data
+
+    @staticmethod
+    def _apply(data: dict, op: dict):
+        items = data.setdefault(op['s'], {})
+        if op['o'] == 'set':
+            items.setdefault(op['i'], {})[op['k']] = op['v']
+        elif op['k'] is None:
+            items.pop(op['i'], None)
+        elif op['i'] in items:
+            items[op['i']].pop(op['k'], None)
+
+    # API générique par section
+
+    def set(self, section: str, item_id: str, key: str, value: Any):
+        op = {'o': 'set', 's': section, 'i': item_id, 'k': key, 'v': value}
+        with self._lock:
+            self._apply(self.data, op)
+            self._pending.append(op)
+
+    def delete(self, section: str, item_id: str, key: Optional[str] = None) -> bool:
+        items = self.data.get(section, {})
+        if item_id not in items or (key is not None and key not in items[item_id]):
+            return False
+        op = {'o': 'del', 's': section, 'i': item_id, 'k': key}
+        with self._lock:
+            self._apply(self.data, op)
+            self._pending.append(op)
+        return True
+
+    def get(self, section: str, item_id: str, key: Optional[str] = None):
+        item = self.data.get(section, {}).get(item_id)
+        if item is None or key is None:
+            return item
+        return item.get(key)
+
+    # API historique de PersistentMemory
+
+    def remember(self, user_id: str, key: str, value: Any):
+        self.set('users', user_id, key, value)
+
+    def forget(self, user_id: str, key: Optional[str] = None) -> bool:
+        return self.delete('users', user_id, key)
+
+    def get_memory(self, user_id: str, key: Optional[str] = None):
+        return self.get('users', user_id, key)
+
+    # Écriture en arrière-plan
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        self.flush(compact=True)  # dernière compaction ici, pas sur la boucle asyncio
+
+    def flush(self, compact: bool = False):
+        """Écrit les opérations en attente (appelé par le thread d'écriture)"""
+        with self._io_lock:
+            self._flush(compact)
+
+    def _flush(self, compact: bool):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            compact = compact or self._journal_size + len(batch) >= self.compact_every
+            # set() remplace les valeurs sans les modifier : copier chaque entrée suffit
+            # pour que la boucle puisse continuer à écrire pendant la sérialisation
+            sections = {section: {item_id: dict(item) for item_id, item in items.items()}
+                        for section, items in self.data.items()} if compact else None
+        try:
+            if sections is not None:
+                self._write_snapshot(sections)
+            elif batch:
+                with open(self.journal_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps(op, ensure_ascii=False) + '\n' for op in batch))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._journal_size += len(batch)
+                self.flushes += 1
+        except Exception as e:
+            logging.error(f"Erreur de sauvegarde mémoire : {str(e)}")
+            # On garde le lot pour la prochaine tentative
+            with self._lock:
+                self._pending[:0] = batch
+
+    def _write_snapshot(self, sections: Dict[str, dict]):
+        tmp_path = self.file_path + '.tmp'
+        dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for n, (section, items) in enumerate(sections.items()):
+                f.write(f"{',' if n else ''}{dumps(section)}:{{")
+                f.write(','.join(f"{dumps(item_id)}:{dumps(item)}" for item_id, item in items.items()))
+                f.write('}')
+            f.write('}')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+        # Le snapshot contient tout le journal : on peut le vider
+        open(self.journal_path, 'w').close()
+        self._journal_size = 0
+        self.compactions += 1
+
+    def close(self):
+        """Arrête le thread d'écriture, qui compacte une dernière fois avant de
+        sortir. Bloquant : depuis la boucle, passer par asyncio.to_thread."""
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join()
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.data.get('users', {})),
+            "pending": len(self._pending),
+            "journal_ops": self._journal_size,
+            "flushes": self.flushes,
+            "compactions": self.compactions
+        }
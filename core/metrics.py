@@ -0,0 +1,227 @@
+import os
+import time
+import asyncio
+import logging
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import web
+
+from core.loop_monitor import LoopMonitor
+
+METRICS_HOST = os.getenv('METRICS_HOST', '0.0.0.0')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '8080'))
+# /healthz répond 503 au-delà de ce retard de la boucle asyncio (secondes)
+HEALTH_MAX_LAG = float(os.getenv('HEALTH_MAX_LAG', '10'))
+
+# Secondes : du cache local (ms) aux réponses LLM (dizaines de secondes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, le: Optional[str] = None) -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if le is not None:
+        parts.append(f'le="{le}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric:
+    """Compteur ou jauge, une valeur par combinaison de labels"""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels):
+        self.values[_labels(labels)] = value
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {value!r}" for labels, value in self.values.items()]
+
+
+class Histogram:
+    """Histogramme cumulatif à buckets fixes, un par combinaison de labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.values: Dict[Labels, List] = {}  # labels -> [comptes par bucket, somme, total]
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        series = self.values.get(key)
+        if series is None:
+            series = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        i = bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(labels, str(bound))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels, '+Inf')} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Metrics:
+    """Registre de métriques au format texte Prometheus.
+
+    Les compteurs déjà tenus par les composants (caches, rate limiter,
+    scheduler...) ne sont pas dupliqués : des collecteurs enregistrés avec
+    on_collect() recopient leurs stats() dans des jauges au moment du
+    scrape, donc rien n'est ajouté sur les chemins chauds.
+    """
+
+    def __init__(self, prefix: str = "greeny_"):
+        self.prefix = prefix
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[["Metrics"], None]] = []
+
+    def _get(self, name: str, factory):
+        name = self.prefix + name
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = factory(name)
+        return metric
+
+    def counter(self, name: str, help_text: str = "") -> Metric:
+        return self._get(name, lambda full: Metric(full, "counter", help_text))
+
+    def gauge(self, name: str, help_text: str = "") -> Metric:
+        return self._get(name, lambda full: Metric(full, "gauge", help_text))
+
+    def histogram(self, name: str, help_text: str = "", buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get(name, lambda full: Histogram(full, help_text, buckets))
+
+    def on_collect(self, collector: Callable[["Metrics"], None]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                logging.error(f"Metrics collector error: {str(e)}")
+        lines = []
+        for metric in self._metrics.values():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def http_trace_config(self, upstream: Callable[[str], str]) -> aiohttp.TraceConfig:
+        """TraceConfig pour la session partagée : durée de chaque requête
+        (jusqu'aux en-têtes de la réponse) par upstream et statut.
+        upstream(host) donne le nom de l'API ("BINANCE", "COINGECKO"...)."""
+        requests = self.histogram("upstream_request_duration_seconds",
+                                  "Upstream HTTP request duration until response headers")
+        timeouts = self.counter("upstream_timeouts_total", "Upstream requests that hit their timeout or deadline")
+
+        async def on_request_start(session, context, params):
+            context.start = time.perf_counter()
+
+        async def on_request_end(session, context, params):
+            requests.observe(time.perf_counter() - context.start,
+                             upstream=upstream(params.url.host or ""), status=params.response.status)
+
+        async def on_request_exception(session, context, params):
+            name = upstream(params.url.host or "")
+            timed_out = isinstance(params.exception, asyncio.TimeoutError)
+            if timed_out:
+                timeouts.inc(upstream=name)
+            requests.observe(time.perf_counter() - context.start,
+                             upstream=name, status="timeout" if timed_out else "error")
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        return trace
+
+
+def host_map(endpoints: Dict[str, str]) -> Dict[str, str]:
+    """{"BINANCE": "https://api.binance.com/api/v3"} -> {"api.binance.com": "BINANCE"}"""
+    return {urlsplit(url).hostname: name for name, url in endpoints.items()}
+
+
+class MetricsServer:
+    """Serveur HTTP embarqué : /metrics (Prometheus) et /healthz (sonde de
+    vie Akash). Le retard de la boucle asyncio vient du LoopMonitor donné,
+    démarré par le bot.
+
+    health() renvoie (ok, détails) ; /healthz répond 503 si ok est faux ou
+    si la boucle a pris plus de max_lag secondes de retard.
+    """
+
+    def __init__(self, metrics: Metrics, health: Optional[Callable[[], Tuple[bool, dict]]] = None,
+                 host: str = METRICS_HOST, port: int = METRICS_PORT,
+                 max_lag: float = HEALTH_MAX_LAG, loop_monitor: Optional[LoopMonitor] = None):
+        self.metrics = metrics
+        self.health = health
+        self.host = host
+        self.port = port
+        self.max_lag = max_lag
+        self.loop_monitor = loop_monitor
+        self._runner: Optional[web.AppRunner] = None
+        metrics.on_collect(self._collect)
+        if loop_monitor is not None:
+            metrics.on_collect(loop_monitor.collect)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics_handler)
+        app.router.add_get("/healthz", self._health_handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logging.info(f"Metrics server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _collect(self, metrics: Metrics):
+        metrics.gauge("asyncio_tasks", "Tasks alive on the event loop").set(len(asyncio.all_tasks()))
+
+    async def _metrics_handler(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.metrics.render().encode(),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def _health_handler(self, request: web.Request) -> web.Response:
+        ok, details = self.health() if self.health else (True, {})
+        lag = self.loop_monitor.lag if self.loop_monitor is not None else 0.0
+        details = dict(details, loop_lag=round(lag, 3))
+        if lag > self.max_lag:
+            ok = False
+        return web.json_response(dict(details, status="ok" if ok else "unhealthy"), status=200 if ok else 503)
@@ -0,0 +1,122 @@
+import json
+import time
+import random
+import asyncio
+import logging
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+BINANCE_WS_URL = "wss://stream.binance.com:9443/stream"
+
+
+class PriceBook:
+    """Derniers prix Binance en mémoire, alimentés par le flux combiné
+    <symbol>@miniTicker d'une liste de symboles surveillés.
+
+    Table compacte : un emplacement par symbole dans deux array('d')
+    (prix, heure de réception), lue sans aucun appel réseau. Reconnexion
+    automatique avec backoff exponentiel et jitter ; un prix plus vieux
+    que stale_after secondes est ignoré.
+    """
+
+    def __init__(self, symbols: List[str], url: str = BINANCE_WS_URL, stale_after: float = 30,
+                 backoff_min: float = 1.0, backoff_max: float = 60.0):
+        self.symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+        self.url = url
+        self.stale_after = stale_after
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self._slots: Dict[str, int] = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._prices = array('d', [0.0] * len(self.symbols))
+        self._received = array('d', [0.0] * len(self.symbols))
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.connects = 0
+        self.messages = 0
+        self.errors = 0
+
+    @property
+    def stream_url(self) -> str:
+        streams = "/".join(f"{symbol.lower()}@miniTicker" for symbol in self.symbols)
+        return f"{self.url}?streams={streams}"
+
+    def get(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """(prix, âge en secondes), None si non suivi, pas encore reçu ou trop vieux"""
+        slot = self._slots.get(symbol.upper())
+        if slot is None:
+            return None
+        received = self._received[slot]
+        age = time.time() - received
+        if received == 0.0 or age > self.stale_after:
+            return None
+        return self._prices[slot], age
+
+    def update(self, payload: dict):
+        """Applique un message miniTicker (champ data du flux combiné)"""
+        slot = self._slots.get(payload.get("s"))
+        if slot is None:
+            return
+        self._prices[slot] = float(payload["c"])
+        self._received[slot] = time.time()
+        self.messages += 1
+
+    # Connexion
+
+    def start(self, http_client):
+        if self.symbols and self._task is None:
+            self._task = asyncio.create_task(self._run(http_client))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, http_client):
+        delay = self.backoff_min
+        while True:
+            try:
+                async with http_client.ws_connect(self.stream_url, heartbeat=30) as ws:
+                    self.connected = True
+                    self.connects += 1
+                    logging.info(f"Price book connected ({len(self.symbols)} symbols)")
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        try:
+                            self.update(json.loads(msg.data)["data"])
+                        except (ValueError, KeyError, TypeError) as e:
+                            self.errors += 1
+                            logging.warning(f"Price book: message ignoré ({str(e)})")
+                            continue
+                        delay = self.backoff_min
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Price book connection error: {str(e)}")
+            finally:
+                self.connected = False
+
+            # Jitter complet : évite que plusieurs instances se reconnectent ensemble
+            wait = random.uniform(self.backoff_min, delay)
+            logging.info(f"Price book reconnecting in {wait:.1f}s")
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.backoff_max)
+
+    def stats(self) -> dict:
+        now = time.time()
+        fresh = sum(1 for received in self._received if received and now - received <= self.stale_after)
+        return {
+            "symbols": len(self.symbols),
+            "fresh": fresh,
+            "connected": self.connected,
+            "connects": self.connects,
+            "messages": self.messages,
+            "errors": self.errors
+        }
@@ -0,0 +1,102 @@
+import time
+import asyncio
+from typing import Dict, Optional
+
+from core.deadline import cap
+
+
+class TokenBucket:
+    """Seau à jetons avec réservation : les appelants en excès attendent
+    leur tour (FIFO) au lieu d'être rejetés, tant que l'attente reste
+    inférieure à leur délai maximum.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate          # jetons par seconde
+        self.burst = burst        # capacité de rafale
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.granted = 0
+        self.rejected = 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Prend un jeton sans attendre, False si le seau est vide"""
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.granted += 1
+            return True
+        self.rejected += 1
+        return False
+
+    async def acquire(self, max_wait: float) -> bool:
+        """Réserve un jeton, attend au plus max_wait secondes"""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens >= 0:
+            self.granted += 1
+            return True
+
+        wait = -self.tokens / self.rate
+        if wait > max_wait:
+            self.tokens += 1
+            self.rejected += 1
+            return False
+
+        self.waiting += 1
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            # Rend la réservation pour ne pas pénaliser les suivants
+            self.tokens += 1
+            raise
+        finally:
+            self.waiting -= 1
+        self.granted += 1
+        return True
+
+
+class RateLimiter:
+    """Un TokenBucket par API, construit depuis la table api_limits
+    (secondes entre deux requêtes).
+    """
+
+    def __init__(self, limits: Dict[str, float], bursts: Optional[Dict[str, int]] = None,
+                 max_wait: float = 5.0):
+        self.limits = limits
+        self.bursts = bursts or {}
+        self.max_wait = max_wait
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, api_name: str) -> TokenBucket:
+        bucket = self.buckets.get(api_name)
+        if bucket is None:
+            interval = self.limits.get(api_name, self.limits["DEFAULT"])
+            burst = self.bursts.get(api_name, self.bursts.get("DEFAULT", 1))
+            bucket = TokenBucket(rate=1.0 / interval, burst=burst)
+            self.buckets[api_name] = bucket
+        return bucket
+
+    async def acquire(self, api_name: str, max_wait: Optional[float] = None) -> bool:
+        # Jamais plus longtemps que le budget restant de la commande
+        return await self.bucket(api_name).acquire(cap(self.max_wait if max_wait is None else max_wait))
+
+    def queue_depth(self, api_name: str) -> int:
+        bucket = self.buckets.get(api_name)
+        return bucket.waiting if bucket else 0
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "queued": bucket.waiting,
+                "tokens": round(max(bucket.tokens, 0.0), 2),
+                "granted": bucket.granted,
+                "rejected": bucket.rejected
+            }
+            for name, bucket in self.buckets.items()
+        }
@@ -0,0 +1,175 @@
+import re
+import time
+import zlib
+import unicodedata
+import numpy as np
+from typing import Dict, FrozenSet, Optional, Tuple
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+# Mots qui inversent le sens de la question ("don't" -> "don t", "n'est" -> "n est")
+NEGATIONS = frozenset({
+    "not", "no", "never", "nor", "without", "cannot", "t", "n", "ne", "pas", "jamais", "sans", "aucun", "aucune", "rien"
+})
+# Mots courts sans contenu : tous les autres mots courts (tickers...) sont discriminants
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "be", "do", "does", "did", "i", "me", "my", "you", "your",
+    "we", "our", "they", "them", "their", "there", "these", "those", "it", "its", "of", "to", "in",
+    "on", "at", "for", "from", "into", "about", "and", "or", "with", "what", "whats", "s", "m", "re",
+    "ve", "ll", "how", "why", "who", "when", "where", "which", "this", "that", "can", "could", "would",
+    "will", "some", "any", "get", "pls", "plz", "please", "tell",
+    "le", "la", "les", "un", "une", "des", "de", "du", "est", "et", "ou", "en", "au", "aux", "que",
+    "qui", "quoi", "quel", "quelle", "comment", "pour", "sur", "dans", "je", "tu", "il", "mon", "ton",
+    "ce", "c", "l", "d", "j", "qu", "moi", "stp", "svp"
+})
+
+
+def normalize_question(text: str) -> str:
+    """Minuscules, sans accents ni ponctuation, espaces compactés"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _PUNCTUATION.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def key_tokens(normalized: str) -> FrozenSet[str]:
+    """Mots qui doivent être identiques pour qu'un quasi-doublon soit
+    accepté : nombres, négations et mots courts hors mots vides (tickers
+    surtout). Sans ça, "price of eth" ressemble à 83 % à "price of btc"."""
+    return frozenset(
+        word for word in normalized.split()
+        if word in NEGATIONS or any(c.isdigit() for c in word) or (len(word) <= 5 and word not in STOPWORDS)
+    )
+
+
+class HashingVectorizer:
+    """Mots + bigrammes (poids 0.5) hachés (crc32 signé) dans un vecteur de
+    taille fixe, norme L2"""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def transform(self, normalized: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        words = normalized.split()
+        features = [(w, 1.0) for w in words] + [(f"{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+        for feature, weight in features:
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % self.dim] += weight if h & 0x80000000 else -weight
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class SemanticCache:
+    """Cache des réponses Venice : correspondance exacte sur la question
+    normalisée, puis quasi-doublon par similarité cosinus dans un index
+    NumPy (une ligne par entrée, comparée en un seul produit matriciel),
+    accepté seulement si ses mots clés (key_tokens) sont les mêmes.
+
+    Les réponses ne sont partagées qu'entre prompts de même variante
+    (mêmes messages système), et expirent après ttl secondes. Quand le
+    cache est plein, l'emplacement le plus ancien est réutilisé.
+    """
+
+    def __init__(self, ttl: float = 3600, threshold: float = 0.85, max_entries: int = 2048, dim: int = 1024):
+        self.ttl = ttl
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vectorizer = HashingVectorizer(dim)
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._variants = np.zeros(max_entries, dtype=np.int64)
+        self._expires = np.zeros(max_entries, dtype=np.float64)   # 0 = emplacement libre
+        self._slots: Dict[int, Tuple[str, int, str, FrozenSet[str]]] = {}  # slot -> (question, variante, réponse, mots clés)
+        self._exact: Dict[Tuple[int, str], int] = {}               # (variante, question) -> slot
+        self._next_slot = 0
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def variant_id(variant: str) -> int:
+        return zlib.crc32(variant.encode("utf-8"))
+
+    def lookup(self, question: str, variant: str) -> Optional[str]:
+        now = time.time()
+        normalized = normalize_question(question)
+        variant_id = self.variant_id(variant)
+
+        slot = self._exact.get((variant_id, normalized))
+        if slot is not None and self._expires[slot] > now:
+            self.exact_hits += 1
+            return self._slots[slot][2]
+
+        live = np.flatnonzero((self._variants == variant_id) & (self._expires > now))
+        if live.size:
+            scores = self._vectors[live] @ self.vectorizer.transform(normalized)
+            keys = key_tokens(normalized)
+            for i in np.argsort(-scores):
+                if scores[i] < self.threshold:
+                    break
+                entry = self._slots[int(live[i])]
+                if entry[3] == keys:
+                    self.similar_hits += 1
+                    return entry[2]
+
+        self.misses += 1
+        return None
+
+    def store(self, question: str, variant: str, answer: str):
+        normalized = normalize_question(question)
+        variant_id = self.variant_id(variant)
+        slot = self._exact.get((variant_id, normalized))
+        if slot is None:
+            slot = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self.max_entries
+            self._evict(slot)
+            self._exact[(variant_id, normalized)] = slot
+        self._vectors[slot] = self.vectorizer.transform(normalized)
+        self._variants[slot] = variant_id
+        self._expires[slot] = time.time() + self.ttl
+        self._slots[slot] = (normalized, variant_id, answer, key_tokens(normalized))
+
+    def _evict(self, slot: int):
+        previous = self._slots.pop(slot, None)
+        if previous is not None:
+            self._exact.pop((previous[1], previous[0]), None)
+        self._expires[slot] = 0.0
+
+    def clear(self):
+        self._slots.clear()
+        self._exact.clear()
+        self._expires[:] = 0.0
+        self._next_slot = 0
+
+    def resize(self, max_entries: int):
+        """Réalloue l'index ; si la nouvelle taille est plus petite, les
+        entrées les plus récentes sont gardées"""
+        order = [(self._next_slot + i) % self.max_entries for i in range(self.max_entries)]
+        live = [slot for slot in order if slot in self._slots][-max_entries:]
+        vectors, variants, expires = self._vectors[live], self._variants[live], self._expires[live]
+        entries = [self._slots[slot] for slot in live]
+
+        self.max_entries = max_entries
+        self._vectors = np.zeros((max_entries, self.vectorizer.dim), dtype=np.float32)
+        self._variants = np.zeros(max_entries, dtype=np.int64)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._vectors[:len(live)] = vectors
+        self._variants[:len(live)] = variants
+        self._expires[:len(live)] = expires
+        self._slots = dict(enumerate(entries))
+        self._exact = {(variant_id, normalized): slot for slot, (normalized, variant_id, *_) in enumerate(entries)}
+        self._next_slot = len(live) % max_entries
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "entries": int(np.count_nonzero(self._expires > time.time())),
+            "max_entries": self.max_entries,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.exact_hits + self.similar_hits) / lookups if lookups else 0.0
+        }
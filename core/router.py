@@ -0,0 +1,155 @@
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Pattern, Tuple
+
+Handler = Callable[[Any, str], Awaitable[None]]
+Guard = Callable[[Any], bool]
+
+_END = object()  # marqueur de fin de mot dans le trie
+
+
+class PrefixTrie:
+    """Trie de caractères : plus long mot qui préfixe un texte"""
+
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+
+    def add(self, word: str, value: Any):
+        node = self._root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = value
+
+    def longest_prefix(self, text: str) -> Optional[Tuple[Any, int]]:
+        """(valeur, longueur) du plus long mot qui préfixe le texte"""
+        node, found = self._root, None
+        for i, char in enumerate(text):
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                found = (node[_END], i + 1)
+        return found
+
+
+class Route:
+    __slots__ = ("name", "handler", "priority", "guard", "calls", "total", "worst")
+
+    def __init__(self, name: str, handler: Handler, priority: int = 0, guard: Optional[Guard] = None):
+        self.name = name
+        self.handler = handler
+        self.priority = priority
+        self.guard = guard
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+
+class MessageRouter:
+    """Routage des messages en langage naturel, texte normalisé une seule fois :
+    - exact : dictionnaire (O(1))
+    - prefix : trie, le handler reçoit le reste du texte
+    - keyword : mots-clés n'importe où dans le texte (une seule regex à
+      lookahead, occurrences chevauchantes comprises), le plus prioritaire
+      (priority la plus basse) dont la garde accepte le message gagne
+    - default : si rien d'autre ne correspond
+    Chaque route compte ses appels et sa latence.
+    """
+
+    def __init__(self):
+        self._exact: Dict[str, Route] = {}
+        self._prefixes = PrefixTrie()
+        self._keywords: Dict[str, Route] = {}
+        self._keyword_pattern: Optional[Pattern] = None
+        self._default: Optional[Route] = None
+        self.routes: Dict[str, Route] = {}
+        self.unrouted = 0
+        self.routing_time = 0.0
+
+    def _register(self, name: str, handler: Handler, priority: int = 0, guard: Optional[Guard] = None) -> Route:
+        route = Route(name, handler, priority, guard)
+        self.routes[name] = route
+        return route
+
+    def exact(self, *texts: str, name: Optional[str] = None):
+        def decorator(handler: Handler):
+            route = self._register(name or handler.__name__, handler)
+            for text in texts:
+                self._exact[text] = route
+            return handler
+        return decorator
+
+    def prefix(self, *texts: str, name: Optional[str] = None):
+        def decorator(handler: Handler):
+            route = self._register(name or handler.__name__, handler)
+            for text in texts:
+                self._prefixes.add(text, route)
+            return handler
+        return decorator
+
+    def keyword(self, *words: str, priority: int, guard: Optional[Guard] = None, name: Optional[str] = None):
+        def decorator(handler: Handler):
+            route = self._register(name or handler.__name__, handler, priority, guard)
+            for word in words:
+                self._keywords[word] = route
+            alternatives = sorted(self._keywords, key=len, reverse=True)
+            self._keyword_pattern = re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
+            return handler
+        return decorator
+
+    def default(self, name: Optional[str] = None):
+        def decorator(handler: Handler):
+            self._default = self._register(name or handler.__name__, handler)
+            return handler
+        return decorator
+
+    def resolve(self, message: Any, text: str) -> Optional[Tuple[Route, str]]:
+        """Route choisie et texte transmis au handler, None si aucune"""
+        route = self._exact.get(text)
+        if route is not None:
+            return route, text
+
+        found = self._prefixes.longest_prefix(text)
+        if found is not None:
+            route, length = found
+            return route, text[length:].strip()
+
+        if self._keyword_pattern is not None:
+            matched = {self._keywords[word] for word in self._keyword_pattern.findall(text)}
+            for route in sorted(matched, key=lambda r: r.priority):
+                if route.guard is None or route.guard(message):
+                    return route, text
+
+        if self._default is not None:
+            return self._default, text
+        return None
+
+    async def dispatch(self, message: Any, text: str) -> bool:
+        """Exécute le handler correspondant, False si aucun"""
+        start = time.perf_counter()
+        resolved = self.resolve(message, text)
+        self.routing_time += time.perf_counter() - start
+        if resolved is None:
+            self.unrouted += 1
+            return False
+
+        route, rest = resolved
+        start = time.perf_counter()
+        try:
+            await route.handler(message, rest)
+        finally:
+            elapsed = time.perf_counter() - start
+            route.calls += 1
+            route.total += elapsed
+            route.worst = max(route.worst, elapsed)
+        return True
+
+    def stats(self) -> dict:
+        return {
+            name: {
+                "calls": route.calls,
+                "avg_ms": route.total / route.calls * 1e3 if route.calls else 0.0,
+                "max_ms": route.worst * 1e3
+            }
+            for name, route in self.routes.items()
+        }
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Regroupe les appels concurrents identiques sur une seule requête.
+
+    Le premier appelant pour une clé lance le travail dans une tâche ;
+    les suivants attendent la même tâche tant qu'elle est en vol. L'annulation
+    d'un appelant n'annule pas le travail partagé des autres ; quand le
+    dernier appelant est annulé, la tâche partagée l'est aussi (plus personne
+    n'attend la réponse, inutile de garder l'appel amont ouvert).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        else:
+            self.shared += 1
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def is_inflight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        return {"inflight": len(self._inflight), "calls": self.calls, "shared": self.shared}
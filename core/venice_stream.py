@@ -0,0 +1,105 @@
+import json
+import time
+import logging
+from typing import AsyncIterator, Optional
+
+# Limite Discord par message
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+class VeniceStreamError(Exception):
+    def __init__(self, status: int, body: str):
+        super().__init__(f"Venice stream error {status}: {body[:200]}")
+        self.status = status
+        self.body = body
+
+
+async def stream_chat(http_client, url: str, headers: dict, payload: dict) -> AsyncIterator[str]:
+    """Consomme le flux SSE de /chat/completions et produit les morceaux de texte"""
+    headers = dict(headers, Accept="text/event-stream")
+    async with http_client.post(url, headers=headers, json=dict(payload, stream=True)) as response:
+        if response.status != 200:
+            raise VeniceStreamError(response.status, await response.text())
+        async for raw_line in response.content:
+            line = raw_line.strip()
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                return
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                logging.warning(f"Venice stream: invalid chunk {data[:100]!r}")
+                continue
+            choices = chunk.get("choices") or []
+            if not choices:
+                continue
+            piece = (choices[0].get("delta") or {}).get("content")
+            if piece:
+                yield piece
+
+
+def _cut(text: str, start: int, limit: int) -> int:
+    """Fin du morceau qui commence à start : dernier saut de ligne avant
+    limit caractères, sinon coupure franche"""
+    cut = text.rfind("\n", start, start + limit)
+    return cut if cut > start else start + limit
+
+
+async def send_chunked(destination, text: str):
+    """Envoie un texte déjà complet (cache, réponse partagée) en autant de
+    messages que nécessaire, coupés comme StreamingReply"""
+    offset = 0
+    while len(text) - offset > DISCORD_MESSAGE_LIMIT:
+        cut = _cut(text, offset, DISCORD_MESSAGE_LIMIT)
+        await destination.send(text[offset:cut])
+        offset = cut
+    await destination.send(text[offset:])
+
+
+class StreamingReply:
+    """Affiche un texte qui arrive par morceaux en éditant un seul message
+    Discord, avec un intervalle minimum entre deux éditions pour rester
+    sous la limite d'édition de Discord (5 éditions / 5s par salon).
+    """
+
+    def __init__(self, destination, min_interval: float = 1.0, cursor: str = " ▌"):
+        self.destination = destination
+        self.min_interval = min_interval
+        self.cursor = cursor
+        self.text = ""
+        self.message = None
+        self.first_token_at: Optional[float] = None
+        self._started = time.monotonic()
+        self._offset = 0            # début du texte affiché dans le message courant
+        self._last_edit = 0.0
+
+    async def feed(self, piece: str):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic() - self._started
+        self.text += piece
+
+        limit = DISCORD_MESSAGE_LIMIT - len(self.cursor)
+        while len(self.text) - self._offset > limit:
+            # Message plein : on le fige et on continue dans un nouveau
+            cut = _cut(self.text, self._offset, limit)
+            await self._render(self.text[self._offset:cut])
+            self.message = None
+            self._offset = cut
+
+        if self.message is None or time.monotonic() - self._last_edit >= self.min_interval:
+            await self._render(self.text[self._offset:] + self.cursor)
+
+    async def finish(self) -> str:
+        """Dernière édition sans curseur, retourne le texte complet"""
+        if self.text[self._offset:]:
+            await self._render(self.text[self._offset:])
+        return self.text
+
+    async def _render(self, content: str):
+        if self.message is None:
+            self.message = await self.destination.send(content)
+        else:
+            await self.message.edit(content=content)
+        self._last_edit = time.monotonic()
@@ -4,24 +4,30 @@ from discord.ext import commands
 from discord import Intents, Embed
 import os
 from dotenv import load_dotenv
-import aiohttp
+import re
+import math
+import time
 import json
+import asyncio
 import logging
-import datetime
 import random
 from collections import defaultdict
 from langdetect import detect, lang_detect_exception
-from trackers.cosmos_tracker import CosmosAirdropTracker
+from trackers.cosmos_tracker import CosmosAirdropTracker, bech32_decode
+from trackers.airdrop_watcher import AirdropWatcher
+from core.log_setup import setup_logging
+from core.http_client import HttpClient
+from core.metrics import Metrics, MetricsServer
+from core.loop_monitor import LoopMonitor
+from core.llm_scheduler import LLMScheduler, SchedulerFull, RequestCancelled
+from core.memory_store import MemoryStore
+from core.keywords import KeywordReactor
+from core.router import MessageRouter
+from core.alerts import AlertEngine, AlertLimitReached, parse_alert
+from core.deadline import command_deadline, deadline, reset_deadline, set_deadline
 
 # Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(f'C:\\BIG GREEN 2025 V01\\t7steam-core\\t7steam-c1-shadebot\\logs\\bot_{datetime.datetime.now().strftime("%Y%m%d")}.log')
-    ]
-)
+setup_logging('C:\\BIG GREEN 2025 V01\\t7steam-core\\t7steam-c1-shadebot\\logs\\bot.jsonl')
 
 # Charger les variables d'environnement
 load_dotenv('C:\\BIG GREEN 2025 V01\\t7steam-core\\t7steam-c1-shadebot\\config\\.env')
@@ -53,6 +59,7 @@ CRYPTO_KEYWORDS = {
     "bullish": ["🐂", "📈"],
     "bearish": ["🐻", "📉"]
 }
+keyword_reactor = KeywordReactor(CRYPTO_KEYWORDS)
 
 # Style terminal retro
 TERMINAL_STYLE = {
@@ -61,51 +68,87 @@ TERMINAL_STYLE = {
     "thumbnail": "https://i.imgur.com/5b4WwLp.gif"
 }
 
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
-airdrop_tracker = CosmosAirdropTracker()
+# Métriques Prometheus et sonde de vie (/metrics, /healthz sur METRICS_PORT)
+metrics = Metrics(prefix="shadebot_")
+UPSTREAM_HOSTS = {"api.venice.ai": "VENICE", "api.binance.com": "BINANCE"}
+
+def upstream_name(host):
+    if host in UPSTREAM_HOSTS:
+        return UPSTREAM_HOSTS[host]
+    # Nœuds REST des chaînes de networks.json (rechargées à chaud)
+    if any(host in chain.balances for chain in airdrop_tracker.registry):
+        return "COSMOS"
+    return "OTHER"
+
+# Session HTTP partagée par tous les appels sortants
+http_client = HttpClient(trace_configs=[metrics.http_trace_config(upstream_name)])
+
+# File d'attente équitable devant Venice
+llm_scheduler = LLMScheduler(
+    max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '4')),
+    max_pending_per_user=int(os.getenv('LLM_MAX_PENDING_PER_USER', '3'))
+)
 
-class PersistentMemory:
-    def __init__(self):
-        self.file_path = 'C:\\BIG GREEN 2025 V01\\t7steam-core\\t7steam-c1-shadebot\\memory.json'
-        self.data = self._load_memory()
+# Fréquence de vérification des alertes de prix (secondes)
+ALERT_POLL_INTERVAL = float(os.getenv('ALERT_POLL_INTERVAL', '15'))
 
-    def _load_memory(self):
-        try:
-            if os.path.exists(self.file_path):
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {'users': {}, 'preferences': {}, 'alerts': {}, 'monitoring': {}}
-        except Exception as e:
-            logging.error(f"Erreur de chargement mémoire : {str(e)}")
-            return {'users': {}, 'preferences': {}, 'alerts': {}, 'monitoring': {}}
+class ShadeBot(commands.Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.alert_task = None  # créée dans setup_hook, qui ne tourne pas si la connexion échoue
 
-    def _save_memory(self):
+    async def setup_hook(self):
+        loop_monitor.start()
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=4)
-        except Exception as e:
-            logging.error(f"Erreur de sauvegarde mémoire : {str(e)}")
-
-    def remember(self, user_id: str, key: str, value: str):
-        if user_id not in self.data['users']:
-            self.data['users'][user_id] = {}
-        self.data['users'][user_id][key] = value
-        self._save_memory()
-
-    def forget(self, user_id: str, key: str = None):
-        if key:
-            if user_id in self.data['users'] and key in self.data['users'][user_id]:
-                del self.data['users'][user_id][key]
-                self._save_memory()
-                return True
-        return False
-
-    def get_memory(self, user_id: str, key: str = None):
-        if user_id in self.data['users']:
-            if key:
-                return self.data['users'][user_id].get(key)
-            return self.data['users'][user_id]
-        return None
+            await metrics_server.start()
+        except OSError as e:
+            logging.error(f"Serveur de métriques non démarré : {str(e)}")
+        await http_client.start()
+        self.alert_task = asyncio.create_task(alert_poller())
+        airdrop_tracker.start()
+        airdrop_watcher.start()
+
+    async def close(self):
+        if self.alert_task is not None:
+            self.alert_task.cancel()
+        airdrop_watcher.stop()
+        airdrop_tracker.stop()
+        await http_client.close()
+        await metrics_server.stop()
+        loop_monitor.stop()
+        await asyncio.to_thread(memory.close)
+        await super().close()
+
+bot = ShadeBot(command_prefix='!', intents=intents, help_command=None)
+loop_monitor = LoopMonitor()
+metrics_server = MetricsServer(metrics, health=lambda: (not bot.is_closed(), {"ready": bot.is_ready()}),
+                               loop_monitor=loop_monitor)
+
+@bot.before_invoke
+async def command_started(ctx):
+    ctx.started_at = time.perf_counter()
+    # Budget de la commande, hérité par tous ses appels aux APIs
+    ctx.deadline_token = set_deadline(command_deadline(ctx.command.qualified_name))
+
+@bot.after_invoke
+async def command_finished(ctx):
+    reset_deadline(ctx.deadline_token)
+    metrics.histogram("command_duration_seconds", "Durée des commandes").observe(
+        time.perf_counter() - ctx.started_at,
+        command=ctx.command.qualified_name, status="error" if ctx.command_failed else "ok")
+
+def collect_metrics(registry):
+    if math.isfinite(bot.latency):
+        registry.gauge("gateway_latency_seconds", "Latence du heartbeat Discord").set(bot.latency)
+    scheduler = llm_scheduler.stats()
+    registry.gauge("llm_running", "Appels Venice en cours").set(scheduler["running"])
+    registry.gauge("llm_queued", "Appels Venice en attente").set(scheduler["queued"])
+    registry.counter("llm_rejected_total", "Appels Venice refusés").set(scheduler["rejected"])
+    registry.gauge("price_alerts", "Alertes de prix actives").set(alert_engine.stats()["alerts"])
+    for key, value in airdrop_watcher.stats().items():
+        registry.gauge(f"airdrop_watcher_{key}", "Watcher airdrop").set(value)
+
+metrics.on_collect(collect_metrics)
 
 async def ask_venice(question, context=None, task_type="CHAT"):
     try:
@@ -128,37 +171,124 @@ async def ask_venice(question, context=None, task_type="CHAT"):
         
         messages.append({"role": "user", "content": question})
         
-        async with aiohttp.ClientSession() as session:
-            payload = {
-                "model": "dolphin-2.9.2-qwen2-72b",
-                "messages": messages,
-                "temperature": 0.7,
-                "max_tokens": 500
-            }
-            
-            async with session.post(
-                "https://api.venice.ai/api/v1/chat/completions",
-                headers=VENICE_HEADERS,
-                json=payload
-            ) as response:
-                if response.status == 200:
-                    # Récupère le texte de la réponse
-                    response_text = await response.text()
-                    # Parse le JSON manuellement
-                    try:
-                        data = json.loads(response_text)
-                        return data['choices'][0]['message']['content']
-                    except json.JSONDecodeError as e:
-                        logging.error(f"Erreur de décodage JSON : {str(e)}")
-                        return "🤔 Erreur de format des données reçues."
-                else:
-                    return f"🤔 Erreur {response.status}: {await response.text()}"
+        payload = {
+            "model": "dolphin-2.9.2-qwen2-72b",
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 500
+        }
+        
+        async with http_client.post(
+            "https://api.venice.ai/api/v1/chat/completions",
+            headers=VENICE_HEADERS,
+            json=payload
+        ) as response:
+            if response.status == 200:
+                # Récupère le texte de la réponse
+                response_text = await response.text()
+                # Parse le JSON manuellement
+                try:
+                    data = json.loads(response_text)
+                    return data['choices'][0]['message']['content']
+                except json.JSONDecodeError as e:
+                    logging.error(f"Erreur de décodage JSON : {str(e)}")
+                    return "🤔 Erreur de format des données reçues."
+            else:
+                return f"🤔 Erreur {response.status}: {await response.text()}"
     except Exception as e:
         logging.error(f"Erreur Venice: {str(e)}")
         return "🤔 Une erreur s'est produite lors de la communication avec Venice."
 
-# Initialisation de la mémoire
-memory = PersistentMemory()
+def is_admin(message):
+    return isinstance(message.author, discord.Member) and message.author.guild_permissions.administrator
+
+async def run_llm(message, func):
+    """Passe un appel Venice par le scheduler, None si refusé ou annulé"""
+    author = message.author
+    flow = message.guild.id if message.guild else f"dm:{author.id}"
+
+    async def notify(position):
+        await message.channel.send(f"⏳ Position dans la file : {position}")
+
+    try:
+        return await llm_scheduler.run(func, flow, author.id, priority=is_admin(message),
+                                       ticket_id=message.id, on_queued=notify)
+    except SchedulerFull:
+        await message.channel.send("🚦 Doucement ! Tes questions précédentes sont encore en file d'attente.")
+    except RequestCancelled:
+        logging.info(f"Requête LLM {message.id} annulée (message supprimé)")
+    return None
+
+# Initialisation de la mémoire (journal + compaction en arrière-plan)
+memory = MemoryStore('C:\\BIG GREEN 2025 V01\\t7steam-core\\t7steam-c1-shadebot\\memory.json')
+alert_engine = AlertEngine(memory)
+airdrop_tracker = CosmosAirdropTracker(http_client, store=memory)
+
+async def notify_airdrop_changes(user_id, lines):
+    """Un MP par utilisateur avec tous les changements détectés par le watcher"""
+    user = bot.get_user(int(user_id)) or await bot.fetch_user(int(user_id))
+    chunk = "🪂 **Changements sur tes adresses Cosmos**"
+    for line in lines:
+        if len(chunk) + len(line) + 1 > 2000:
+            await user.send(chunk)
+            chunk = ""
+        chunk += "\n" + line
+    await user.send(chunk)
+
+airdrop_watcher = AirdropWatcher(airdrop_tracker, notify_airdrop_changes)
+
+async def alert_poller():
+    """Un seul appel Binance (tous les tickers) par intervalle, puis une
+    notification groupée par salon pour les alertes déclenchées"""
+    while True:
+        await asyncio.sleep(ALERT_POLL_INTERVAL)
+        if not alert_engine.symbols():
+            continue
+        try:
+            async with http_client.get("https://api.binance.com/api/v3/ticker/price") as response:
+                if response.status != 200:
+                    logging.error(f"Alertes : Binance HTTP {response.status}")
+                    continue
+                prices = {ticker['symbol']: float(ticker['price']) for ticker in await response.json()}
+        except Exception as e:
+            logging.error(f"Alertes : erreur Binance {str(e)}")
+            continue
+
+        for channel_id, fired in alert_engine.on_prices(prices).items():
+            channel = bot.get_channel(channel_id)
+            if channel is None:
+                continue
+            # Une seule notification par salon, découpée à la limite Discord
+            chunks = [""]
+            for alert, price in fired:
+                line = (f"🔔 <@{alert.user_id}> {alert.symbol} {'≥' if alert.above else '≤'} "
+                        f"{alert.threshold:,.2f} (prix actuel : {price:,.2f})")
+                if len(chunks[-1]) + len(line) + 1 > 2000:
+                    chunks.append("")
+                chunks[-1] = f"{chunks[-1]}\n{line}" if chunks[-1] else line
+            try:
+                for chunk in chunks:
+                    await channel.send(chunk)
+            except discord.HTTPException as e:
+                logging.error(f"Alertes : envoi impossible dans {channel_id} : {str(e)}")
+
+async def create_alert(message, text):
+    """Crée une alerte si le texte est du type "ETH > 2000", False sinon"""
+    parsed = parse_alert(text)
+    if parsed is None:
+        return False
+    symbol, above, threshold = parsed
+    try:
+        alert = alert_engine.add(symbol, above, threshold, message.channel.id, message.author.id,
+                                 message.guild.id if message.guild else None)
+    except AlertLimitReached:
+        await message.channel.send(f"🚦 Maximum {alert_engine.max_per_user} alertes actives par personne.")
+        return True
+    await message.channel.send(
+        f"🔔 Alerte #{alert.id} : je te préviens quand {symbol} passe "
+        f"{'au-dessus' if above else 'en dessous'} de {threshold:,.2f}."
+    )
+    return True
 @bot.event
 async def on_ready():
     print("\033[1;32mGREENY ONLINE VERT NEON\033[0m")
@@ -171,78 +301,94 @@ async def on_ready():
     logging.info(f"Serveurs: {len(bot.guilds)}")
     logging.info(f"{'-'*40}")
 
+# Routage des commandes naturelles : "greeny ..." puis intention par mots-clés
+message_router = MessageRouter()
+greeny_router = MessageRouter()
+
+@message_router.prefix('greeny')
+async def greeny_route(message, query):
+    async with message.channel.typing():
+        await greeny_router.dispatch(message, query)
+
+async def ask_task(message, query, task_type):
+    response = await run_llm(message, lambda: ask_venice(query, task_type=task_type))
+    if response:
+        await message.channel.send(response)
+
+# Commandes remember/forget
+@greeny_router.keyword('remember', priority=0, guard=is_admin)
+async def remember_route(message, query):
+    parts = query.split('remember', 1)[1].strip()
+    if message.mentions:
+        target = message.mentions[0]
+        content = parts.split(' ', 1)[1] if len(parts.split(' ', 1)) > 1 else ''
+        memory.remember(str(target.id), 'info', content)
+        await message.channel.send(f"🤔 Je me souviendrai que {target.mention}: {content}")
+
+@greeny_router.keyword('forget', priority=1, guard=is_admin)
+async def forget_route(message, query):
+    if message.mentions:
+        target = message.mentions[0]
+        memory.forget(str(target.id), 'info')
+        await message.channel.send(f"🤔 J'ai oublié les informations sur {target.mention}")
+
+# Analyse de wallet
+@greeny_router.keyword('analyze', 'analyse', priority=2)
+async def analyze_route(message, query):
+    await ask_task(message, query, "ANALYSIS")
+
+# Monitoring
+@greeny_router.keyword('monitor', 'surveille', priority=3)
+async def monitor_route(message, query):
+    params = re.split(r"monitor|surveille", query, maxsplit=1)[1]
+    if not await create_alert(message, params):
+        await ask_task(message, query, "MONITOR")
+
+# Traduction
+@greeny_router.keyword('translate', 'traduis', priority=4)
+async def translate_route(message, query):
+    await ask_task(message, query, "TRANSLATE")
+
+# Résumé
+@greeny_router.keyword('summary', 'résume', priority=5)
+async def summary_route(message, query):
+    await ask_task(message, query, "SUMMARY")
+
+# Support technique
+@greeny_router.keyword('code', 'solidity', 'smart contract', 'help', priority=6)
+async def tech_route(message, query):
+    await ask_task(message, query, "TECH")
+
+# Conversation normale
+@greeny_router.default()
+async def conversation_route(message, query):
+    user_context = memory.get_memory(str(message.author.id))
+    context = f"Information sur l'utilisateur: {user_context}" if user_context else None
+    response = await run_llm(message, lambda: ask_venice(query, context=context))
+    if response:
+        await message.channel.send(response)
+
 @bot.event
 async def on_message(message):
     if message.author == bot.user:
         return
 
-    content_lower = message.content.lower()
-    
-    # Réactions aux mots-clés crypto
-    for keyword, emojis in CRYPTO_KEYWORDS.items():
-        if keyword in content_lower:
-            for emoji in emojis:
-                await message.add_reaction(emoji)
-
-    # Traitement des commandes naturelles
-    if content_lower.startswith('greeny'):
-        async with message.channel.typing():
-            query = content_lower[6:].strip()
-            
-            # Commandes remember/forget
-            if 'remember' in query and message.author.guild_permissions.administrator:
-                parts = query.split('remember', 1)[1].strip()
-                if message.mentions:
-                    target = message.mentions[0]
-                    content = parts.split(' ', 1)[1] if len(parts.split(' ', 1)) > 1 else ''
-                    memory.remember(str(target.id), 'info', content)
-                    await message.channel.send(f"🤔 Je me souviendrai que {target.mention}: {content}")
-                return
-
-            if 'forget' in query and message.author.guild_permissions.administrator:
-                if message.mentions:
-                    target = message.mentions[0]
-                    memory.forget(str(target.id), 'info')
-                    await message.channel.send(f"🤔 J'ai oublié les informations sur {target.mention}")
-                return
-
-            # Analyse de wallet
-            if 'analyze' in query or 'analyse' in query:
-                response = await ask_venice(query, task_type="ANALYSIS")
-                await message.channel.send(response)
-                return
-
-            # Monitoring
-            if 'monitor' in query or 'surveille' in query:
-                response = await ask_venice(query, task_type="MONITOR")
-                await message.channel.send(response)
-                return
-
-            # Traduction
-            if 'translate' in query or 'traduis' in query:
-                response = await ask_venice(query, task_type="TRANSLATE")
-                await message.channel.send(response)
-                return
-
-            # Résumé
-            if 'summary' in query or 'résume' in query:
-                response = await ask_venice(query, task_type="SUMMARY")
-                await message.channel.send(response)
-                return
+    # Réactions aux mots-clés crypto (en tâche de fond, budget par salon)
+    keyword_reactor.dispatch(message)
 
-            # Support technique
-            if any(word in query for word in ['code', 'solidity', 'smart contract', 'help']):
-                response = await ask_venice(query, task_type="TECH")
-                await message.channel.send(response)
-                return
-
-            # Conversation normale
-            user_context = memory.get_memory(str(message.author.id))
-            context = f"Information sur l'utilisateur: {user_context}" if user_context else None
-            response = await ask_venice(query, context=context)
-            await message.channel.send(response)
+    # Texte normalisé une seule fois : commande "!" ou routage naturel
+    content_lower = message.content.lower()
+    if content_lower.startswith(bot.command_prefix):
+        await bot.process_commands(message)
+        return
+    # Les routes naturelles finissent presque toutes chez Venice : budget de !ask
+    with deadline(command_deadline('ask')):
+        await message_router.dispatch(message, content_lower)
 
-    await bot.process_commands(message)
+@bot.event
+async def on_message_delete(message):
+    # Supprimer la question annule la requête LLM en attente ou en cours
+    llm_scheduler.cancel(message.id)
 
 @bot.command(name='ask')
 async def ask(ctx, *, question):
@@ -250,22 +396,38 @@ async def ask(ctx, *, question):
     async with ctx.typing():
         user_context = memory.get_memory(str(ctx.author.id))
         context = f"Information sur l'utilisateur: {user_context}" if user_context else None
-        response = await ask_venice(question, context=context)
-        await ctx.send(response)
+        response = await run_llm(ctx.message, lambda: ask_venice(question, context=context))
+        if response:
+            await ctx.send(response)
 
 @bot.command(name='analyze')
 async def analyze(ctx, *, target):
     """Analyse un wallet ou un projet"""
     async with ctx.typing():
-        response = await ask_venice(f"Analyse détaillée de : {target}", task_type="ANALYSIS")
-        await ctx.send(response)
+        response = await run_llm(ctx.message, lambda: ask_venice(f"Analyse détaillée de : {target}", task_type="ANALYSIS"))
+        if response:
+            await ctx.send(response)
 
 @bot.command(name='monitor')
 async def monitor(ctx, *, params):
     """Configure une surveillance de prix ou d'événements"""
+    action = params.split()
+    if action[0].lower() == 'list':
+        alerts = alert_engine.user_alerts(ctx.author.id)
+        lines = [f"#{a.id} {a.symbol} {'≥' if a.above else '≤'} {a.threshold:,.2f}" for a in alerts]
+        await ctx.send("🔔 Tes alertes :\n" + "\n".join(lines) if lines else "🔔 Aucune alerte active.")
+        return
+    if action[0].lower() in ('remove', 'stop') and len(action) == 2:
+        removed = alert_engine.remove(action[1].lstrip('#'), user_id=ctx.author.id)
+        await ctx.send(f"🔕 Alerte #{action[1].lstrip('#')} supprimée." if removed else "🤔 Alerte introuvable.")
+        return
+    if await create_alert(ctx.message, params):
+        return
+
     async with ctx.typing():
-        response = await ask_venice(f"Configure la surveillance : {params}", task_type="MONITOR")
-        await ctx.send(response)
+        response = await run_llm(ctx.message, lambda: ask_venice(f"Configure la surveillance : {params}", task_type="MONITOR"))
+        if response:
+            await ctx.send(response)
 
 @bot.command(name='help')
 async def help(ctx):
@@ -292,7 +454,7 @@ async def help(ctx):
     # Commandes de monitoring
     embed.add_field(
         name="🤔 Monitoring",
-        value="🔹 `greeny monitor ETH > 2000`\n🔹 `!monitor BTC 24h`",
+        value="🔹 `greeny monitor ETH > 2000`\n🔹 `!monitor BTC < 90000`\n🔹 `!monitor list` / `!monitor remove <id>`\n🔹 `!monitor BTC 24h`",
         inline=False
     )
     
@@ -307,7 +469,7 @@ async def help(ctx):
     if ctx.author.guild_permissions.administrator:
         embed.add_field(
             name="🤔 Admin",
-            value="🔹 `greeny remember @user info`\n🔹 `greeny forget @user`",
+            value="🔹 `greeny remember @user info`\n🔹 `greeny forget @user`\n🔹 `!lag` (blocages de la boucle)",
             inline=False
         )
     
@@ -316,8 +478,48 @@ async def help(ctx):
     
     await ctx.send(embed=embed)
 
+@bot.command(name='lag')
+@commands.has_permissions(administrator=True)
+async def lag(ctx):
+    """Retard de la boucle asyncio et pires callbacks bloquants"""
+    stats = loop_monitor.stats()
+    embed = discord.Embed(
+        title="⏱️ Retard de la boucle",
+        description=(f"p50 {stats['p50'] * 1000:.1f}ms | p95 {stats['p95'] * 1000:.1f}ms | "
+                     f"p99 {stats['p99'] * 1000:.1f}ms | max {stats['max'] * 1000:.0f}ms\n"
+                     f"{stats['slow']} blocages de plus de {stats['threshold'] * 1000:.0f}ms depuis le démarrage"),
+        color=TERMINAL_STYLE["color"]
+    )
+    worst = loop_monitor.worst(5)
+    for key, offender in worst:
+        embed.add_field(
+            name=f"{offender['worst'] * 1000:.0f}ms max, {offender['count']}x : {key}"[:256],
+            value=f"```{''.join(offender['stack'][-3:])[-1000:] or offender['where'] or 'pas de pile'}```",
+            inline=False
+        )
+    if not worst:
+        embed.add_field(name="Coupables", value="Aucun blocage enregistré.", inline=False)
+    await ctx.send(embed=embed)
+
+# Limites Discord d'un embed (la marge couvre la description finale et le pied)
+EMBED_MAX_FIELDS = 25
+EMBED_MAX_CHARS = 6000 - 200
+EMBED_FIELD_MAX = 1024
+
+def format_balances(result, limit=5):
+    if "error" in result:
+        return f"⚠️ {result['error']}"
+    balances = [b for b in result.get("balances", []) if b.get("amount", "0") != "0"]
+    if not balances:
+        return "Aucun solde"
+    lines = [f"{b.get('denom', 'unknown')[:40]} : {b.get('amount', '0')}" for b in balances[:limit]]
+    if len(balances) > limit:
+        lines.append(f"… et {len(balances) - limit} autres")
+    return "\n".join(lines)
+
 @bot.command(name='airdrop')
 async def airdrop(ctx, action=None, *args):
+    user_id = str(ctx.author.id)
     if action is None:
         embed = discord.Embed(
             title="🤔 Cosmos Airdrop Tracker",
@@ -326,7 +528,12 @@ async def airdrop(ctx, action=None, *args):
         )
         embed.add_field(
             name="!airdrop check [address]",
-            value="Vérifie les airdrops pour une adresse",
+            value="Vérifie les airdrops sur toutes les chaînes (vos adresses enregistrées par défaut)",
+            inline=False
+        )
+        embed.add_field(
+            name="!airdrop register <address> / !airdrop remove <address>",
+            value="Enregistre ou retire une adresse",
             inline=False
         )
         embed.add_field(
@@ -337,37 +544,64 @@ async def airdrop(ctx, action=None, *args):
         await ctx.send(embed=embed)
         return
 
+    if action == "register" and args:
+        if airdrop_tracker.register_address(user_id, args[0]):
+            await ctx.send(f"🤔 Adresse `{args[0]}` enregistrée")
+        else:
+            await ctx.send("🤔 Adresse bech32 invalide")
+        return
+
+    if action == "remove" and args:
+        removed = airdrop_tracker.unregister_address(user_id, args[0])
+        await ctx.send("🤔 Adresse retirée" if removed else "🤔 Adresse non enregistrée")
+        return
+
+    if action == "list":
+        addresses = airdrop_tracker.user_addresses.get(user_id, [])
+        await ctx.send("\n".join(f"🔹 `{a}`" for a in addresses) if addresses else "🤔 Aucune adresse enregistrée")
+        return
+
     if action == "check":
-        if not args:
-            await ctx.send("🤔 Veuillez spécifier une adresse Cosmos")
+        addresses = list(args) or airdrop_tracker.user_addresses.get(user_id, [])
+        if not addresses:
+            await ctx.send("🤔 Veuillez spécifier une adresse Cosmos ou en enregistrer une")
             return
-        
-        address = args[0]
-        async with ctx.typing():
-            result = await airdrop_tracker.check_eligibility(address, "cosmos")
-            
-            if "error" in result:
-                await ctx.send(f"🤔 Erreur: {result['error']}")
+        invalid = [a for a in addresses if bech32_decode(a) is None]
+        if invalid:
+            await ctx.send("❌ Adresse(s) invalide(s) : " + ", ".join(f"`{a[:64]}`" for a in invalid[:10]))
+            addresses = [a for a in addresses if bech32_decode(a) is not None]
+            if not addresses:
                 return
-                
-            embed = discord.Embed(
-                title=f"🤔 Vérification Airdrop",
-                description=f"Adresse: `{address}`",
-                color=discord.Color.blue()
-            )
-            
-            for balance in result.get("balances", []):
-                embed.add_field(
-                    name=f"🤔 {balance.get('denom', 'unknown')}",
-                    value=f"Montant: {balance.get('amount', '0')}",
-                    inline=True
-                )
-                
-            await ctx.send(embed=embed)
+
+        # Toutes les chaînes x toutes les adresses en parallèle ; l'embed est
+        # complété au fur et à mesure que les chaînes répondent
+        embed = discord.Embed(
+            title="🤔 Vérification Airdrop",
+            description=f"{len(addresses)} adresse(s) sur {len(airdrop_tracker.registry)} chaînes…",
+            color=discord.Color.blue()
+        )
+        status = await ctx.send(embed=embed)
+        last_edit = 0.0
+        hidden = 0
+        async for chain, address, result in airdrop_tracker.scan(addresses):
+            name = f"🔗 {chain.name} · {address[:12]}…{address[-6:]}"
+            value = format_balances(result)[:EMBED_FIELD_MAX]
+            if len(embed.fields) < EMBED_MAX_FIELDS and len(embed) + len(name) + len(value) <= EMBED_MAX_CHARS:
+                embed.add_field(name=name, value=value, inline=False)
+            else:
+                hidden += 1
+            now = asyncio.get_running_loop().time()
+            if now - last_edit >= 1.0:
+                await status.edit(embed=embed)
+                last_edit = now
+        embed.description = f"{len(addresses)} adresse(s) sur {len(airdrop_tracker.registry)} chaînes ✅"
+        if hidden:
+            embed.set_footer(text=f"… et {hidden} résultat(s) non affiché(s)")
+        await status.edit(embed=embed)
 
 # Lancer le bot
 if __name__ == "__main__":
     try:
-        bot.run(os.getenv('DISCORD_TOKEN'))
+        bot.run(os.getenv('DISCORD_TOKEN'), log_handler=None)
     except Exception as e:
         logging.error(f"Erreur au démarrage du bot: {str(e)}")
\ No newline at end of file
@@ -3,26 +3,41 @@ import discord
 from discord.ext import commands
 from discord import Intents, Embed
 import os
+import io
+import math
 from dotenv import load_dotenv
 import aiohttp
 import json
 import logging
 import datetime
 import random
-from collections import defaultdict
-from typing import Optional, Dict, List
-from langdetect import detect
+from typing import Optional, Dict, List, Tuple
 import time
+import asyncio
+from core.log_setup import setup_logging
+from core.http_client import HttpClient
+from core.cache import ResponseCache
+from core.rate_limiter import RateLimiter
+from core.singleflight import SingleFlight
+from core.venice_stream import stream_chat, send_chunked, StreamingReply, VeniceStreamError
+from core.llm_scheduler import LLMScheduler, SchedulerFull, RequestCancelled
+from core.response_cache import SemanticCache
+from core.lang import LanguageService, SUPPORTED_LANGUAGES
+from core.memory_store import MemoryStore
+from core.router import MessageRouter
+from core.coin_index import CoinIndex, CoinMatch
+from core.price_book import PriceBook, BINANCE_WS_URL
+from core.market_data import MarketData
+from core.charts import ChartService, ChartQueueFull, parse_duration
+from core.metrics import Metrics, MetricsServer, host_map
+from core.loop_monitor import LoopMonitor
+from core.diagnostics import SamplingProfiler, ProfilerBusy, MemoryTracker, TaskTracker
+from core.deadline import (DEFAULT_COMMAND_DEADLINE, DROPPED, command_deadline, deadline, gather_partial,
+                           remaining, reset_deadline, set_deadline)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(f'logs/bot_{datetime.datetime.now().strftime("%Y%m%d")}.log')
-    ]
-)
+# Configure logging (pas dans les processus de rendu, qui réimportent ce script)
+if __name__ == "__main__":
+    setup_logging('logs/bot.jsonl')
 
 # Load environment variables
 load_dotenv('config/.env')
@@ -30,6 +45,54 @@ load_dotenv('config/.env')
 # Bot Configuration
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 VENICE_API_KEY = os.getenv('VENICE_API_KEY')
+VENICE_API_URL = os.getenv('VENICE_API_URL', 'https://api.venice.ai/api/v1')
+
+# Streaming replies: progressively edit one message while Venice generates
+VENICE_STREAMING = os.getenv('VENICE_STREAMING', '1') == '1'
+VENICE_STREAM_EDIT_INTERVAL = float(os.getenv('VENICE_STREAM_EDIT_INTERVAL', '1.0'))
+VENICE_MODEL = "dolphin-2.9.2-qwen2-72b"
+
+# LLM scheduler: global Venice concurrency and per-user queue cap
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+LLM_MAX_PENDING_PER_USER = int(os.getenv('LLM_MAX_PENDING_PER_USER', '3'))
+
+# Venice answer cache: exact then near-duplicate questions (cosine similarity)
+ANSWER_CACHE_TTL = float(os.getenv('ANSWER_CACHE_TTL', '3600'))
+ANSWER_CACHE_THRESHOLD = float(os.getenv('ANSWER_CACHE_THRESHOLD', '0.85'))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv('ANSWER_CACHE_MAX_ENTRIES', '2048'))
+
+VENICE_FALLBACK = "I'm having trouble processing your request. Try: 'joke', 'meme', 'dog', or 'price btc'"
+
+# Response cache budget (1Gi Akash container)
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '2048'))
+CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+
+# Longest time a caller may queue for an API slot before being rejected
+RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '5'))
+
+# Most coins accepted by one !price command
+PRICE_MAX_COINS = int(os.getenv('PRICE_MAX_COINS', '10'))
+
+# Local ticker/name -> CoinGecko id index, rebuilt once a day
+COIN_INDEX_PATH = os.getenv('COIN_INDEX_PATH', 'data/coin_index.json')
+COIN_INDEX_MAX_AGE = float(os.getenv('COIN_INDEX_MAX_AGE', '86400'))
+
+# Live Binance prices over WebSocket for a watchlist (empty list disables it)
+PRICE_BOOK_SYMBOLS = os.getenv('PRICE_BOOK_SYMBOLS', 'BTCUSDT,ETHUSDT,SOLUSDT,BNBUSDT,ATOMUSDT').split(',')
+PRICE_BOOK_WS_URL = os.getenv('BINANCE_WS_URL', BINANCE_WS_URL)
+
+# Binance klines kept for trading signals (!signal)
+MARKET_SYMBOLS = os.getenv('MARKET_SYMBOLS', ','.join(PRICE_BOOK_SYMBOLS)).split(',')
+MARKET_INTERVAL = os.getenv('MARKET_INTERVAL', '1h')
+MARKET_HISTORY = int(os.getenv('MARKET_HISTORY', '500'))
+MARKET_MAX_SYMBOLS = int(os.getenv('MARKET_MAX_SYMBOLS', '256'))
+MARKET_REFRESH = float(os.getenv('MARKET_REFRESH', '60'))
+# Symbols outside the watchlist (!signal, !chart) are dropped after this long unused
+MARKET_IDLE_TTL = float(os.getenv('MARKET_IDLE_TTL', '21600'))
+
+# Chart rendering processes (!chart), off the event loop
+CHART_WORKERS = int(os.getenv('CHART_WORKERS', '2'))
+CHART_MAX_PENDING = int(os.getenv('CHART_MAX_PENDING', '8'))
 
 # Bot Intents
 intents = Intents.default()
@@ -71,40 +134,129 @@ class GreenyBot(commands.Bot):
             help_command=None,
             activity=discord.Game(name="!help | GREENY v7.4")
         )
-        self.memory = {}
-        self.load_memory()
-        self.cache = {}
-        self.rate_limits = defaultdict(lambda: defaultdict(float))  # Stockage des timestamps
+        self.memory = MemoryStore('data/memory.json')
+        self.cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES)
+        self.metrics = Metrics()
+        upstreams = host_map(dict(API_ENDPOINTS, VENICE=VENICE_API_URL, BINANCE_WS=PRICE_BOOK_WS_URL))
+        self.http_client = HttpClient(trace_configs=[
+            self.metrics.http_trace_config(lambda host: upstreams.get(host, "OTHER"))
+        ])
+        self.loop_monitor = LoopMonitor()
+        self.profiler = SamplingProfiler()
+        self.memory_tracker = MemoryTracker()
+        self.task_tracker = TaskTracker()
+        self.metrics_server = MetricsServer(self.metrics, health=self._health, loop_monitor=self.loop_monitor)
+        self.metrics.on_collect(self._collect_metrics)
+        self.before_invoke(self._command_started)
+        self.after_invoke(self._command_finished)
+        self.inflight = SingleFlight()
+        self.llm_scheduler = LLMScheduler(max_concurrency=LLM_MAX_CONCURRENCY,
+                                          max_pending_per_user=LLM_MAX_PENDING_PER_USER)
+        self.lang = LanguageService(store=self.memory)
+        self.coin_index = CoinIndex(COIN_INDEX_PATH, max_age=COIN_INDEX_MAX_AGE)
+        self._coin_index_task = None
+        self.price_book = PriceBook(PRICE_BOOK_SYMBOLS, url=PRICE_BOOK_WS_URL)
+        self.market = MarketData(capacity=MARKET_HISTORY, max_symbols=MARKET_MAX_SYMBOLS)
+        self.market_watchlist = [symbol.strip().upper() for symbol in MARKET_SYMBOLS if symbol.strip()]
+        self._on_demand: Dict[str, float] = {}  # symbole hors watchlist -> dernière utilisation, ordre LRU
+        self._market_task = None
+        self.charts = ChartService(workers=CHART_WORKERS, max_pending=CHART_MAX_PENDING)
+        self.answer_cache = SemanticCache(ttl=ANSWER_CACHE_TTL, threshold=ANSWER_CACHE_THRESHOLD,
+                                          max_entries=ANSWER_CACHE_MAX_ENTRIES)
         self.api_limits = {
             "COINGECKO": 1.0,    # 1 requête/seconde
             "BINANCE": 0.5,      # 2 requêtes/seconde
+            "BINANCE_KLINES": 0.1,  # 10 requêtes/seconde, réservé au rafraîchissement des bougies
             "VENICE": 2.0,       # 1 requête/2 secondes
             "WIKI": 1.0,         # 1 requête/seconde
             "DEFAULT": 1.0       # Limite par défaut
         }
+        self.api_bursts = {
+            "COINGECKO": 5,
+            "BINANCE": 10,
+            "BINANCE_KLINES": 20,
+            "VENICE": 2,
+            "WIKI": 5,
+            "DEFAULT": 3
+        }
+        self.rate_limiter = RateLimiter(self.api_limits, self.api_bursts, max_wait=RATE_LIMIT_MAX_WAIT)
 
     async def setup_hook(self):
+        self.task_tracker.install(asyncio.get_running_loop())
+        self.loop_monitor.start()
+        try:
+            await self.metrics_server.start()
+        except OSError as e:
+            logging.error(f"Metrics server not started: {str(e)}")
+        await self.http_client.start()
+        # Load language profiles now instead of on the first message
+        await asyncio.to_thread(self.lang.warm_up)
+        # Coin index from disk, rebuilt in the background when missing or old
+        await asyncio.to_thread(self.coin_index.load)
+        self._coin_index_task = asyncio.create_task(self._coin_index_loop())
+        self.price_book.start(self.http_client)
+        self._market_task = asyncio.create_task(self._market_loop())
+        await self.charts.start()
         try:
             await self.tree.sync()
             logging.info("Command tree synced")
         except Exception as e:
             logging.error(f"Error syncing command tree: {str(e)}")
 
-    def load_memory(self):
-        try:
-            with open('data/memory.json', 'r') as f:
-                self.memory = json.load(f)
-        except FileNotFoundError:
-            self.memory = {}
-            self.save_memory()
+    async def close(self):
+        if self._coin_index_task is not None:
+            self._coin_index_task.cancel()
+        if self._market_task is not None:
+            self._market_task.cancel()
+        await self.price_book.stop()
+        self.charts.close()
+        await self.http_client.close()
+        await self.metrics_server.stop()
+        self.loop_monitor.stop()
+        await asyncio.to_thread(self.memory.close)
+        await super().close()
+
+    # Metrics (/metrics and /healthz on METRICS_PORT)
 
-    def save_memory(self):
-        with open('data/memory.json', 'w') as f:
-            json.dump(self.memory, f, indent=4)
+    async def _command_started(self, ctx):
+        ctx.started_at = time.perf_counter()
+        # Budget of the command, inherited by every upstream call it makes
+        ctx.deadline_token = set_deadline(command_deadline(ctx.command.qualified_name))
 
-    async def ask_venice(self, question: str, user: discord.Member, context: Optional[str] = None) -> str:
+    async def _command_finished(self, ctx):
+        reset_deadline(ctx.deadline_token)
+        self.metrics.histogram("command_duration_seconds", "Prefix command duration").observe(
+            time.perf_counter() - ctx.started_at,
+            command=ctx.command.qualified_name, status="error" if ctx.command_failed else "ok")
+
+    def _health(self):
+        return not self.is_closed(), {"ready": self.is_ready()}
+
+    def _collect_metrics(self, metrics: Metrics):
+        """Copy component stats into gauges at scrape time"""
+        if math.isfinite(self.latency):
+            metrics.gauge("gateway_latency_seconds", "Discord gateway heartbeat latency").set(self.latency)
+        for name, cache in (("response", self.cache), ("answer", self.answer_cache)):
+            stats = cache.stats()
+            metrics.gauge("cache_hit_ratio", "Cache hit ratio since start").set(stats["hit_ratio"], cache=name)
+            metrics.gauge("cache_entries", "Cached entries").set(stats["entries"], cache=name)
+        metrics.gauge("cache_bytes", "Response cache size").set(self.cache.stats()["bytes"], cache="response")
+        for api, stats in self.rate_limiter.stats().items():
+            metrics.counter("rate_limit_rejected_total", "Requests rejected by the rate limiter").set(stats["rejected"], api=api)
+            metrics.counter("rate_limit_granted_total", "Requests let through by the rate limiter").set(stats["granted"], api=api)
+            metrics.gauge("rate_limit_queued", "Requests waiting for a rate limit token").set(stats["queued"], api=api)
+        scheduler = self.llm_scheduler.stats()
+        metrics.gauge("llm_running", "Venice calls in progress").set(scheduler["running"])
+        metrics.gauge("llm_queued", "Venice calls waiting in the scheduler").set(scheduler["queued"])
+        metrics.counter("llm_rejected_total", "Venice calls refused by the scheduler").set(scheduler["rejected"])
+        book = self.price_book.stats()
+        metrics.gauge("price_book_connected", "Binance WebSocket connected").set(int(book["connected"]))
+        metrics.gauge("price_book_fresh_symbols", "Symbols with a fresh price").set(book["fresh"])
+        metrics.gauge("chart_pending", "Charts queued or rendering").set(self.charts.pending)
+
+    async def _build_venice_messages(self, question: str, user: discord.Member, context: Optional[str] = None) -> List[dict]:
         # Récupérer la mémoire de l'utilisateur
-        user_memory = self.memory.get(str(user.id), {})
+        user_memory = self.memory.get_memory(str(user.id)) or {}
         is_admin = user.guild_permissions.administrator
         
         messages = [
@@ -134,10 +286,8 @@ class GreenyBot(commands.Bot):
         if '@' in question:
             mentioned = message.mentions[0] if message.mentions else None
             if mentioned:
-                self.memory[str(mentioned.id)] = {
-                    'last_mention': datetime.now().isoformat(),
-                    'context': question
-                }
+                self.memory.remember(str(mentioned.id), 'last_mention', datetime.now().isoformat())
+                self.memory.remember(str(mentioned.id), 'context', question)
         
         # Add VVV context with style
         if "vvv" in question.lower() or "vcu" in question.lower():
@@ -151,21 +301,123 @@ class GreenyBot(commands.Bot):
             })
 
         # Détection et respect de la langue
-        try:
-            user_lang = detect(question)
+        user_lang = await self.lang.detect(question, str(user.id))
+        if user_lang:
             messages[0]["content"] += f" Please respond in {user_lang}."
-        except:
-            pass
 
         if context:
             messages.insert(1, {"role": "system", "content": context})
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.venice.ai/api/v1/chat/completions",
+        return messages
+
+    async def schedule_llm(self, message: discord.Message, func):
+        """Run a Venice call through the fair scheduler, keyed on the triggering message"""
+        author = message.author
+        is_admin = isinstance(author, discord.Member) and author.guild_permissions.administrator
+        flow = message.guild.id if message.guild else f"dm:{author.id}"
+
+        async def notify(position: int):
+            await message.channel.send(f"⏳ Red pill queue position: {position}")
+
+        try:
+            return await self.llm_scheduler.run(func, flow, author.id, priority=is_admin,
+                                                ticket_id=message.id, on_queued=notify)
+        except SchedulerFull:
+            await message.channel.send("🚦 Slow down, Neo. Your previous questions are still in the queue.")
+        except RequestCancelled:
+            logging.info(f"LLM request {message.id} cancelled (message deleted)")
+        return None
+
+    def _answer_cache_variant(self, messages: List[dict], user: discord.Member) -> Optional[str]:
+        """System-prompt variant the answer depends on, None when the answer is personalized"""
+        if self.memory.get_memory(str(user.id)):
+            return None
+        return json.dumps([m["content"] for m in messages if m["role"] == "system"])
+
+    async def cached_answer(self, question: str, user: discord.Member,
+                            context: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """Venice messages for the question and its cached answer (None on a miss),
+        checked before queueing so a hit never waits for a scheduler slot"""
+        messages = await self._build_venice_messages(question, user, context)
+        variant = self._answer_cache_variant(messages, user)
+        cached = self.answer_cache.lookup(question, variant) if variant is not None else None
+        return messages, cached
+
+    async def ask_venice(self, question: str, user: discord.Member, context: Optional[str] = None,
+                         channel_id: Optional[int] = None, messages: Optional[List[dict]] = None) -> str:
+        if messages is None:
+            messages, cached = await self.cached_answer(question, user, context)
+            if cached is not None:
+                return cached
+        variant = self._answer_cache_variant(messages, user)
+
+        # Same question with the same context in the same channel -> one Venice call
+        key = ("VENICE", channel_id, json.dumps(messages, sort_keys=True))
+        response = await self.inflight.do(key, lambda: self._post_venice(messages))
+        if response is None:
+            return VENICE_FALLBACK
+        if variant is not None:
+            self.answer_cache.store(question, variant, response)
+        return response
+
+    async def ask_venice_stream(self, question: str, user: discord.Member, channel: discord.abc.Messageable,
+                                context: Optional[str] = None, messages: Optional[List[dict]] = None) -> str:
+        """Stream the Venice answer into one progressively edited message"""
+        if messages is None:
+            messages, cached = await self.cached_answer(question, user, context)
+            if cached is not None:
+                await send_chunked(channel, cached)
+                return cached
+        variant = self._answer_cache_variant(messages, user)
+
+        key = ("VENICE", channel.id, json.dumps(messages, sort_keys=True))
+
+        # A duplicate of an in-flight question shares the leader's answer: the key
+        # includes the channel, so the leader is already streaming it (or the
+        # fallback) right here and the follower posts nothing
+        if self.inflight.is_inflight(key):
+            response = await self.inflight.do(key, lambda: self._stream_venice(messages, channel))
+            return response or VENICE_FALLBACK
+        response = await self.inflight.do(key, lambda: self._stream_venice(messages, channel))
+        if response is None:
+            return VENICE_FALLBACK
+        if variant is not None:
+            self.answer_cache.store(question, variant, response)
+        return response
+
+    async def _stream_venice(self, messages: List[dict], channel: discord.abc.Messageable) -> Optional[str]:
+        """Full answer, or None if the stream failed (the partial text stays
+        on screen but is never returned, so it is never cached)"""
+        await channel.typing()
+        reply = StreamingReply(channel, min_interval=VENICE_STREAM_EDIT_INTERVAL)
+        try:
+            async for piece in stream_chat(self.http_client, f"{VENICE_API_URL}/chat/completions", VENICE_HEADERS, {
+                "model": VENICE_MODEL,
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": 500
+            }):
+                await reply.feed(piece)
+        except (VeniceStreamError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"Venice stream error: {str(e) or type(e).__name__}")
+            await reply.finish()
+            await channel.send(VENICE_FALLBACK)
+            return None
+
+        if not reply.text:
+            await channel.send(VENICE_FALLBACK)
+            return None
+        if reply.first_token_at is not None:
+            logging.info(f"Venice stream: first token after {reply.first_token_at:.2f}s")
+        return await reply.finish()
+
+    async def _post_venice(self, messages: List[dict]) -> Optional[str]:
+        try:
+            async with self.http_client.post(
+                f"{VENICE_API_URL}/chat/completions",
                 headers=VENICE_HEADERS,
                 json={
-                    "model": "dolphin-2.9.2-qwen2-72b",
+                    "model": VENICE_MODEL,
                     "messages": messages,
                     "temperature": 0.7,
                     "max_tokens": 500
@@ -178,61 +430,253 @@ class GreenyBot(commands.Bot):
                     logging.error(f"Unexpected response format: {data}")
                 except Exception as e:
                     logging.error(f"JSON parsing error: {str(e)}")
-                    
-                return "I'm having trouble processing your request. Try: 'joke', 'meme', 'dog', or 'price btc'"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Budget de la commande épuisé ou Venice trop lent : réponse de secours
+            logging.error(f"Venice API error: {str(e) or type(e).__name__}")
+        return None
+
+    async def _coin_index_loop(self):
+        while True:
+            if self.coin_index.is_stale():
+                await self.coin_index.refresh(self.http_client, API_ENDPOINTS['COINGECKO'], API_ENDPOINTS['BINANCE'])
+            await asyncio.sleep(3600)
+
+    def resolve_coin(self, query: str) -> Optional[CoinMatch]:
+        """Ticker/nom/id -> coin ; sans index chargé, la requête est passée telle quelle"""
+        match = self.coin_index.resolve(query)
+        if match is None and not self.coin_index.ready:
+            query = query.strip().lower()
+            return CoinMatch(query, query, query.upper(), f"{query.upper()}USDT")
+        return match
+
+    def unknown_coin_message(self, query: str) -> str:
+        suggestions = self.coin_index.suggest(query)
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        return f"❓ Unknown coin '{query}'.{hint}"
 
     # Nouvelle fonction pour CoinGecko
-    async def get_crypto_price(self, crypto_id: str) -> str:
+    async def get_crypto_price(self, crypto: str) -> str:
+        match = self.resolve_coin(crypto)
+        if match is None:
+            return self.unknown_coin_message(crypto)
+        quotes = await self.get_coingecko_prices([match.id])
+        if match.id in quotes:
+            price, _ = quotes[match.id]
+            return f"💰 {match.symbol.upper()} Price: ${price:,.2f} USD"
+        return "Could not fetch price data."
+
+    async def get_coingecko_prices(self, crypto_ids: List[str]) -> Dict[str, tuple]:
+        """{id: (prix USD, last_updated_at)} en un seul appel simple/price"""
+        ids = sorted(set(crypto_ids))
+        if not ids:
+            return {}
+        return await self.inflight.do(("COINGECKO", ",".join(ids)), lambda: self._fetch_coingecko_prices(ids))
+
+    async def _fetch_coingecko_prices(self, ids: List[str]) -> Dict[str, tuple]:
+        if not await self.rate_limiter.acquire("COINGECKO"):
+            return {}
+        params = {"ids": ",".join(ids), "vs_currencies": "usd", "include_last_updated_at": "true"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{API_ENDPOINTS['COINGECKO']}/simple/price?ids={crypto_id}&vs_currencies=usd") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if crypto_id in data:
-                            price = data[crypto_id]['usd']
-                            return f"💰 {crypto_id.upper()} Price: ${price:,.2f} USD"
-                    return "Could not fetch price data."
+            async with self.http_client.get(f"{API_ENDPOINTS['COINGECKO']}/simple/price", params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {
+                        crypto_id: (quote['usd'], quote.get('last_updated_at'))
+                        for crypto_id, quote in data.items() if 'usd' in quote
+                    }
+                logging.error(f"CoinGecko API Error: HTTP {response.status}")
         except Exception as e:
             logging.error(f"CoinGecko API Error: {str(e)}")
-            return "Error fetching price data."
+        return {}
 
     # Nouvelle fonction pour Binance
     async def get_binance_price(self, symbol: str) -> str:
+        symbol = symbol.strip().upper()
+        quote = await self.get_binance_quote(symbol)
+        if quote is not None:
+            return f"📊 {symbol} Price: ${quote[0]:,.2f} USD"
+        return "Could not fetch Binance price."
+
+    async def get_binance_quote(self, symbol: str) -> Optional[Tuple[float, Optional[float]]]:
+        """(price, age in seconds) from the price book, (price, None) from REST"""
+        symbol = symbol.strip().upper()
+        # Watchlist symbols come straight from the WebSocket price book
+        live = self.price_book.get(symbol)
+        if live is not None:
+            return live
+        price = await self.inflight.do(("BINANCE", symbol), lambda: self._fetch_binance_quote(symbol))
+        return None if price is None else (price, None)
+
+    async def _fetch_binance_quote(self, symbol: str) -> Optional[float]:
+        if not await self.rate_limiter.acquire("BINANCE"):
+            return None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{API_ENDPOINTS['BINANCE']}/ticker/price?symbol={symbol.upper()}") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        price = float(data['price'])
-                        return f"📊 {symbol.upper()} Price: ${price:,.2f} USD"
-                    return "Could not fetch Binance price."
+            async with self.http_client.get(f"{API_ENDPOINTS['BINANCE']}/ticker/price", params={"symbol": symbol}) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return float(data['price'])
         except Exception as e:
             logging.error(f"Binance API Error: {str(e)}")
-            return "Error fetching Binance data."
+        return None
+
+    async def get_prices(self, coins: List[str]) -> dict:
+        """Prix de plusieurs coins : un appel CoinGecko groupé et les appels
+        Binance lancés en même temps, donc latence = la source la plus lente.
+        À l'échéance de la commande, les sources en retard sont abandonnées
+        (comptées dans timed_out) et le reste est renvoyé.
+        binance : {coin: (prix, âge du price book ou None si REST) ou None}"""
+        coins = list(dict.fromkeys(coin.strip().lower() for coin in coins if coin.strip()))
+        # Tickers inconnus : réponse locale, aucun appel réseau
+        matches, unknown = {}, {}
+        for coin in coins:
+            match = self.resolve_coin(coin)
+            if match is None:
+                unknown[coin] = self.coin_index.suggest(coin)
+            else:
+                matches[coin] = match
+        listed = [coin for coin, match in matches.items() if match.binance]
+
+        async def timed(coro):
+            start = time.perf_counter()
+            result = await coro
+            left = remaining()
+            if not result and left is not None and left <= 0:
+                return DROPPED  # requête coupée par son délai, réduit au budget restant
+            return result, time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await gather_partial(
+            timed(self.get_coingecko_prices([match.id for match in matches.values()])),
+            *(timed(self.get_binance_quote(matches[coin].binance)) for coin in listed),
+            dropped=DROPPED
+        )
+        timed_out = sum(result is DROPPED for result in results)
+        elapsed = time.perf_counter() - start
+        (gecko, gecko_latency), *binance = [
+            (default, elapsed) if result is None or result is DROPPED else result
+            for result, default in zip(results, [{}] + [None] * len(listed))
+        ]
+        return {
+            "coins": coins,
+            "matches": matches,
+            "unknown": unknown,
+            "coingecko": gecko,
+            "coingecko_latency": gecko_latency,
+            "binance": {coin: quote for coin, (quote, _) in zip(listed, binance)},
+            "binance_latency": max((latency for _, latency in binance), default=0.0),
+            "total_latency": time.perf_counter() - start,
+            "timed_out": timed_out
+        }
+
+    # Market data / trading signals
+    async def _fetch_klines(self, symbol: str, limit: int, max_wait: Optional[float] = None) -> Optional[list]:
+        """Bougies fermées uniquement (la dernière renvoyée par Binance est en cours).
+        Seau à jetons à part (BINANCE_KLINES) : des centaines de symboles ne
+        vident pas celui des commandes, et pas de cache de réponses (il
+        renverrait des bougies déjà vues)."""
+        if not await self.rate_limiter.acquire("BINANCE_KLINES", max_wait):
+            logging.debug(f"Klines {symbol}: rate limited")
+            return None
+        params = {"symbol": symbol, "interval": MARKET_INTERVAL, "limit": limit}
+        try:
+            async with self.http_client.get(f"{API_ENDPOINTS['BINANCE']}/klines", params=params) as response:
+                if response.status != 200:
+                    logging.error(f"Klines {symbol}: HTTP {response.status}")
+                    return None
+                data = await response.json()
+        except Exception as e:
+            logging.error(f"Klines {symbol}: {str(e)}")
+            return None
+        if not isinstance(data, list):
+            return None
+        now_ms = time.time() * 1000
+        return [kline for kline in data if kline[6] < now_ms]
+
+    async def track_symbols(self, symbols: List[str], max_wait: Optional[float] = None):
+        """Charge l'historique complet des symboles (nouveaux ou avec un trou)"""
+        results = await asyncio.gather(*(self._fetch_klines(symbol, MARKET_HISTORY, max_wait) for symbol in symbols))
+        self.market.load({symbol: klines for symbol, klines in zip(symbols, results) if klines})
+
+    async def use_symbol(self, symbol: str):
+        """Symbole demandé par !signal / !chart. Hors watchlist il n'est suivi
+        qu'à la demande : le moins récemment utilisé laisse sa place quand
+        MarketData est plein, et la boucle de marché oublie ceux inutilisés
+        depuis MARKET_IDLE_TTL. ValueError si plein de symboles de la watchlist."""
+        if symbol not in self.market_watchlist:
+            self._on_demand.pop(symbol, None)
+            self._on_demand[symbol] = time.time()
+        if symbol in self.market:
+            return
+        if len(self.market.symbols) >= self.market.max_symbols:
+            for old in self._on_demand:
+                if old != symbol and old in self.market:
+                    del self._on_demand[old]
+                    self.market.remove(old)
+                    break
+        await self.track_symbols([symbol])
+
+    def _drop_idle_symbols(self):
+        expired = time.time() - MARKET_IDLE_TTL
+        for symbol, used in list(self._on_demand.items()):
+            if used > expired:
+                break  # ordre LRU : les suivants sont plus récents
+            del self._on_demand[symbol]
+            self.market.remove(symbol)
+            logging.info(f"Market data: {symbol} dropped after {MARKET_IDLE_TTL:.0f}s unused")
+
+    async def _market_loop(self):
+        try:
+            await self.track_symbols(self.market_watchlist, max_wait=MARKET_REFRESH)
+        except ValueError as e:
+            logging.error(f"Market data: {str(e)}")
+        while True:
+            await asyncio.sleep(MARKET_REFRESH)
+            try:
+                self._drop_idle_symbols()
+                symbols = list(self.market.symbols)
+                # Les requêtes s'étalent sur l'intervalle de rafraîchissement au lieu d'être rejetées
+                klines_bucket = self.rate_limiter.bucket("BINANCE_KLINES")
+                rejected = klines_bucket.rejected
+                results = await asyncio.gather(*(self._fetch_klines(symbol, 3, MARKET_REFRESH) for symbol in symbols))
+                if klines_bucket.rejected > rejected:
+                    logging.warning(f"Market data: {klines_bucket.rejected - rejected}/{len(symbols)} kline refreshes "
+                                    f"rate limited, reloaded on the next round")
+                batch, gaps = {}, []
+                for symbol, klines in zip(symbols, results):
+                    if symbol not in self.market:
+                        continue  # libéré pendant le rafraîchissement
+                    new = [kline for kline in klines or [] if kline[0] > self.market.last_open_time(symbol)]
+                    if len(new) == 1:
+                        batch[symbol] = new[0]
+                    elif new:
+                        gaps.append(symbol)  # plusieurs bougies manquées : on recharge
+                self.market.update(batch)
+                if gaps:
+                    await self.track_symbols(gaps, max_wait=MARKET_REFRESH)
+            except Exception as e:
+                logging.error(f"Market data refresh error: {str(e)}")
 
     # Fun commands
     async def get_random_joke(self) -> str:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(API_ENDPOINTS["JOKES"]) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data["type"] == "single":
-                            return f"😄 {data['joke']}"
-                        else:
-                            return f"😄 {data['setup']}\n\n🎯 {data['delivery']}"
-                    return "Couldn't fetch a joke right now!"
+            async with self.http_client.get(API_ENDPOINTS["JOKES"]) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data["type"] == "single":
+                        return f"😄 {data['joke']}"
+                    else:
+                        return f"😄 {data['setup']}\n\n🎯 {data['delivery']}"
+                return "Couldn't fetch a joke right now!"
         except Exception as e:
             return "Error fetching joke!"
 
     async def get_random_meme(self) -> str:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(API_ENDPOINTS["MEMES"]) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["url"]
-                    return "Couldn't fetch a meme right now!"
+            async with self.http_client.get(API_ENDPOINTS["MEMES"]) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data["url"]
+                return "Couldn't fetch a meme right now!"
         except Exception as e:
             return "Error fetching meme!"
 
@@ -272,31 +716,33 @@ class GreenyBot(commands.Bot):
 
     async def fetch_data(self, api_name: str, endpoint: str, params: dict = None) -> dict:
         """Enhanced Matrix-style data fetching with rate limiting and cache"""
-        cache_key = f"{api_name}:{endpoint}:{str(params)}"
+        cache_key = ResponseCache.make_key(api_name, endpoint, params)
         
-        # Check rate limits
-        if self.is_rate_limited(api_name):
-            return {"error": "Too many red pills. Wait for system cooldown..."}
-            
         # Check cache
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Concurrent identical fetches share one upstream request
+        return await self.inflight.do(cache_key, lambda: self._fetch_upstream(api_name, endpoint, params, cache_key))
+
+    async def _fetch_upstream(self, api_name: str, endpoint: str, params: Optional[dict], cache_key: str) -> dict:
+        # Wait for a rate limit slot (queued, rejected only past the max wait)
+        if not await self.rate_limiter.acquire(api_name):
+            return {"error": "Too many red pills. Wait for system cooldown..."}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{API_ENDPOINTS[api_name]}/{endpoint}"
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # Cache the response
-                        self.cache[cache_key] = data
-                        # Update rate limit
-                        self.update_rate_limit(api_name)
-                        return data
-                    return {
-                        "error": f"[ERROR {response.status}] Agent Smith detected...",
-                        "matrix_code": "RED_PILL_REJECTED"
-                    }
+            url = f"{API_ENDPOINTS[api_name]}/{endpoint}"
+            async with self.http_client.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    # Cache the response
+                    self.cache.set(cache_key, data, api_name)
+                    return data
+                return {
+                    "error": f"[ERROR {response.status}] Agent Smith detected...",
+                    "matrix_code": "RED_PILL_REJECTED"
+                }
         except Exception as e:
             return {
                 "error": "⚠️ MATRIX BREACH DETECTED ⚠️",
@@ -333,16 +779,24 @@ class GreenyBot(commands.Bot):
     async def get_crypto_info(self, coin: str) -> str:
         """Get crypto data from multiple sources"""
         try:
-            # CoinGecko
-            gecko_data = await self.fetch_data("COINGECKO", f"simple/price?ids={coin}&vs_currencies=usd")
-            
-            # Binance
-            binance_data = await self.fetch_data("BINANCE", f"ticker/price?symbol={coin.upper()}USDT")
+            match = self.resolve_coin(coin)
+            if match is None:
+                return self.unknown_coin_message(coin)
+
+            # CoinGecko et Binance (price book ou REST) en parallèle
+            gecko_data, binance_quote = await gather_partial(
+                self.get_coingecko_prices([match.id]),
+                self.get_binance_quote(match.binance) if match.binance else asyncio.sleep(0)
+            )
+            # Source abandonnée à l'échéance : n/a plutôt qu'une erreur
+            gecko_price = (gecko_data or {}).get(match.id)
+            gecko = f"${gecko_price[0]:,.2f}" if gecko_price else "n/a"
+            binance = f"${binance_quote[0]:,.2f}" if binance_quote is not None else "n/a"
             
             return f"""
-            🕶️ Red pill data for {coin.upper()}:
-            CoinGecko: ${gecko_data[coin]['usd']:,.2f}
-            Binance: ${float(binance_data['price']):,.2f}
+            🕶️ Red pill data for {match.symbol.upper()}:
+            CoinGecko: {gecko}
+            Binance: {binance}
             """
         except:
             return "Looks like Agent Smith is messing with the data..."
@@ -386,23 +840,6 @@ class GreenyBot(commands.Bot):
             response = await self.fetch_data(source.upper(), *args)
             await ctx.send(f"```json\n{json.dumps(response, indent=2)}\n```")
 
-    def is_rate_limited(self, api_name: str) -> bool:
-        """
-        Vérifie si on peut faire une nouvelle requête
-        Retourne True si on doit attendre
-        """
-        now = time.time()
-        last_call = self.rate_limits[api_name]
-        limit = self.api_limits.get(api_name, self.api_limits["DEFAULT"])
-        
-        return (now - last_call) < limit  # True = doit attendre
-
-    def update_rate_limit(self, api_name: str):
-        """
-        Enregistre quand on fait une requête
-        """
-        self.rate_limits[api_name] = time.time()
-
 bot = GreenyBot()
 
 @bot.event
@@ -417,60 +854,74 @@ async def on_ready():
     logging.info(f"Serving {len(bot.guilds)} servers")
     logging.info(f"{'-'*40}")
 
-@bot.event
-async def on_message(message):
-    if message.author == bot.user:
+# Simple (prefix-less) commands, routed once per message
+message_router = MessageRouter()
+
+@message_router.exact("joke")
+async def joke_route(message, _):
+    async with bot.http_client.get("https://v2.jokeapi.dev/joke/Any") as response:
+        data = await response.json()
+        if data["type"] == "single":
+            await message.channel.send(f"😄 {data['joke']}")
+        else:
+            await message.channel.send(f"😄 {data['setup']}\n\n🎯 {data['delivery']}")
+
+@message_router.exact("dog")
+async def dog_route(message, _):
+    async with bot.http_client.get("https://dog.ceo/api/breeds/image/random") as response:
+        data = await response.json()
+        embed = discord.Embed(color=0x2ecc71)
+        embed.set_image(url=data["message"])
+        await message.channel.send(embed=embed)
+
+@message_router.exact("meme")
+async def meme_route(message, _):
+    async with bot.http_client.get("https://meme-api.com/gimme") as response:
+        data = await response.json()
+        embed = discord.Embed(color=0x2ecc71)
+        embed.set_image(url=data["url"])
+        await message.channel.send(embed=embed)
+
+@message_router.prefix("price ")
+async def price_route(message, crypto):
+    # Route passive ("price is crazy today") : on ne répond que pour un coin connu
+    # de l'index et un prix obtenu, jamais avec un message d'erreur
+    match = bot.coin_index.resolve(crypto)
+    if match is None:
         return
+    quotes = await bot.get_coingecko_prices([match.id])
+    if match.id in quotes:
+        await message.channel.send(f"💰 {match.symbol.upper()} Price: ${quotes[match.id][0]:,.2f} USD")
 
-    content = message.content.lower()
-    
-    # Commandes simples
-    if content == "joke":
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://v2.jokeapi.dev/joke/Any") as response:
-                data = await response.json()
-                if data["type"] == "single":
-                    await message.channel.send(f"😄 {data['joke']}")
-                else:
-                    await message.channel.send(f"😄 {data['setup']}\n\n🎯 {data['delivery']}")
-    
-    elif content == "dog":
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://dog.ceo/api/breeds/image/random") as response:
-                data = await response.json()
-                embed = discord.Embed(color=0x2ecc71)
-                embed.set_image(url=data["message"])
-                await message.channel.send(embed=embed)
-    
-    elif content == "meme":
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://meme-api.com/gimme") as response:
-                data = await response.json()
-                embed = discord.Embed(color=0x2ecc71)
-                embed.set_image(url=data["url"])
-                await message.channel.send(embed=embed)
-    
-    elif content.startswith("price "):
-        crypto = content[6:]
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"https://api.coingecko.com/api/v3/simple/price?ids={crypto}&vs_currencies=usd") as response:
-                data = await response.json()
-                if crypto in data:
-                    price = data[crypto]['usd']
-                    await message.channel.send(f"💰 {crypto.upper()} Price: ${price:,.2f} USD")
-    
-    elif content == "help":
-        help_text = """
+@message_router.exact("help")
+async def help_route(message, _):
+    help_text = """
 Available commands:
 - `joke` : Get a random joke
 - `dog` : See a cute dog
 - `meme` : Get a random meme
 - `price btc` : Get crypto price
 - `help` : Show this help
-        """
-        await message.channel.send(help_text)
+    """
+    await message.channel.send(help_text)
+
+@bot.event
+async def on_message(message):
+    if message.author == bot.user:
+        return
 
-    await bot.process_commands(message)
+    # Normalize once: prefixed command or simple command route
+    content = message.content.lower()
+    if content.startswith(bot.command_prefix):
+        await bot.process_commands(message)
+        return
+    with deadline(DEFAULT_COMMAND_DEADLINE):
+        await message_router.dispatch(message, content)
+
+@bot.event
+async def on_message_delete(message):
+    # Deleting the question cancels its queued or running LLM request
+    bot.llm_scheduler.cancel(message.id)
 
 @bot.command(name='help')
 async def help_command(ctx):
@@ -488,7 +939,7 @@ async def help_command(ctx):
     
     embed.add_field(
         name="💰 Crypto",
-        value="• `price <crypto>` - Get crypto price\n• `greeny` + your question",
+        value="• `price <crypto>` - Get crypto price\n• `!price btc eth sol` - Compare several coins\n• `!signal <crypto>` - Trading signals\n• `!chart <crypto> [24h]` - Price chart\n• `greeny` + your question\n• `!lang <fr|en|es|ru>` - Set your language",
         inline=False
     )
     
@@ -497,48 +948,309 @@ async def help_command(ctx):
     
     await ctx.send(embed=embed)
 
+async def answer_question(ctx, question: str, context: Optional[str] = None):
+    """Cached answers are sent right away, only misses go through the LLM queue"""
+    messages, cached = await bot.cached_answer(question, ctx.author, context)
+    if cached is not None:
+        await send_chunked(ctx.channel, cached)
+        return
+    if VENICE_STREAMING:
+        await bot.schedule_llm(ctx.message, lambda: bot.ask_venice_stream(
+            question, ctx.author, ctx.channel, context=context, messages=messages))
+        return
+    async with ctx.typing():
+        response = await bot.schedule_llm(ctx.message, lambda: bot.ask_venice(
+            question, ctx.author, context=context, channel_id=ctx.channel.id, messages=messages))
+        if response:
+            await ctx.send(response)
+
 @bot.command(name='ask')
 async def ask(ctx, *, question):
     """Ask GREENY anything"""
-    async with ctx.typing():
-        response = await bot.ask_venice(question, ctx.author)
-        await ctx.send(response)
+    await answer_question(ctx, question)
 
 @bot.command(name='analyze')
 async def analyze(ctx, *, target):
     """Analyze a wallet or project"""
+    await answer_question(
+        ctx,
+        f"Provide a detailed analysis of: {target}",
+        context="You are a crypto analysis expert. Provide detailed insights."
+    )
+
+@bot.command(name='lang')
+async def set_language(ctx, lang: str):
+    """Set your preferred answer language"""
+    lang = lang.lower()
+    if lang in SUPPORTED_LANGUAGES:
+        bot.lang.set_preference(str(ctx.author.id), lang)
+        await ctx.send(f"🌐 Language set to {lang}.")
+    else:
+        await ctx.send(f"🌐 Supported languages: {', '.join(SUPPORTED_LANGUAGES)}")
+
+@bot.command(name='price')
+async def price(ctx, *coins: str):
+    """Get crypto prices from multiple sources: !price btc eth sol"""
+    if not coins:
+        await ctx.send("Usage: `!price <crypto> [crypto ...]`")
+        return
+    if len(coins) > PRICE_MAX_COINS:
+        await ctx.send(f"⚠️ {PRICE_MAX_COINS} coins max per request.")
+        return
+
     async with ctx.typing():
-        response = await bot.ask_venice(
-            f"Provide a detailed analysis of: {target}",
-            ctx.author,
-            context="You are a crypto analysis expert. Provide detailed insights."
+        prices = await bot.get_prices(list(coins))
+        now = time.time()
+
+        embed = Embed(
+            title=f"🔍 Price Check: {', '.join(coin.upper() for coin in prices['coins'])}",
+            color=BOT_STYLE["color"]
         )
-        await ctx.send(response)
+        for coin in prices["coins"]:
+            if coin in prices["unknown"]:
+                embed.add_field(name=coin.upper(), value=bot.unknown_coin_message(coin), inline=False)
+                continue
+            match = prices["matches"][coin]
+            lines = []
+            if match.id in prices["coingecko"]:
+                gecko_price, updated_at = prices["coingecko"][match.id]
+                age = f" ({int(now - updated_at)}s old)" if updated_at else ""
+                lines.append(f"💰 CoinGecko: ${gecko_price:,.2f}{age}")
+            else:
+                lines.append("💰 CoinGecko: n/a")
+            if match.binance is None:
+                lines.append("📊 Binance: not listed")
+            else:
+                quote = prices["binance"][coin]
+                if quote is None:
+                    lines.append("📊 Binance: n/a")
+                else:
+                    binance_price, age = quote
+                    source = f"live, {age:.1f}s old" if age is not None else "REST"
+                    lines.append(f"📊 Binance: ${binance_price:,.2f} ({source})")
+            embed.add_field(name=f"{match.name} ({match.symbol.upper()})", value="\n".join(lines), inline=False)
+
+        embed.set_footer(
+            text=(f"CoinGecko {prices['coingecko_latency'] * 1000:.0f}ms (batched) | "
+                  f"Binance {prices['binance_latency'] * 1000:.0f}ms ({len(prices['binance'])} parallel) | "
+                  f"total {prices['total_latency'] * 1000:.0f}ms"
+                  + (f" | ⏱️ {prices['timed_out']} timed out" if prices['timed_out'] else "")),
+            icon_url=BOT_STYLE["footer_icon"]
+        )
+
+        await ctx.send(embed=embed)
+
+@bot.command(name='signal')
+async def signal(ctx, coin: str):
+    """Trading signals (SMA/EMA/RSI/MACD/Bollinger) for one coin"""
+    match = bot.resolve_coin(coin)
+    if match is None:
+        await ctx.send(bot.unknown_coin_message(coin))
+        return
+    if match.binance is None:
+        await ctx.send(f"📉 {match.symbol.upper()} is not listed on Binance.")
+        return
 
-@bot.command(name='price')
-async def price(ctx, crypto: str):
-    """Get crypto price from multiple sources"""
     async with ctx.typing():
-        # Try CoinGecko first
-        coingecko_response = await bot.get_crypto_price(crypto.lower())
-        binance_response = await bot.get_binance_price(f"{crypto}USDT")
-        
+        try:
+            await bot.use_symbol(match.binance)
+        except ValueError:
+            await ctx.send("⚠️ Too many tracked symbols, try one of the watchlist coins.")
+            return
+        data = bot.market.signals([match.binance]).get(match.binance)
+        if data is None:
+            await ctx.send("Could not fetch market data.")
+            return
+        if not data["ready"]:
+            await ctx.send(f"⏳ Not enough candles yet for {match.binance} ({data['candles']}).")
+            return
+
         embed = Embed(
-            title=f"🔍 Price Check: {crypto.upper()}",
+            title=f"📈 Signals: {match.binance} ({MARKET_INTERVAL})",
+            description="\n".join(f"• {s}" for s in data["signals"]) or "No signal, market is neutral.",
             color=BOT_STYLE["color"]
         )
-        embed.add_field(name="CoinGecko", value=coingecko_response, inline=False)
-        embed.add_field(name="Binance", value=binance_response, inline=False)
-        embed.set_footer(text="Data from multiple sources", icon_url=BOT_STYLE["footer_icon"])
-        
+        embed.add_field(name="Close", value=f"${data['close']:,.4f}", inline=True)
+        embed.add_field(name="RSI 14", value=f"{data['rsi']:.1f}", inline=True)
+        embed.add_field(name="EMA 12 / 26", value=f"{data['ema_fast']:,.4f} / {data['ema_slow']:,.4f}", inline=True)
+        embed.add_field(name="MACD", value=f"{data['macd']:,.4f} (signal {data['macd_signal']:,.4f})", inline=True)
+        embed.add_field(name="SMA 20", value=f"{data['sma']:,.4f}", inline=True)
+        embed.add_field(name="Bollinger", value=f"{data['bb_lower']:,.4f} – {data['bb_upper']:,.4f}", inline=True)
+        embed.set_footer(text=f"{data['candles']} candles | not financial advice", icon_url=BOT_STYLE["footer_icon"])
         await ctx.send(embed=embed)
 
+@bot.command(name='chart')
+async def chart(ctx, coin: str, period: str = "24h"):
+    """Price chart for one coin: !chart btc 24h"""
+    duration = parse_duration(period)
+    if duration is None:
+        await ctx.send("Usage: `!chart <crypto> [24h|7d|2w]`")
+        return
+    match = bot.resolve_coin(coin)
+    if match is None:
+        await ctx.send(bot.unknown_coin_message(coin))
+        return
+    if match.binance is None:
+        await ctx.send(f"📉 {match.symbol.upper()} is not listed on Binance.")
+        return
+
+    async with ctx.typing():
+        try:
+            await bot.use_symbol(match.binance)
+        except ValueError:
+            await ctx.send("⚠️ Too many tracked symbols, try one of the watchlist coins.")
+            return
+        if match.binance not in bot.market:
+            await ctx.send("Could not fetch market data.")
+            return
+        candles = bot.market.candles(match.binance)[-max(2, math.ceil(duration / parse_duration(MARKET_INTERVAL))):]
+
+        # Same symbol, period and last candle: the cached PNG is reused
+        key = (match.binance, period, int(candles[-1, 0]))
+        try:
+            png = await bot.charts.render(key, f"{match.binance} {period}", candles)
+        except ChartQueueFull:
+            await ctx.send("🖥️ Chart renderer is busy, try again in a few seconds.")
+            return
+
+        embed = Embed(title=f"📈 {match.name} ({match.symbol.upper()}) {period}", color=BOT_STYLE["color"])
+        embed.set_image(url="attachment://chart.png")
+        embed.set_footer(text=f"{len(candles)} candles of {MARKET_INTERVAL} | Binance", icon_url=BOT_STYLE["footer_icon"])
+        await ctx.send(embed=embed, file=discord.File(io.BytesIO(png), filename="chart.png"))
+
+@bot.command(name='lag')
+@commands.has_permissions(administrator=True)
+async def lag_command(ctx):
+    """Event loop lag percentiles and the worst blocking callbacks"""
+    stats = bot.loop_monitor.stats()
+    embed = Embed(
+        title="⏱️ Event loop lag",
+        description=(f"p50 {stats['p50'] * 1000:.1f}ms | p95 {stats['p95'] * 1000:.1f}ms | "
+                     f"p99 {stats['p99'] * 1000:.1f}ms | max {stats['max'] * 1000:.0f}ms\n"
+                     f"{stats['slow']} stalls over {stats['threshold'] * 1000:.0f}ms since start"),
+        color=BOT_STYLE["color"]
+    )
+    worst = bot.loop_monitor.worst(5)
+    for key, offender in worst:
+        embed.add_field(
+            name=f"{offender['worst'] * 1000:.0f}ms worst, {offender['count']}x: {key}"[:256],
+            value=f"```{''.join(offender['stack'][-3:])[-1000:] or offender['where'] or 'no stack'}```",
+            inline=False
+        )
+    if not worst:
+        embed.add_field(name="Offenders", value="No stall recorded. The Matrix runs smooth.", inline=False)
+    embed.set_footer(text="GREENY v7.4 | Loop watchdog", icon_url=BOT_STYLE["footer_icon"])
+    await ctx.send(embed=embed)
+
+ADMIN_HELP = """profile <seconds>   sample the event loop, attach collapsed stacks
+profile stop        end the running profile early
+mem start [frames]  start tracemalloc
+mem top [n]         biggest allocations (new diff baseline)
+mem diff [n]        growth since the last top/diff
+mem stop            stop tracemalloc
+tasks [n]           oldest asyncio tasks
+stats               caches, rate limiter, queues
+cache flush [response|answer|all]
+cache resize <response|answer> <entries> [max_bytes]"""
+
+def admin_block(lines) -> str:
+    """Code block that fits in one Discord message"""
+    text = "\n".join(lines)
+    return f"```\n{text[:1900]}\n```"
+
 @bot.command(name='admin')
 @commands.has_permissions(administrator=True)
-async def admin_command(ctx, *, command):
-    """Matrix-style admin interface"""
-    response = f"⚡ Operator, welcome to the mainframe...\n"
-    # Admin specific logic here
+async def admin_command(ctx, *, command: str = "help"):
+    """Matrix-style operator console for live diagnostics"""
+    args = command.split()
+    action, params = args[0].lower(), args[1:]
+    try:
+        if action == "profile":
+            if params and params[0] == "stop":
+                bot.profiler.stop()
+                await ctx.send("⏹️ Profile stopping...")
+                return
+            seconds = min(float(params[0]) if params else 10.0, 300.0)
+            await ctx.send(f"⚡ Operator, sampling the Matrix for {seconds:.0f}s...")
+            try:
+                collapsed, samples = await bot.profiler.run(seconds)
+            except ProfilerBusy:
+                await ctx.send("🚫 A profile is already running. `!admin profile stop` to end it.")
+                return
+            await ctx.send(f"📊 {samples} samples (collapsed stacks, open with speedscope or flamegraph.pl)",
+                           file=discord.File(io.BytesIO(collapsed.encode()), filename="profile.collapsed.txt"))
+
+        elif action == "mem":
+            sub = params[0].lower() if params else "top"
+            if sub == "start":
+                bot.memory_tracker.start(int(params[1]) if len(params) > 1 else 1)
+                await ctx.send("🧠 tracemalloc started. Allocations are slower until `!admin mem stop`.")
+            elif sub == "stop":
+                bot.memory_tracker.stop()
+                await ctx.send("🧠 tracemalloc stopped.")
+            elif sub in ("top", "diff"):
+                if not bot.memory_tracker.running:
+                    await ctx.send("🧠 tracemalloc is off. `!admin mem start` first.")
+                    return
+                limit = int(params[1]) if len(params) > 1 else 10
+                lines = await (bot.memory_tracker.top(limit) if sub == "top" else bot.memory_tracker.diff(limit))
+                await ctx.send(admin_block(lines))
+            else:
+                await ctx.send(admin_block(ADMIN_HELP.splitlines()))
+
+        elif action == "tasks":
+            rows = bot.task_tracker.tasks(int(params[0]) if params else 20)
+            lines = [f"{len(asyncio.all_tasks())} tasks"] + [
+                f"{age:8.1f}s  {name[:18]:18} {coro[:40]:40} {where}" for age, name, coro, where in rows
+            ]
+            await ctx.send(admin_block(lines))
+
+        elif action == "stats":
+            sections = {
+                "response cache": bot.cache.stats(),
+                "answer cache": bot.answer_cache.stats(),
+                "llm scheduler": bot.llm_scheduler.stats(),
+                "charts": bot.charts.stats(),
+                "price book": bot.price_book.stats(),
+                "event loop": bot.loop_monitor.stats()
+            }
+            lines = []
+            for title, stats in sections.items():
+                lines.append(f"[{title}]")
+                lines.extend(f"  {key}: {value:.4g}" if isinstance(value, float) else f"  {key}: {value}"
+                             for key, value in stats.items())
+            lines.append("[rate limiter]")
+            lines.extend(f"  {api}: {stats}" for api, stats in bot.rate_limiter.stats().items())
+            await ctx.send(admin_block(lines))
+
+        elif action == "cache":
+            sub = params[0].lower() if params else ""
+            if sub == "flush":
+                target = params[1].lower() if len(params) > 1 else "all"
+                if target in ("response", "all"):
+                    bot.cache.clear()
+                if target in ("answer", "all"):
+                    bot.answer_cache.clear()
+                await ctx.send(f"🧹 Cache flushed: {target}")
+            elif sub == "resize" and len(params) >= 3:
+                target, entries = params[1].lower(), int(params[2])
+                if entries < 1:
+                    raise ValueError("cache size must be positive")
+                if target == "response":
+                    bot.cache.resize(max_entries=entries, max_bytes=int(params[3]) if len(params) > 3 else None)
+                    await ctx.send(admin_block([f"response cache: {bot.cache.stats()}"]))
+                elif target == "answer":
+                    bot.answer_cache.resize(entries)
+                    await ctx.send(admin_block([f"answer cache: {bot.answer_cache.stats()}"]))
+                else:
+                    await ctx.send("🚫 Unknown cache. Use `response` or `answer`.")
+            else:
+                await ctx.send(admin_block(ADMIN_HELP.splitlines()))
+
+        else:
+            await ctx.send(f"⚡ Operator, welcome to the mainframe...\n{admin_block(ADMIN_HELP.splitlines())}")
+    except ValueError:
+        await ctx.send(f"🚫 Invalid argument.\n{admin_block(ADMIN_HELP.splitlines())}")
 
 if __name__ == "__main__":
-    bot.run(DISCORD_TOKEN)
\ No newline at end of file
+    bot.run(DISCORD_TOKEN, log_handler=None)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from core.llm_scheduler import LLMScheduler, RequestCancelled
+
+
+async def _hold(release: asyncio.Event, result="ok"):
+    await release.wait()
+    return result
+
+
+def test_slot_released_when_queue_notification_fails():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        first = asyncio.ensure_future(scheduler.run(lambda: _hold(release), "g1", "u1"))
+        await asyncio.sleep(0)
+
+        async def notify(position):
+            # Le créneau se libère pendant l'envoi, puis l'envoi échoue
+            release.set()
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Missing Permissions")
+
+        second = await scheduler.run(lambda: asyncio.sleep(0, "second"), "g2", "u2", on_queued=notify)
+        assert await first == "ok"
+        assert second == "second"
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_released_when_cancelled_during_notification():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        first = asyncio.ensure_future(scheduler.run(lambda: _hold(release), "g1", "u1"))
+        await asyncio.sleep(0)
+        sending = asyncio.Event()
+
+        async def notify(position):
+            sending.set()
+            await asyncio.sleep(10)
+
+        second = asyncio.ensure_future(scheduler.run(lambda: asyncio.sleep(0), "g2", "u2", on_queued=notify))
+        await sending.wait()
+        release.set()
+        await first
+        assert scheduler.stats()["running"] == 1  # attribué au second, encore en train de notifier
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        assert scheduler.stats()["running"] == 0
+        assert await scheduler.run(lambda: asyncio.sleep(0, "next"), "g3", "u3") == "next"
+
+    asyncio.run(scenario())
+
+
+def test_cancel_while_queued_and_running():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        first = asyncio.ensure_future(scheduler.run(lambda: _hold(release), "g1", "u1", ticket_id=1))
+        second = asyncio.ensure_future(scheduler.run(lambda: asyncio.sleep(0), "g2", "u2", ticket_id=2))
+        await asyncio.sleep(0)
+        assert scheduler.cancel(2)
+        with pytest.raises(RequestCancelled):
+            await second
+        assert scheduler.cancel(1)
+        with pytest.raises(RequestCancelled):
+            await first
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_wait_does_not_consume_the_deadline():
+    from core.deadline import deadline, remaining
+
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        first = asyncio.ensure_future(scheduler.run(lambda: _hold(release), "g1", "u1"))
+        await asyncio.sleep(0)
+
+        async def budget_left():
+            return remaining()
+
+        async def queued():
+            with deadline(0.2):
+                return await scheduler.run(budget_left, "g2", "u2")
+
+        second = asyncio.ensure_future(queued())
+        await asyncio.sleep(0.3)  # plus longtemps que le budget, passé en file d'attente
+        release.set()
+        await first
+        assert await second > 0.15
+
+    asyncio.run(scenario())
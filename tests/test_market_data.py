@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from core.market_data import MarketData
+
+INTERVAL_MS = 3_600_000
+
+
+def _klines(seed, count=60):
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, count)))
+    return [[t * INTERVAL_MS, c, c * 1.01, c * 0.99, c, 1000.0] for t, c in enumerate(closes)]
+
+
+def test_remove_frees_a_row_and_keeps_the_others():
+    market = MarketData(capacity=100, max_symbols=2)
+    market.load({"AAAUSDT": _klines(1), "BBBUSDT": _klines(2)})
+    before = market.signals(["BBBUSDT"])["BBBUSDT"]
+    with pytest.raises(ValueError):
+        market.load({"CCCUSDT": _klines(3)})
+
+    assert market.remove("AAAUSDT")
+    assert not market.remove("AAAUSDT")
+    assert "AAAUSDT" not in market
+    assert market.signals(["BBBUSDT"])["BBBUSDT"] == before
+
+    market.load({"CCCUSDT": _klines(3)})
+    assert market.symbols == ["BBBUSDT", "CCCUSDT"]
+    fresh = MarketData(capacity=100, max_symbols=1)
+    fresh.load({"CCCUSDT": _klines(3)})
+    assert market.signals(["CCCUSDT"]) == fresh.signals(["CCCUSDT"])
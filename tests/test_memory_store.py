@@ -0,0 +1,40 @@
+import json
+import threading
+
+from core.memory_store import MemoryStore
+
+
+def test_compaction_while_entries_change(tmp_path):
+    path = str(tmp_path / "memory.json")
+    store = MemoryStore(path, flush_interval=60)
+    for i in range(2000):
+        store.set('users', str(i), 'seen', 0)
+
+    stop = threading.Event()
+    errors = []
+
+    def compact():
+        try:
+            while not stop.is_set():
+                store.flush(compact=True)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=compact)
+    thread.start()
+    for n in range(20000):
+        user = str(n % 2000)
+        store.set('users', user, f"k{n % 7}", n)
+        if n % 5 == 0:
+            store.delete('users', user, f"k{(n + 3) % 7}")
+    stop.set()
+    thread.join()
+    assert not errors and store.compactions
+
+    expected = json.loads(json.dumps(store.data))
+    store.close()
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['users'] == expected['users']
+    reloaded = MemoryStore(path)
+    assert reloaded.data['users'] == expected['users']
+    reloaded.close()
@@ -0,0 +1,39 @@
+import pytest
+
+from core.response_cache import SemanticCache, key_tokens, normalize_question
+
+VARIANT = "system prompt"
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("what is the price of btc", "what is the price of eth"),
+    ("how to stake vvv", "how not to stake vvv"),
+    ("how to stake vvv", "how to stake 100 vvv"),
+    ("comment staker vvv", "comment ne pas staker vvv"),
+    ("should i sell eth", "shouldn't i sell eth"),
+])
+def test_near_duplicates_with_different_key_tokens_miss(cached, asked):
+    cache = SemanticCache()
+    cache.store(cached, VARIANT, "answer")
+    assert cache.lookup(asked, VARIANT) is None
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("What is the price of BTC?", "what is the price of btc"),
+    ("how do validators earn staking rewards", "how do validators earn their staking rewards"),
+    ("what are the risks of liquid staking on cosmos", "what are the risks of liquid staking in cosmos"),
+])
+def test_rephrasings_hit(cached, asked):
+    cache = SemanticCache()
+    cache.store(cached, VARIANT, "answer")
+    assert cache.lookup(asked, VARIANT) == "answer"
+
+
+def test_variants_are_isolated():
+    cache = SemanticCache()
+    cache.store("how to stake vvv", VARIANT, "answer")
+    assert cache.lookup("how to stake vvv", "other prompt") is None
+
+
+def test_key_tokens():
+    assert key_tokens(normalize_question("Don't sell ETH at 2,000$")) == {"don", "t", "sell", "eth", "2", "000"}
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from benchmarks.fake_venice import make_app
+from core.http_client import HttpClient
+from core.llm_scheduler import LLMScheduler, RequestCancelled
+from core.singleflight import SingleFlight
+from core.venice_stream import stream_chat
+
+
+def test_shared_call_survives_one_cancelled_waiter():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        assert await second == "ok"
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_closes_upstream_stream():
+    async def scenario():
+        closed = asyncio.Event()
+        runner = web.AppRunner(make_app(delay=0.05, on_disconnect=closed.set))
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}/chat/completions"
+        client = HttpClient()
+        await client.start()
+        scheduler = LLMScheduler(max_concurrency=1)
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def consume():
+            async for _piece in stream_chat(client, url, {}, {"messages": []}):
+                started.set()
+
+        try:
+            request = asyncio.ensure_future(
+                scheduler.run(lambda: flight.do("question", consume), "g1", "u1", ticket_id=1))
+            await started.wait()
+            assert scheduler.cancel(1)
+            with pytest.raises(RequestCancelled):
+                await request
+            await asyncio.wait_for(closed.wait(), 2)
+            assert flight.inflight() == 0
+            assert scheduler.stats()["running"] == 0
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+    asyncio.run(scenario())
@@ -0,0 +1,73 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from benchmarks.fake_venice import ANSWER, make_app
+from core.http_client import HttpClient
+from core.venice_stream import DISCORD_MESSAGE_LIMIT, StreamingReply, send_chunked, stream_chat
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+        self.edits = 0
+
+    async def edit(self, content):
+        assert len(content) <= DISCORD_MESSAGE_LIMIT
+        self.content = content
+        self.edits += 1
+
+
+class FakeChannel:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content):
+        assert len(content) <= DISCORD_MESSAGE_LIMIT
+        message = FakeMessage(content)
+        self.messages.append(message)
+        return message
+
+
+async def _run_stream(fail_after=None):
+    runner = web.AppRunner(make_app(delay=0, fail_after=fail_after))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    client = HttpClient()
+    await client.start()
+    channel = FakeChannel()
+    reply = StreamingReply(channel, min_interval=0)
+    try:
+        async for piece in stream_chat(client, f"http://127.0.0.1:{port}/chat/completions", {}, {"messages": []}):
+            await reply.feed(piece)
+        text = await reply.finish()
+    finally:
+        await client.close()
+        await runner.cleanup()
+    return text, channel
+
+
+def test_stream_rolls_over_discord_limit():
+    text, channel = asyncio.run(_run_stream())
+    assert text == ANSWER
+    assert len(ANSWER) > DISCORD_MESSAGE_LIMIT
+    assert len(channel.messages) == 2
+    assert "".join(message.content for message in channel.messages) == ANSWER
+    assert not any(message.content.endswith("▌") for message in channel.messages)
+
+
+def test_stream_cut_midway_raises():
+    with pytest.raises(aiohttp.ClientError):
+        asyncio.run(_run_stream(fail_after=5))
+
+
+def test_send_chunked_splits_on_newlines():
+    channel = FakeChannel()
+    asyncio.run(send_chunked(channel, ANSWER))
+    assert "".join(message.content for message in channel.messages) == ANSWER
+    assert len(channel.messages) == 2
+    assert channel.messages[1].content.startswith("\n")  # coupé au dernier saut de ligne
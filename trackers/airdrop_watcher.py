@@ -0,0 +1,198 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from core.rate_limiter import TokenBucket
+from trackers.cosmos_tracker import Chain, CosmosAirdropTracker, convert_address
+
+# Un passage complet sur toutes les adresses par intervalle (secondes)
+AIRDROP_WATCH_INTERVAL = float(os.getenv('AIRDROP_WATCH_INTERVAL', '3600'))
+# Débit maximum vers chaque nœud REST public (requêtes/seconde)
+AIRDROP_CHAIN_RATE = float(os.getenv('AIRDROP_CHAIN_RATE', '1.0'))
+
+# (denom ou validateur, montant) triés : un tuple par adresse et par type
+Holdings = Tuple[Tuple[str, str], ...]
+
+
+def _holdings(pairs) -> Holdings:
+    # sys.intern : les mêmes denoms reviennent sur des milliers d'adresses
+    return tuple(sorted((sys.intern(key), amount) for key, amount in pairs))
+
+
+def _diff(old: Holdings, new: Holdings):
+    old, new = dict(old), dict(new)
+    for key in new.keys() - old.keys():
+        yield key, None, new[key]
+    for key in old.keys() - new.keys():
+        yield key, old[key], None
+    for key in old.keys() & new.keys():
+        if old[key] != new[key]:
+            yield key, old[key], new[key]
+
+
+class AirdropWatcher:
+    """Surveillance en arrière-plan des soldes et délégations de toutes les
+    adresses enregistrées (tracker.user_addresses), sur toutes les chaînes.
+
+    Les requêtes d'un passage sont réparties sur tout l'intervalle (avec
+    jitter) et limitées par un seau à jetons par chaîne. Chaque réponse est
+    comparée au snapshot précédent (tuples triés) : seuls les changements
+    sont notifiés, regroupés en un message par utilisateur. Le premier
+    passage sert de référence et ne notifie rien.
+    """
+
+    def __init__(self, tracker: CosmosAirdropTracker, notify: Callable[[str, List[str]], Awaitable[None]],
+                 interval: float = AIRDROP_WATCH_INTERVAL, chain_rate: float = AIRDROP_CHAIN_RATE,
+                 jitter: float = 0.5, flush_every: float = 300.0):
+        self.tracker = tracker
+        self.notify = notify
+        self.interval = interval
+        self.chain_rate = chain_rate
+        self.jitter = jitter
+        self.flush_every = flush_every
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._snapshots: Dict[Tuple[str, str], Tuple[Holdings, Holdings]] = {}
+        self._pending: Dict[str, List[str]] = defaultdict(list)
+        self._last_flush = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self.polls = 0
+        self.failures = 0
+        self.skipped = 0
+        self.changes = 0
+        self.cycles = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _jobs(self) -> Dict[Tuple[str, str], Set[str]]:
+        """(chaîne, adresse convertie) -> utilisateurs concernés"""
+        jobs: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        for user_id, addresses in self.tracker.user_addresses.items():
+            for chain in self.tracker.registry:
+                for address in addresses:
+                    converted = convert_address(address, chain.prefix) if chain.prefix else address
+                    if converted is not None:
+                        jobs[(chain.name, converted)].add(user_id)
+        return jobs
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logging.error(f"Airdrop watcher error: {str(e)}")
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def run_cycle(self):
+        jobs = self._jobs()
+        # Adresses retirées : on oublie leur snapshot
+        for key in self._snapshots.keys() - jobs.keys():
+            del self._snapshots[key]
+
+        order = list(jobs)
+        random.shuffle(order)
+        spacing = self.interval / len(order) if order else 0.0
+        started = time.monotonic()
+        tasks = set()
+        for i, key in enumerate(order):
+            delay = started + spacing * (i + random.uniform(0, self.jitter)) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(self._poll(key, jobs[key]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            if time.monotonic() - self._last_flush >= self.flush_every:
+                await self.flush()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self.flush()
+        self.cycles += 1
+
+    async def _fetch(self, chain: Chain, url: str) -> Optional[dict]:
+        bucket = self._buckets.get(chain.name)
+        if bucket is None:
+            bucket = self._buckets[chain.name] = TokenBucket(rate=self.chain_rate, burst=1)
+        if not await bucket.acquire(max_wait=self.interval):
+            self.skipped += 1
+            return None  # nœud saturé : on réessaiera au prochain passage
+        result = await self.tracker.fetch(chain, url)
+        self.polls += 1
+        if "error" in result:
+            self.failures += 1
+            return None
+        return result
+
+    async def _poll(self, key: Tuple[str, str], users: Set[str]):
+        chain = self.tracker.registry.get(key[0])
+        if chain is None:
+            return
+        address = key[1]
+        balances, staking = await asyncio.gather(
+            self._fetch(chain, f"{chain.balances}{address}"),
+            self._fetch(chain, f"{chain.staking}{address}")
+        )
+        previous = self._snapshots.get(key)
+        current = (
+            _holdings((b["denom"], b["amount"]) for b in balances.get("balances", [])) if balances is not None
+            else (previous[0] if previous else None),
+            _holdings((d["delegation"]["validator_address"], d["balance"]["amount"])
+                      for d in staking.get("delegation_responses", [])) if staking is not None
+            else (previous[1] if previous else None)
+        )
+        if current[0] is None or current[1] is None:
+            return  # pas encore de référence complète
+        self._snapshots[key] = current
+        if previous is None or previous == current:
+            return
+
+        short = f"{address[:10]}…{address[-4:]}"
+        lines = []
+        for denom, old, new in _diff(previous[0], current[0]):
+            if old is None:
+                lines.append(f"🎁 {chain.name} `{short}` : nouveau token {denom} ({new})")
+                airdrop = self.tracker.active_airdrops.setdefault(
+                    f"{chain.name}:{denom}", {"chain": chain.name, "denom": denom, "first_seen": time.time(), "holders": 0})
+                airdrop["holders"] += 1
+            elif new is None:
+                lines.append(f"➖ {chain.name} `{short}` : {denom} retiré ({old})")
+            else:
+                lines.append(f"💰 {chain.name} `{short}` : {denom} {old} → {new}")
+        for validator, old, new in _diff(previous[1], current[1]):
+            lines.append(f"🥩 {chain.name} `{short}` : délégation {validator[:16]}… {old or 0} → {new or 0}")
+
+        self.changes += len(lines)
+        for user_id in users:
+            self._pending[user_id].extend(lines)
+
+    async def flush(self):
+        """Un message par utilisateur pour tous ses changements en attente"""
+        pending, self._pending = self._pending, defaultdict(list)
+        self._last_flush = time.monotonic()
+        for user_id, lines in pending.items():
+            try:
+                await self.notify(user_id, lines)
+            except Exception as e:
+                logging.error(f"Airdrop watcher: notification {user_id} impossible : {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "watched": len(self._snapshots),
+            "cycles": self.cycles,
+            "polls": self.polls,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "changes": self.changes,
+            "airdrops": len(self.tracker.active_airdrops)
+        }
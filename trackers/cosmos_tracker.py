@@ -1,34 +1,273 @@
 ﻿import os
 import json
+import asyncio
 import logging
-import aiohttp
-from typing import Dict
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+
+NETWORKS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'networks.json')
+
+# Requêtes simultanées maximum vers une même chaîne
+AIRDROP_CHAIN_CONCURRENCY = int(os.getenv('AIRDROP_CHAIN_CONCURRENCY', '4'))
+# Fréquence de vérification des modifications de networks.json (secondes)
+NETWORKS_RELOAD_INTERVAL = float(os.getenv('NETWORKS_RELOAD_INTERVAL', '10'))
+
+_BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+_BECH32_GENERATOR = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+
+
+def _bech32_polymod(values: List[int]) -> int:
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            checksum ^= _BECH32_GENERATOR[i] if (top >> i) & 1 else 0
+    return checksum
+
+
+def _hrp_expand(hrp: str) -> List[int]:
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 31 for c in hrp]
+
+
+def bech32_decode(address: str) -> Optional[Tuple[str, List[int]]]:
+    """(préfixe, données 5 bits) d'une adresse bech32, None si invalide"""
+    address = address.strip().lower()
+    pos = address.rfind('1')
+    if pos < 1 or pos + 7 > len(address) or len(address) > 90:
+        return None
+    hrp = address[:pos]
+    if any(c not in _BECH32_CHARSET for c in address[pos + 1:]):
+        return None
+    data = [_BECH32_CHARSET.find(c) for c in address[pos + 1:]]
+    if _bech32_polymod(_hrp_expand(hrp) + data) != 1:
+        return None
+    return hrp, data[:-6]
+
+
+def bech32_encode(hrp: str, data: List[int]) -> str:
+    polymod = _bech32_polymod(_hrp_expand(hrp) + data + [0] * 6) ^ 1
+    checksum = [(polymod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + '1' + ''.join(_BECH32_CHARSET[d] for d in data + checksum)
+
+
+def convert_address(address: str, prefix: str) -> Optional[str]:
+    """Même compte sur une autre chaîne Cosmos (cosmos1... -> osmo1...)"""
+    decoded = bech32_decode(address)
+    if decoded is None:
+        return None
+    return bech32_encode(prefix, decoded[1])
+
+
+class Chain(NamedTuple):
+    name: str
+    chain_id: str
+    prefix: Optional[str]   # préfixe bech32 des adresses
+    balances: str           # URL à compléter par l'adresse
+    staking: str
+
+
+def _check_url(url, where: str):
+    if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+        raise ValueError(f"{where}: URL invalide {url!r}")
+
+
+class ChainRegistry:
+    """Chaînes de config/networks.json indexées une fois pour toutes par
+    nom, chain_id et préfixe bech32. Instance immuable : un rechargement
+    construit un nouveau registre, qui remplace l'ancien d'un bloc.
+
+    Le schéma est vérifié à la construction (ValueError au moindre
+    problème) pour qu'un fichier à moitié édité ne remplace jamais un
+    registre valide.
+    """
+
+    def __init__(self, data: dict):
+        if not isinstance(data, dict) or not isinstance(data.get("networks"), list):
+            raise ValueError("'networks' doit être une liste")
+        endpoints = data.get("endpoints", {})
+        if not isinstance(endpoints, dict):
+            raise ValueError("'endpoints' doit être un objet")
+        self.chains: Dict[str, Chain] = {}
+        self._index: Dict[str, Chain] = {}
+        for position, network in enumerate(data["networks"]):
+            name = network.get("name") if isinstance(network, dict) else None
+            if not isinstance(name, str) or not name:
+                raise ValueError(f"networks[{position}]: 'name' manquant")
+            if name in self.chains:
+                raise ValueError(f"networks[{position}]: chaîne {name} en double")
+            prefix = network.get("bech32_prefix")
+            if prefix is not None and (not isinstance(prefix, str) or not prefix.isalnum()):
+                raise ValueError(f"{name}: bech32_prefix invalide {prefix!r}")
+            rest = network.get("rest_endpoint", "").rstrip('/')
+            urls = endpoints.get(name, {})
+            if not isinstance(urls, dict):
+                raise ValueError(f"endpoints.{name} doit être un objet")
+            chain = Chain(
+                name=name,
+                chain_id=network.get("chain_id", name),
+                prefix=network.get("bech32_prefix"),
+                balances=urls.get("balances", f"{rest}/cosmos/bank/v1beta1/balances/"),
+                staking=urls.get("staking", f"{rest}/cosmos/staking/v1beta1/delegations/")
+            )
+            _check_url(chain.balances, f"{name}.balances")
+            _check_url(chain.staking, f"{name}.staking")
+            self.chains[name] = chain
+            for key in (chain.prefix, chain.chain_id, name):
+                if key:
+                    self._index[key.lower()] = chain
+
+    @classmethod
+    def load(cls, path: str = NETWORKS_PATH) -> "ChainRegistry":
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return cls(json.load(f))
+
+    def get(self, name: str) -> Optional[Chain]:
+        return self._index.get(name.lower())
+
+    def __iter__(self):
+        return iter(self.chains.values())
+
+    def __len__(self) -> int:
+        return len(self.chains)
+
 
 class CosmosAirdropTracker:
-    def __init__(self):
+    def __init__(self, http_client, store=None, networks_path: str = NETWORKS_PATH):
+        self.http_client = http_client
+        self.store = store
+        self.networks_path = networks_path
         self.active_airdrops = {}
-        self.user_addresses = {}
-        self.networks = self._load_networks()
+        self.user_addresses: Dict[str, List[str]] = {}
+        self._networks_stamp = None
+        self.registry = self._load_networks()
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._reload_task: Optional[asyncio.Task] = None
+        if store is not None:
+            for user_id, item in store.data.get('monitoring', {}).items():
+                if item.get('addresses'):
+                    self.user_addresses[user_id] = list(item['addresses'])
 
-    def _load_networks(self):
+    def _load_networks(self) -> ChainRegistry:
         try:
-            with open('config/networks.json', 'r') as f:
-                return json.load(f)
+            self._networks_stamp = self._stamp()
+            return ChainRegistry.load(self.networks_path)
         except Exception as e:
             logging.error(f"Erreur chargement networks: {str(e)}")
-            return {}
+            return ChainRegistry({"networks": []})
 
-    async def check_eligibility(self, address: str, chain: str = "cosmoshub"):
+    # Rechargement à chaud de networks.json
+
+    def _stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.networks_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_networks(self) -> bool:
+        """Recharge networks.json s'il a changé depuis la dernière lecture.
+        En cas d'erreur, le registre en place continue de servir."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._networks_stamp:
+            return False
+        # Retenu même en cas d'échec : une seule erreur loggée par version du fichier
+        self._networks_stamp = stamp
         try:
-            if chain not in self.networks.get("networks", []):
-                return {"error": "Chaîne non supportée"}
+            registry = ChainRegistry.load(self.networks_path)
+        except Exception as e:
+            logging.error(f"networks.json invalide, {len(self.registry)} chaînes conservées : {str(e)}")
+            return False
+        self.registry = registry
+        for name in self._limits.keys() - registry.chains.keys():
+            del self._limits[name]
+        logging.info(f"networks.json rechargé : {len(registry)} chaînes ({', '.join(registry.chains)})")
+        return True
+
+    def start(self, interval: float = NETWORKS_RELOAD_INTERVAL):
+        if self._reload_task is None:
+            self._reload_task = asyncio.create_task(self._reload_loop(interval))
+
+    def stop(self):
+        if self._reload_task is not None:
+            self._reload_task.cancel()
+            self._reload_task = None
+
+    async def _reload_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_networks()
+
+    # Adresses enregistrées (section "monitoring" de la mémoire)
+
+    def register_address(self, user_id: str, address: str) -> bool:
+        address = address.strip().lower()
+        if bech32_decode(address) is None:
+            return False
+        addresses = self.user_addresses.setdefault(user_id, [])
+        if address not in addresses:
+            addresses.append(address)
+            self._save_addresses(user_id)
+        return True
 
-            endpoint = self.networks["endpoints"][chain]["balances"]
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{endpoint}{address}") as response:
+    def unregister_address(self, user_id: str, address: str) -> bool:
+        addresses = self.user_addresses.get(user_id, [])
+        if address.strip().lower() not in addresses:
+            return False
+        addresses.remove(address.strip().lower())
+        self._save_addresses(user_id)
+        return True
+
+    def _save_addresses(self, user_id: str):
+        if self.store is not None:
+            self.store.set('monitoring', user_id, 'addresses', list(self.user_addresses.get(user_id, [])))
+
+    # Requêtes
+
+    def _limit(self, chain: Chain) -> asyncio.Semaphore:
+        limit = self._limits.get(chain.name)
+        if limit is None:
+            limit = self._limits[chain.name] = asyncio.Semaphore(AIRDROP_CHAIN_CONCURRENCY)
+        return limit
+
+    async def fetch(self, chain: Chain, url: str) -> dict:
+        """GET JSON sur une chaîne, dans la limite de concurrence de la chaîne"""
+        async with self._limit(chain):
+            try:
+                async with self.http_client.get(url) as response:
                     if response.status == 200:
                         return await response.json()
                     return {"error": f"Erreur API: {response.status}"}
-        except Exception as e:
-            logging.error(f"Erreur vérification airdrop: {str(e)}")
-            return {"error": str(e)}
\ No newline at end of file
+            except Exception as e:
+                logging.error(f"Erreur vérification airdrop ({chain.name}): {str(e)}")
+                return {"error": str(e) or type(e).__name__}
+
+    async def check_eligibility(self, address: str, chain: str = "cosmoshub"):
+        network = self.registry.get(chain)
+        if network is None:
+            return {"error": "Chaîne non supportée"}
+        if network.prefix:
+            address = convert_address(address, network.prefix)
+            if address is None:
+                return {"error": "Adresse invalide"}
+        return await self.fetch(network, f"{network.balances}{address}")
+
+    async def scan(self, addresses: List[str], chains: Optional[List[str]] = None) -> AsyncIterator[Tuple[Chain, str, dict]]:
+        """Soldes de chaque adresse sur chaque chaîne, en parallèle (limité par
+        chaîne), rendus au fur et à mesure que les chaînes répondent"""
+        networks = [self.registry.get(name) for name in chains] if chains else list(self.registry)
+
+        async def check(network: Chain, address: str):
+            return network, address, await self.fetch(network, f"{network.balances}{address}")
+
+        tasks = []
+        for network in filter(None, networks):
+            # Deux adresses du même compte sur des chaînes différentes = une seule requête
+            converted = {convert_address(a, network.prefix) if network.prefix else a for a in addresses}
+            for address in filter(None, converted):
+                tasks.append(asyncio.ensure_future(check(network, address)))
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()